@@ -2,6 +2,10 @@ import json
 import os
 from pathlib import Path
 
+# Per-user state (caches, keys) lives here rather than under whatever directory the
+# process happened to be started from.
+DATA_DIR = Path.home() / ".integritywatch"
+
 # Default settings
 DEFAULT_CONFIG = {
     "logging": {
@@ -20,7 +24,18 @@ DEFAULT_CONFIG = {
         "monitoring_interval": 5
     },
     "remote_access": {
-        "allow_conference_tools": True
+        "allow_conference_tools": True,
+        "process_events": True,
+        "hash_executables": False,
+        "exe_hash_cache": "cache/exe_hashes.json",
+        "preresolve_domains": False
+    },
+    "vm_detector": {
+        "detector_timeout": 15.0,
+        "detector_timeouts": {},
+        "result_cache": "cache/vm_result.json",
+        "force_rescan": False,
+        "fail_fast": False
     },
     "browser": {
         "allow_suspicious_websites": False,
@@ -74,5 +89,13 @@ class GlobalConfig:
     def get(self, section, key, default=None):
         return self.data.get(section, {}).get(key, default)
 
+    def get_path(self, section, key, default=None):
+        # Relative paths are taken relative to DATA_DIR; None when the option is unset.
+        value = self.get(section, key, default)
+        if not value:
+            return None
+        path = Path(value).expanduser()
+        return path if path.is_absolute() else DATA_DIR / path
+
 # Initialize the config
 config = GlobalConfig.load()
@@ -49,16 +49,19 @@ class MonitoringCoordinator:
             args=(heartbeat_callback,),
             daemon=True
         )
+        self.remote_engine.start_event_sources()
         self._monitor_thread.start()
         self.logger.info(f"Unified monitoring started (Interval: {self.interval}s)")
     
     def stop(self):
         self._monitoring = False
         self._stop_event.set()
+        self.remote_engine.notify_activity()
         
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
         
+        self.remote_engine.stop()
         self.logger.info("Monitoring stopped")
     
     def _monitor_loop(self, heartbeat_callback):
@@ -136,7 +139,8 @@ class MonitoringCoordinator:
                 
                 print(f"\r[{BLUE}{timestamp}{RESET}] Browser: {GREEN}CLEAN{RESET} | Remote: {GREEN}SECURE{RESET} | Monitoring active...", end="", flush=True)
             
-            self._stop_event.wait(timeout=self.interval)
+            # Wakes early when a remote access detector pushes an event (e.g. a blocked process exec).
+            self.remote_engine.wait_for_activity(self.interval)
 
 def print_header():
     print(f"\n{BOLD}INTEGRITY WATCH v0.1.0{RESET}")
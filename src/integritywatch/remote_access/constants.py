@@ -22,6 +22,56 @@ KNOWN_REMOTE_ACCESS_DOMAINS = [
     'rustdesk.com',
 ]
 
+# CIDR ranges operated by remote access vendors (relays, brokers) -> tool name.
+# Matched before any reverse DNS lookup. Only vendor-published ranges belong here; most
+# vendors publish none, which is what REMOTE_ACCESS_RELAY_HOSTS is for.
+REMOTE_ACCESS_IP_RANGES: dict[str, list[str]] = {
+    # GoTo (LogMeIn, GoToMeeting, GoToAssist) firewall allowlist
+    'LogMeIn': [
+        '64.74.80.0/24',
+        '66.151.158.0/24',
+        '67.217.64.0/19',
+        '68.64.0.0/19',
+        '78.108.112.0/20',
+        '103.231.12.0/22',
+        '173.199.0.0/18',
+        '185.36.20.0/22',
+        '202.173.24.0/21',
+        '206.183.100.0/22',
+        '216.115.208.0/20',
+        '216.219.112.0/20',
+    ],
+}
+
+# Broker / rendezvous / relay hosts the clients themselves connect to, pre-resolved into
+# the range trie when remote_access.preresolve_domains is on. Vendor websites are left out:
+# they sit on shared CDN addresses that unrelated traffic reaches too.
+REMOTE_ACCESS_RELAY_HOSTS = [
+    *(f'master{n}.teamviewer.com' for n in range(1, 17)),
+    'boot.net.anydesk.com',
+    'rs-ny.rustdesk.com',
+    'rs-sg.rustdesk.com',
+    'rs-cn.rustdesk.com',
+]
+
+# How often REMOTE_ACCESS_RELAY_HOSTS are resolved into the range trie (seconds)
+DOMAIN_PRERESOLVE_INTERVAL = 900
+
+# Reverse DNS resolver limits (seconds / threads)
+REVERSE_DNS_TIMEOUT = 2.0
+REVERSE_DNS_CACHE_TTL = 300
+REVERSE_DNS_NEGATIVE_TTL = 60
+REVERSE_DNS_WORKERS = 4
+
+# SHA-256 of known remote access builds -> process name as listed in PROCESS_BLOCKLIST.
+# Catches tools that were renamed to dodge name matching; extend as builds are collected.
+# Executable hashing (remote_access.hash_executables) does nothing while this is empty.
+KNOWN_REMOTE_ACCESS_HASHES: dict[str, str] = {}
+
+# Executable hashing limits (seconds / threads)
+EXE_HASH_TIMEOUT = 5.0
+EXE_HASH_WORKERS = 2
+
 # All suspicious ports
 SUSPICIOUS_PORTS = {
     3389, # RDP - Microsoft standard
@@ -336,4 +386,33 @@ PROCESS_BLOCKLIST = {
         "BlueJeans.exe",         
         "BlueJeans",             
     },
-}
\ No newline at end of file
+}
+
+# COMMAND LINE SIGNATURES
+# Tools that run under a generic interpreter or launcher (python, java, electron, AppImage)
+# keep a tell-tale script, jar or bundle in their command line or executable path.
+# Tool name (looked up in PROCESS_BLOCKLIST for its tier) -> case-insensitive regexes.
+# Searched in the basename of the executable and argv[0], or of the script when argv[0] is
+# one of CMDLINE_INTERPRETERS, never in the arguments: `vim rustdesk.toml` is not RustDesk.
+CMDLINE_SIGNATURES = {
+    "AnyDesk": [r"anydesk"],
+    "RustDesk": [r"rustdesk"],
+    "TeamViewer": [r"teamviewer"],
+    "x11vnc": [r"x11vnc"],
+    "Xvnc": [r"x0vncserver", r"\bxvnc\b", r"vncserver"],
+    "noVNC": [r"novnc", r"websockify"],
+    "remoting_host": [r"chrome-remote-desktop", r"remoting_host"],
+    "MeshAgent": [r"meshagent", r"meshcentral"],
+    "Guacamole": [r"\bguacd\b"],
+    "ScreenConnect": [r"screenconnect", r"connectwisecontrol"],
+    "Supremo": [r"supremo"],
+    "dwagent": [r"dwagent"],
+}
+
+# Programs whose first non-option argument names what actually runs (compared without a
+# version suffix or .exe, so python3.11 and pythonw.exe count too).
+CMDLINE_INTERPRETERS = {
+    "python", "pythonw", "node", "nodejs", "java", "javaw", "perl", "ruby", "php",
+    "sh", "bash", "dash", "zsh", "mono", "dotnet", "wine", "wine64",
+    "wscript", "cscript", "powershell", "pwsh",
+}
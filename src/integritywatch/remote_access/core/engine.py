@@ -24,6 +24,7 @@ class DetectionEngine:
         self._monitoring = False
         self._monitor_thread = None
         self._stop_event = threading.Event()
+        self._activity_event = threading.Event()
         self._successful_detector_names = set()
 
     def _load_detectors(self) -> list[BaseDetector]:
@@ -112,16 +113,46 @@ class DetectionEngine:
             daemon=True
         )
 
+        self.start_event_sources()
         self._monitor_thread.start()
         self.logger.info(f"Remote Access Monitoring started (Interval: {interval}s)")
     
     def stop_monitoring(self):
         self._monitoring = False
         self._stop_event.set()
+        self.notify_activity()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.stop_event_sources()
         self.logger.info("Monitoring stopped.")
 
+    def stop(self):
+        # Final shutdown: monitoring and every detector's background threads.
+        if self._monitoring:
+            self.stop_monitoring()
+        for detector in self.detectors:
+            detector.stop()
+
+    def start_event_sources(self):
+        for detector in self.detectors:
+            if detector.name not in self._successful_detector_names:
+                continue
+            if detector.start_events(self.notify_activity):
+                self.logger.info(f"{detector.name}: push events enabled")
+
+    def stop_event_sources(self):
+        for detector in self.detectors:
+            detector.stop_events()
+
+    def notify_activity(self):
+        # Called from detector event threads to cut the current monitoring wait short.
+        self._activity_event.set()
+
+    def wait_for_activity(self, timeout: float) -> bool:
+        woke = self._activity_event.wait(timeout=timeout)
+        self._activity_event.clear()
+        return woke
+
     def _monitor_loop(self, interval: int, display_callback, heartbeat_callback): # Function to run on thread
         while not self._stop_event.is_set():
             cycle_result = DetectionResult()
@@ -172,7 +203,7 @@ class DetectionEngine:
             if display_callback:
                 display_callback(cycle_result)
 
-            self._stop_event.wait(timeout=interval)
+            self.wait_for_activity(interval)
 
 
     def _apply_verdict_logic(self, result: DetectionResult):
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import os
+from typing import Callable
 
 from ..core.result import TechniqueResult
 from integritywatch.utils.logger import get_logger
@@ -36,6 +37,18 @@ class BaseDetector(ABC):
     def monitor(self) -> TechniqueResult:
         return self.scan()
 
+    def start_events(self, callback: Callable[[], None]) -> bool:
+        # Detectors with a push-based event source override this and call `callback`
+        # when something needs checking before the next monitoring interval.
+        return False
+
+    def stop_events(self):
+        pass
+
+    def stop(self):
+        # Final shutdown: releases event sources and any background threads.
+        self.stop_events()
+
     def safe_scan(self) -> TechniqueResult:
         if not self.is_platform_supported():
             self.logger.debug(f"Skipping - unsupported platform: {self._current_platform}")
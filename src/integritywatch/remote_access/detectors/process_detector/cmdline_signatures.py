@@ -0,0 +1,82 @@
+import re
+import shlex
+from typing import Optional
+
+from ...constants import CMDLINE_SIGNATURES, CMDLINE_INTERPRETERS
+
+_PATH_SEPARATORS = re.compile(r'[\\/]')
+_VERSION_SUFFIX = re.compile(r'[\d.]+$')
+
+
+def _basename(path: str) -> str:
+    # Works for both POSIX and Windows paths, whatever the current platform.
+    return _PATH_SEPARATORS.split(path.rstrip('\\/'))[-1]
+
+
+def _split_cmdline(cmdline: str) -> list[str]:
+    # Backslashes mean a Windows command line, where they are path separators, not escapes.
+    posix = '\\' not in cmdline
+    try:
+        argv = shlex.split(cmdline, posix=posix)
+    except ValueError:
+        return cmdline.split()
+    return argv if posix else [arg.strip('"') for arg in argv]
+
+
+def _is_interpreter(name: str) -> bool:
+    name = name.lower()
+    if name.endswith('.exe'):
+        name = name[:-4]
+    return _VERSION_SUFFIX.sub('', name) in CMDLINE_INTERPRETERS
+
+
+def program_names(path: str, cmdline: str) -> list[str]:
+    """Basenames that say which program a process runs.
+
+    The executable and argv[0], plus the script or module an interpreter was given as its
+    first non-option argument. Other arguments (file names, URLs, package names) are left
+    out so editors, package managers and downloads never look like the tool they mention.
+    """
+    names = [_basename(path)] if path else []
+
+    argv = _split_cmdline(cmdline) if cmdline else []
+    if argv:
+        names.append(_basename(argv[0]))
+        if _is_interpreter(names[-1]) or (names[0] and _is_interpreter(names[0])):
+            # `sh -c "cmd args"` hands over a whole command line; its first word is the program.
+            script = next((arg for arg in argv[1:] if not arg.startswith('-')), None)
+            if script and script.split():
+                names.append(_basename(script.split()[0]))
+
+    return [name for name in dict.fromkeys(names) if name]
+
+
+class CommandLineMatcher:
+    """Every command-line/path signature folded into one compiled alternation.
+
+    Each tool becomes a named group, so a program name costs a single search however many
+    signatures are configured, and `lastgroup` names the tool that hit.
+    """
+
+    def __init__(self, signatures: dict[str, list[str]] = CMDLINE_SIGNATURES):
+        self._tools: dict[str, str] = {}
+        branches = []
+
+        for i, (tool, patterns) in enumerate(signatures.items()):
+            group = f"sig{i}"
+            self._tools[group] = tool
+            branches.append(f"(?P<{group}>{'|'.join(f'(?:{p})' for p in patterns)})")
+
+        self._pattern = re.compile('|'.join(branches), re.IGNORECASE) if branches else None
+
+    def match(self, path: str, cmdline: str) -> Optional[tuple[str, str]]:
+        # (tool, matched program name) for the first signature found, None otherwise.
+        if self._pattern is None:
+            return None
+
+        for name in program_names(path, cmdline):
+            found = self._pattern.search(name)
+            if found is not None:
+                return self._tools[found.lastgroup], name
+
+        return None
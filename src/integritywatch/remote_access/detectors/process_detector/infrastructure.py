@@ -0,0 +1,103 @@
+import socket
+import threading
+from typing import Callable, Optional
+
+from integritywatch.utils.ip_trie import IPPrefixTrie
+from integritywatch.utils.logger import get_logger
+
+from ...constants import REMOTE_ACCESS_IP_RANGES, REMOTE_ACCESS_RELAY_HOSTS
+
+
+class RemoteAccessNetworks:
+    """Answers "is this address remote access infrastructure?" without a network round trip.
+
+    The trie is loaded from REMOTE_ACCESS_IP_RANGES and, when refreshing is started, from
+    periodic forward lookups of REMOTE_ACCESS_RELAY_HOSTS. A refresh builds a new trie and
+    swaps it in, so lookups never see a half-built tree. `on_update` receives the addresses
+    that a refresh added, so callers can re-check connections to them.
+    """
+
+    def __init__(self,
+                 ranges: dict[str, list[str]] = REMOTE_ACCESS_IP_RANGES,
+                 hosts: list[str] = REMOTE_ACCESS_RELAY_HOSTS,
+                 on_update: Optional[Callable[[set[str]], None]] = None):
+        self.logger = get_logger("remote.RemoteAccessNetworks")
+        self._ranges = ranges
+        self._hosts = hosts
+        self._on_update = on_update
+
+        self._resolved: dict[str, str] = {}  # address -> host it was resolved from
+        self._trie = self._build()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def match(self, address: str) -> Optional[str]:
+        # Name of the tool or host the address belongs to, None when it is not known.
+        return self._trie.match(address)
+
+    def start_refresh(self, interval: float):
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, args=(interval,), name="ra-networks", daemon=True)
+        self._thread.start()
+
+    def stop_refresh(self):
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def refresh(self) -> set[str]:
+        resolved = {}
+        for host in self._hosts:
+            for address in self._resolve_host(host):
+                resolved.setdefault(address, host)
+
+        added = resolved.keys() - self._resolved.keys()
+        self._resolved = resolved
+        self._trie = self._build()
+
+        if added:
+            self.logger.debug(f"Pre-resolved {len(resolved)} remote access addresses ({len(added)} new)")
+        return set(added)
+
+    def _build(self) -> IPPrefixTrie:
+        trie = IPPrefixTrie()
+
+        for tool, cidrs in self._ranges.items():
+            for cidr in cidrs:
+                try:
+                    trie.insert(cidr, tool)
+                except ValueError as e:
+                    self.logger.warning(f"Ignoring invalid range {cidr} for {tool}: {e}")
+
+        # Resolved hosts go in as /32 or /128 entries, so they win over any bundled range.
+        for address, host in self._resolved.items():
+            trie.insert(address, host)
+
+        return trie
+
+    def _resolve_host(self, host: str) -> set[str]:
+        try:
+            infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+        except (socket.gaierror, UnicodeError) as e:
+            self.logger.debug(f"Forward lookup failed for {host}: {e}")
+            return set()
+
+        return {info[4][0] for info in infos}
+
+    def _refresh_loop(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                added = self.refresh()
+                if added and self._on_update:
+                    self._on_update(added)
+            except Exception as e:
+                self.logger.warning(f"Remote access address refresh failed: {e}")
+
+            self._stop_event.wait(timeout=interval)
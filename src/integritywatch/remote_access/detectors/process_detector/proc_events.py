@@ -0,0 +1,121 @@
+import os
+import socket
+import struct
+import threading
+from typing import Callable
+
+from integritywatch.utils.logger import get_logger
+
+# Proc connector constants from linux/netlink.h, linux/connector.h and linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_COMM = 0x00000200
+PROC_EVENT_EXIT = 0x80000000
+
+NLMSG_HEADER = struct.Struct('=IHHII')
+CN_MSG_HEADER = struct.Struct('=IIIIHH')
+EVENT_OFFSET = NLMSG_HEADER.size + CN_MSG_HEADER.size  # struct proc_event: what, cpu, timestamp_ns, event_data
+EVENT_DATA_OFFSET = EVENT_OFFSET + 16
+
+
+class ProcEventListener:
+    """Push-based exec/comm/exit notifications from the kernel proc connector (cn_proc).
+
+    `on_exec` is called with the PID of a process that exec'd or renamed itself, `on_exit`
+    with the PID of a process that exited. Subscribing needs CAP_NET_ADMIN, so start()
+    returns False when the agent lacks it and callers keep relying on /proc polling.
+    """
+
+    def __init__(self, on_exec: Callable[[int], None], on_exit: Callable[[int], None]):
+        self.logger = get_logger("remote.ProcEventListener")
+        self._on_exec = on_exec
+        self._on_exit = on_exit
+
+        self._sock = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> bool:
+        if self._thread is not None:
+            return True
+
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+            sock.bind((os.getpid(), CN_IDX_PROC))
+            self._send_control(sock, PROC_CN_MCAST_LISTEN)
+            sock.settimeout(1.0)
+        except (OSError, AttributeError) as e:
+            self.logger.info(f"Proc connector unavailable, relying on /proc polling: {e}")
+            return False
+
+        self._sock = sock
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="proc-events", daemon=True)
+        self._thread.start()
+        self.logger.info("Subscribed to proc connector exec/exit events")
+        return True
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+        try:
+            self._send_control(self._sock, PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self._sock.close()
+        self._sock = None
+
+    def _send_control(self, sock: socket.socket, operation: int):
+        payload = struct.pack('=I', operation)
+        cn_msg = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid())
+        sock.send(header + cn_msg)
+
+    def _listen_loop(self):
+        buffer = bytearray(4096)
+
+        while not self._stop_event.is_set():
+            try:
+                received = self._sock.recv_into(buffer)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                self.logger.warning(f"Proc connector receive failed: {e}")
+                break
+
+            offset = 0
+            while offset + EVENT_DATA_OFFSET + 8 <= received:
+                msg_len = NLMSG_HEADER.unpack_from(buffer, offset)[0]
+                if msg_len < NLMSG_HEADER.size:
+                    break
+
+                self._dispatch(buffer, offset)
+                offset += (msg_len + 3) & ~3
+
+    def _dispatch(self, buffer: bytearray, offset: int):
+        what = struct.unpack_from('=I', buffer, offset + EVENT_OFFSET)[0]
+        pid, tgid = struct.unpack_from('=ii', buffer, offset + EVENT_DATA_OFFSET)
+
+        # Thread-level events (pid != tgid) are ignored: exec always leaves the leader
+        # behind, and thread renames do not change what the process is.
+        if pid != tgid:
+            return
+
+        try:
+            if what == PROC_EVENT_EXEC or what == PROC_EVENT_COMM:
+                self._on_exec(tgid)
+            elif what == PROC_EVENT_EXIT:
+                self._on_exit(tgid)
+        except Exception as e:
+            self.logger.debug(f"Proc event handler failed for PID {tgid}: {e}")
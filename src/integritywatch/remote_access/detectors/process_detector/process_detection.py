@@ -1,10 +1,22 @@
 from integritywatch.config import config
 from integritywatch.utils.platform.base import is_windows, is_linux, is_macos
+from integritywatch.utils.dns_resolver import ReverseDNSResolver
+from integritywatch.utils.exe_fingerprint import ExecutableFingerprintCache
+from integritywatch.utils.process_table import ProcessTable, ProcessView
+import threading
 
 from ...constants import PROCESS_BLOCKLIST, SUSPICIOUS_PORTS, KNOWN_REMOTE_ACCESS_DOMAINS, PORT_TO_TOOL, COMMON_FALLBACK_PORTS, COMMON_LEGITIMATE_PORTS
+from ...constants import REVERSE_DNS_TIMEOUT, REVERSE_DNS_CACHE_TTL, REVERSE_DNS_NEGATIVE_TTL, REVERSE_DNS_WORKERS
+from ...constants import KNOWN_REMOTE_ACCESS_HASHES, EXE_HASH_TIMEOUT, EXE_HASH_WORKERS, DOMAIN_PRERESOLVE_INTERVAL
 from ..base import BaseDetector
 from ...core.result import TechniqueResult
-from typing import Any, Optional
+from .process_tracker import ProcessTracker
+from .process_tree import ProcessTree
+from .signature_index import ProcessSignatureIndex
+from .cmdline_signatures import CommandLineMatcher
+from .infrastructure import RemoteAccessNetworks
+from .verdict_cache import ConnectionVerdictCache, MISS, connection_key
+from typing import Callable, Optional
 
 class ProcessDetector(BaseDetector):
     def __init__(self):
@@ -16,29 +28,71 @@ class ProcessDetector(BaseDetector):
 
         self.logger.info("Initializing Process Detector...")
 
-        self.blocked_names = set()
-        for category, processes in PROCESS_BLOCKLIST.items():
-            self.blocked_names.update(p.lower() for p in processes)
+        self.signatures = ProcessSignatureIndex(PROCESS_BLOCKLIST)
+        self._process_table = ProcessTable()
+        self.cmdline_signatures = CommandLineMatcher()
+
+        # Connection verdicts survive between cycles until their socket closes.
+        self.verdicts = ConnectionVerdictCache()
+        self._live_connections = set()
+
+        # Addresses whose reverse lookup matched a known domain after its cycle's deadline.
+        self._resolved_addresses = set()
+        self._resolved_lock = threading.Lock()
 
         self._load_network_utilities()
 
+        self.networks = RemoteAccessNetworks(on_update=self._on_networks_updated)
+        if config.get('remote_access', "preresolve_domains", False):
+            self.networks.start_refresh(DOMAIN_PRERESOLVE_INTERVAL)
+
+        # Hashing every binary is only worth it when there are known builds to match against,
+        # so it stays off until hashes are bundled and the deployment opts in.
+        self.fingerprints = None
+        if KNOWN_REMOTE_ACCESS_HASHES and config.get('remote_access', "hash_executables", False):
+            self.fingerprints = ExecutableFingerprintCache(
+                config.get_path('remote_access', "exe_hash_cache"),
+                max_workers=EXE_HASH_WORKERS,
+                on_result=self._on_executable_hashed
+            )
+
+        # Incremental monitoring needs a stable process identity, which only /proc provides.
+        self._tracker = ProcessTracker() if is_linux() else None
+        self._tracker_lock = threading.Lock()
+        self._process_tree = ProcessTree({})
+        self._ancestry_roots = frozenset()
+
+        # Threats pushed by the proc connector between two monitoring cycles.
+        self._event_listener = None
+        self._event_callback = None
+        self._event_threats = []
+
     def _load_network_utilities(self):
+        self.get_all_connections = None
+        self.fd_scan_skipped = None
+        self._reported_fd_skips = 0
+        self.resolver = None
+
         try:
             if is_windows():
                 from integritywatch.utils.platform import windows
                 self.get_connections = windows.get_tcp_connections_for_pid
+                self.get_all_connections = windows.get_all_connections
                 self.reverse_dns = windows.reverse_dns_lookup
                 self.logger.info("Network detection: Windows utilities loaded")
             
             elif is_linux():
                 from integritywatch.utils.platform import linux
                 self.get_connections = linux.get_tcp_connections_for_pid
+                self.get_all_connections = linux.get_all_connections
+                self.fd_scan_skipped = linux.last_fd_scan_skipped
                 self.reverse_dns = linux.reverse_dns_lookup
                 self.logger.info("Network detection: Linux utilities loaded")
             
             elif is_macos():
                 from integritywatch.utils.platform import macos
                 self.get_connections = macos.get_tcp_connections_for_pid
+                self.get_all_connections = macos.get_all_connections
                 self.reverse_dns = macos.reverse_dns_lookup
                 self.logger.info("Network detection: macOS utilities loaded")
 
@@ -47,13 +101,24 @@ class ProcessDetector(BaseDetector):
         
         except ImportError as e:
             self.logger.warning(f"Network detection unavailable: {e}")
-            
+            return
+
+        if hasattr(self, 'reverse_dns'):
+            self.resolver = ReverseDNSResolver(
+                self.reverse_dns,
+                max_workers=REVERSE_DNS_WORKERS,
+                timeout=REVERSE_DNS_TIMEOUT,
+                ttl=REVERSE_DNS_CACHE_TTL,
+                negative_ttl=REVERSE_DNS_NEGATIVE_TTL,
+                on_result=self._on_hostname_resolved
+            )
         
 
     def scan(self) -> TechniqueResult:
         self.logger.info("Scanning running processes...")
 
         try:
+            self.signatures.refresh()
             processes = self._enumerate_processes()
             
             if not processes:
@@ -68,110 +133,428 @@ class ProcessDetector(BaseDetector):
 
             threats = []
             
-            # Check 1: Simple String Based Matching
+            # Check 1: Simple String Based Matching, then command line signatures
             self.logger.info("Checking running processes names with blocklist")
             for proc in processes:
-                if proc['name'].lower() in self.blocked_names:
-                    tier = self._get_tier(proc['name'])
-                    threats.append({
-                        'name': proc['name'],
-                        'pid':proc['pid'],
-                        'path':proc['path'],
-                        'tier': tier,
-                        'detection_method': 'process_name'
-                    })
-                    self.logger.debug(f"Found Threat {proc['name']} with pid {proc['pid']}")
+                threat = self._classify_process(proc)
+                if threat:
+                    threats.append(threat)
             
+            threats.extend(self._detect_by_executable_hash(processes))
+            threats.extend(self._detect_by_ancestry(processes, threats))
 
             network_threats = self._detect_by_network_behavior(processes)
             threats.extend(network_threats)
 
-            if threats:
-                critical = [t for t in threats if t['tier'] == 'CRITICAL']
-                low = [t for t in threats if t['tier'] == 'LOW']
-                unknown = [t for t in threats if t['tier'] == 'UNKNOWN']
-                threat_list = []
+            return self._build_result(threats, len(processes))
+        
+        except Exception as e:
+            self.logger.error(f"Process scan failed: {e}", exc_info=True)
+            return TechniqueResult(
+                name=self.name,
+                detected=False,
+                details="Process scan error",
+                error=str(e)
+            )
 
-                if critical:
-                    tier = 'CRITICAL'
-                    threat_list = critical
-                    summary = f"Critical remote access tool(s) detected"
-                
-                elif low:
-                    tier = 'LOW'
-                    threat_list = low
-                    summary = f"Screen Sharing service(s) detected"
+    def monitor(self) -> TechniqueResult:
+        # Only new or changed processes are classified, and only processes that gained
+        # sockets are re-analyzed; everything else keeps its verdict from earlier cycles.
+        if self._tracker is None:
+            return self.scan()
 
+        try:
+            from integritywatch.utils.platform import linux
+
+            identities = linux.list_process_identities()
+            if not identities:
+                return self.scan()
+
+            snapshot = self._get_connection_snapshot() or {}
+
+            with self._tracker_lock:
+                if self.signatures.refresh():
+                    for entry in self._tracker:
+                        if entry.name_threat:
+                            entry.name_threat = self._classify_process(entry.to_dict())
+                        if entry.hash_threat:
+                            entry.hash_threat = self._classify_by_hash(entry.to_dict(), entry.exe_digest)
+
+                dirty, exited = self._tracker.reconcile(identities)
+                for entry in dirty:
+                    entry.path = linux.read_process_path(entry.pid)
+                    entry.name_threat = self._classify_process(entry.to_dict())
+
+                self._update_executable_hashes()
+                self._update_ancestry(ProcessTree({pid: identity[2] for pid, identity in identities.items()}))
+
+                resolved = self._drain_resolved_addresses()
+                self.verdicts.invalidate_addresses(resolved)
+                recheck = [
+                    entry for entry in self._tracker.update_sockets(snapshot, resolved)
+                    if entry.name_threat is None
+                ]
+
+            if recheck:
+                self._prefetch_hostnames({entry.pid: snapshot[entry.pid] for entry in recheck})
+
+            for entry in recheck:
+                suspicious = self._analyze_connections(entry.pid, entry.name, snapshot)
+                if suspicious:
+                    entry.network_threat = self._network_threat(entry.to_dict(), suspicious)
+                    entry.threat_inode = suspicious.get('inode')
                 else:
-                    tier = 'UNKNOWN'
-                    threat_list = unknown
-                    summary = f"Screen Sharing service(s) detected"
+                    entry.network_threat = None
+                    entry.threat_inode = None
 
-                unique_names = []
-                seen = set()
+            self._evict_closed_connections(snapshot)
+            self.logger.debug(f"Process tracker: {len(dirty)} new/changed, {exited} exited, {len(recheck)} network re-checks")
 
-                for t in threat_list:
-                    name = t.get('name', 'Unknown')
+            with self._tracker_lock:
+                threats = self._tracker.threats()
+                # Event-detected processes that already exited are reported once here.
+                threats.extend(t for t in self._drain_event_threats() if self._tracker.get(t['pid']) is None)
 
-                    if name.lower() not in seen:
-                        unique_names.append(name)
-                        seen.add(name.lower())
-                    
-                
-                if len(unique_names) <= 3:
-                    details = f"{summary}:- {', '.join(unique_names)}"
-                else:
-                    details = f"{summary}:- {', '.join(unique_names[:3])} (and {len(unique_names) - 3} more)"
+            return self._build_result(threats, len(identities))
 
-                return TechniqueResult(
-                    name=self.name,
-                    detected=True,
-                    tier=tier,
-                    details=details,
-                    data={'threats': threats}
-                )
-            
-            else:
-                return TechniqueResult(
-                    name=self.name,
-                    detected=False,
-                    details=f"No blocked processes found ({len(processes)} processes checked)"
-                )
-        
         except Exception as e:
-            self.logger.error(f"Process scan failed: {e}", exc_info=True)
+            self.logger.error(f"Process monitor failed: {e}", exc_info=True)
             return TechniqueResult(
                 name=self.name,
                 detected=False,
                 details="Process scan error",
                 error=str(e)
             )
+
+    def start_events(self, callback: Callable[[], None]) -> bool:
+        # Optional cn_proc subscription; /proc polling stays as the reconciliation pass.
+        if self._tracker is None or not config.get('remote_access', 'process_events', True):
+            return False
+
+        if self._event_listener is None:
+            from .proc_events import ProcEventListener
+            self._event_listener = ProcEventListener(self._on_process_exec, self._on_process_exit)
+
+        self._event_callback = callback
+        return self._event_listener.start()
+
+    def stop_events(self):
+        if self._event_listener is not None:
+            self._event_listener.stop()
+        self._event_callback = None
+
+    def stop(self):
+        super().stop()
+        self.networks.stop_refresh()
+
+    def _on_process_exec(self, pid: int):
+        # Runs on the proc connector thread for every exec() or process rename.
+        from integritywatch.utils.platform import linux
+
+        stat = linux.read_process_stat(pid)
+        if stat is None:
+            return
+        name, fields = stat
+
+        with self._tracker_lock:
+            entry = self._tracker.observe(pid, int(fields[19]), name)
+            if entry is None:
+                return
+
+            entry.path = linux.read_process_path(pid)
+            entry.name_threat = self._classify_process(entry.to_dict())
+            if entry.name_threat is None:
+                entry.ancestry_threat = self._classify_by_parent_chain(entry, int(fields[1]))
+            threat = entry.name_threat or entry.ancestry_threat
+
+            if threat:
+                self._event_threats.append(threat)
+
+        if threat:
+            self.logger.warning(f"Blocked process started: {name} (pid {pid})")
+            if self._event_callback:
+                self._event_callback()
+
+    def _on_process_exit(self, pid: int):
+        with self._tracker_lock:
+            self._tracker.remove(pid)
+
+    def _drain_event_threats(self) -> list[dict]:
+        threats = self._event_threats
+        self._event_threats = []
+        return threats
+
+    def _executable_path(self, proc: dict) -> str:
+        # /proc/<pid>/exe still reaches the running binary after it was renamed or deleted.
+        return f"/proc/{proc['pid']}/exe" if is_linux() else proc.get('path', '')
+
+    def _detect_by_executable_hash(self, processes: list[dict]) -> list[dict]:
+        if self.fingerprints is None:
+            return []
+
+        self.logger.info("Checking unclassified process executables against known hashes")
+        candidates = [proc for proc in processes if proc['name'] not in self.signatures]
+        paths = {proc['pid']: self._executable_path(proc) for proc in candidates}
+        digests = self.fingerprints.resolve((path for path in paths.values() if path), EXE_HASH_TIMEOUT)
+        self.fingerprints.save()
+
+        threats = []
+        for proc in candidates:
+            threat = self._classify_by_hash(proc, digests.get(paths[proc['pid']]))
+            if threat:
+                threats.append(threat)
+        return threats
+
+    def _update_executable_hashes(self):
+        # Entries keep asking until their digest is known, which is a stat and a dict hit.
+        if self.fingerprints is None:
+            return
+
+        for entry in self._tracker:
+            if entry.exe_digest is not None or entry.name_threat:
+                continue
+
+            proc = entry.to_dict()
+            entry.exe_digest = self.fingerprints.lookup(self._executable_path(proc))
+            entry.hash_threat = self._classify_by_hash(proc, entry.exe_digest)
+
+        self.fingerprints.save()
+
+    def _classify_by_hash(self, proc: dict, digest: Optional[str]) -> Optional[dict]:
+        known_name = KNOWN_REMOTE_ACCESS_HASHES.get(digest) if digest else None
+        if known_name is None:
+            return None
+
+        signature = self.signatures.lookup(known_name)
+        self.logger.debug(f"Executable of {proc['name']} (pid {proc['pid']}) matches {known_name}")
+        return {
+            'name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'tier': signature[1] if signature else 'CRITICAL',
+            'category': signature[0] if signature else None,
+            'detection_method': 'executable_hash',
+            'details': f"Executable matches known {known_name} build"
+        }
+
+    def _on_executable_hashed(self, key: tuple, digest: str):
+        # Runs on a hashing thread; wakes the monitor loop early when a known build shows up.
+        if digest in KNOWN_REMOTE_ACCESS_HASHES and self._event_callback:
+            self._event_callback()
+
+    def _detect_by_ancestry(self, processes: list[dict], threats: list[dict]) -> list[dict]:
+        # Helpers launched by a blocked tool (sh -c wrappers, renamed workers) inherit its tier.
+        roots = {t['pid']: t for t in threats}
+        if not roots:
+            return []
+
+        tree = ProcessTree.from_processes(processes)
+        by_pid = {proc['pid']: proc for proc in processes}
+
+        found = []
+        for root_pid, root in roots.items():
+            for pid in tree.descendants(root_pid):
+                if pid in roots or pid not in by_pid:
+                    continue
+                found.append(self._ancestry_threat(by_pid[pid], root))
+        return found
+
+    def _update_ancestry(self, tree: ProcessTree):
+        # Re-derived only when the parent links or the set of blocked processes changed.
+        roots = frozenset(
+            entry.pid for entry in self._tracker if entry.name_threat or entry.hash_threat
+        )
+        if roots == self._ancestry_roots and tree == self._process_tree:
+            self._process_tree = tree
+            return
+
+        self._process_tree = tree
+        self._ancestry_roots = roots
+
+        for entry in self._tracker:
+            entry.ancestry_threat = None
+
+        for root_pid in roots:
+            root = self._tracker.get(root_pid)
+            for pid in tree.descendants(root_pid):
+                entry = self._tracker.get(pid)
+                if entry is not None and pid not in roots:
+                    entry.ancestry_threat = self._ancestry_threat(entry.to_dict(), root.name_threat or root.hash_threat)
+
+    def _classify_by_parent_chain(self, entry, ppid: int) -> Optional[dict]:
+        # Event path: walks the last cycle's tree upwards from the new process's parent.
+        for pid in (ppid, *self._process_tree.ancestors(ppid)):
+            parent = self._tracker.get(pid)
+            if parent is not None and (parent.name_threat or parent.hash_threat):
+                return self._ancestry_threat(entry.to_dict(), parent.name_threat or parent.hash_threat)
+        return None
+
+    def _ancestry_threat(self, proc: dict, parent_threat: dict) -> dict:
+        return {
+            'name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'tier': parent_threat['tier'],
+            'category': parent_threat.get('category'),
+            'detection_method': 'process_ancestry',
+            'details': f"Spawned by {parent_threat['name']} (pid {parent_threat['pid']})"
+        }
+
+    def _classify_process(self, proc: dict) -> Optional[dict]:
+        return self._classify_by_name(proc) or self._classify_by_cmdline(proc)
+
+    def _classify_by_cmdline(self, proc: dict) -> Optional[dict]:
+        # Only reached for names that did not match, so /proc/<pid>/cmdline is read lazily.
+        cmdline = proc.get('cmdline', '')
+        if not cmdline and is_linux():
+            from integritywatch.utils.platform import linux
+            cmdline = linux.read_process_cmdline(proc['pid'])
+
+        match = self.cmdline_signatures.match(proc.get('path', ''), cmdline)
+        if match is None:
+            return None
+
+        tool, matched = match
+        signature = self.signatures.lookup(tool)
+        self.logger.debug(f"Command line of {proc['name']} (pid {proc['pid']}) matches {tool}")
+        return {
+            'name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'tier': signature[1] if signature else 'CRITICAL',
+            'category': signature[0] if signature else None,
+            'detection_method': 'process_cmdline',
+            'details': f"Command line matches {tool} ({matched})"
+        }
+
+    def _classify_by_name(self, proc: dict) -> Optional[dict]:
+        signature = self.signatures.lookup(proc['name'])
+        if signature is None:
+            return None
+
+        category, tier = signature
+        self.logger.debug(f"Found Threat {proc['name']} with pid {proc['pid']}")
+        return {
+            'name': proc['name'],
+            'pid':proc['pid'],
+            'path':proc['path'],
+            'tier': tier,
+            'category': category,
+            'detection_method': 'process_name'
+        }
+
+    def _network_threat(self, proc: dict, suspicious: dict) -> dict:
+        return {
+            'name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'tier': 'CRITICAL',
+            'detection_method': suspicious['method'],
+            'details': suspicious['details']
+        }
+
+    def _build_result(self, threats: list[dict], process_count: int) -> TechniqueResult:
+        if threats:
+            critical = [t for t in threats if t['tier'] == 'CRITICAL']
+            low = [t for t in threats if t['tier'] == 'LOW']
+            unknown = [t for t in threats if t['tier'] == 'UNKNOWN']
+            threat_list = []
+
+            if critical:
+                tier = 'CRITICAL'
+                threat_list = critical
+                summary = f"Critical remote access tool(s) detected"
+            
+            elif low:
+                tier = 'LOW'
+                threat_list = low
+                summary = f"Screen Sharing service(s) detected"
+
+            else:
+                tier = 'UNKNOWN'
+                threat_list = unknown
+                summary = f"Screen Sharing service(s) detected"
+
+            unique_names = []
+            seen = set()
+
+            for t in threat_list:
+                name = t.get('name', 'Unknown')
+
+                if name.lower() not in seen:
+                    unique_names.append(name)
+                    seen.add(name.lower())
+                
+            
+            if len(unique_names) <= 3:
+                details = f"{summary}:- {', '.join(unique_names)}"
+            else:
+                details = f"{summary}:- {', '.join(unique_names[:3])} (and {len(unique_names) - 3} more)"
+
+            return TechniqueResult(
+                name=self.name,
+                detected=True,
+                tier=tier,
+                details=details,
+                data={'threats': threats}
+            )
         
+        else:
+            return TechniqueResult(
+                name=self.name,
+                detected=False,
+                details=f"No blocked processes found ({process_count} processes checked)"
+            )
+    
     def _detect_by_network_behavior(self, processes: list[dict]) -> list[dict]:
         threats = []
 
         self.logger.info("Checking running processes with known ports")
+        self.verdicts.invalidate_addresses(self._drain_resolved_addresses())
+        snapshot = self._get_connection_snapshot()
+        if snapshot:
+            self._prefetch_hostnames(snapshot)
+
         for proc in processes:
-            if proc['name'].lower() in self.blocked_names:
+            if proc['name'] in self.signatures:
                 continue
 
-            suspicious = self._analyze_connections(proc['pid'], proc['name'])
+            suspicious = self._analyze_connections(proc['pid'], proc['name'], snapshot)
 
             if suspicious:
-                threats.append({
-                    'name': proc['name'],
-                    'pid': proc['pid'],
-                    'path': proc['path'],
-                    'tier': 'CRITICAL',
-                    'detection_method': suspicious['method'],
-                    'details': suspicious['details']
-                })
-        
+                threats.append(self._network_threat(proc, suspicious))
+
+        self._evict_closed_connections(snapshot)
         return threats
     
-    def _analyze_connections(self, pid: int, process_name: str) -> Optional[dict]:
+    def _get_connection_snapshot(self) -> Optional[dict[int, list[dict]]]:
+        # One system-wide query per cycle; None means fall back to per-PID lookups.
+        if self.get_all_connections is None:
+            return None
+
+        # Only ESTABLISHED rows that can trip a port or reverse-DNS check are materialized.
+        snapshot = self.get_all_connections(
+            states=('ESTABLISHED',),
+            ports=SUSPICIOUS_PORTS,
+            ignore_remote_ports=COMMON_LEGITIMATE_PORTS
+        )
+        self.logger.debug(f"Connection snapshot: {sum(len(c) for c in snapshot.values())} sockets across {len(snapshot)} processes")
+
+        skipped = self.fd_scan_skipped() if self.fd_scan_skipped else 0
+        if skipped != self._reported_fd_skips:
+            # Sockets of these processes cannot be attributed without elevated privileges.
+            if skipped:
+                self.logger.warning(f"Socket ownership unavailable for {skipped} processes (permission denied)")
+            self._reported_fd_skips = skipped
+
+        return snapshot
+
+    def _analyze_connections(self, pid: int, process_name: str, snapshot: Optional[dict[int, list[dict]]] = None) -> Optional[dict]:
         try:
-            connections = self.get_connections(pid)
+            if snapshot is not None:
+                connections = snapshot.get(pid)
+            else:
+                connections = self.get_connections(pid)
 
             if not connections:
                 return None
@@ -179,39 +562,18 @@ class ProcessDetector(BaseDetector):
             for conn in connections:
                 if conn['state'] != 'ESTABLISHED':
                     continue
-                
-                # Check 2: PORT Based Blocking
-                if conn['local_port'] in SUSPICIOUS_PORTS:
-                    tool = PORT_TO_TOOL.get(conn['local_port'], 'Unknown Remote Access Tool')
 
-                    self.logger.debug(f"Found suspicious local port with {tool} on port {conn['local_port']} and pid {conn['pid']}")
-                    return {
-                        'method': 'network_port',
-                        'details': f"Connecting to {tool} port {conn['local_port']} ({conn['remote_addr']})"
-                    }
-                
-                if conn['remote_port'] in SUSPICIOUS_PORTS:
-                    tool = PORT_TO_TOOL.get(conn['remote_port'], 'Unknown Remote Access Tool')
+                key = connection_key(conn)
+                self._live_connections.add(key)
 
-                    self.logger.debug(f"Found suspicious remote port with {tool} on port {conn['remote_port']} and pid {conn['pid']}")
-                    return {
-                        'method': 'network_port',
-                        'details': f"Connecting to {tool} port {conn['remote_port']} ({conn['remote_addr']})"
-                    }
-                
-                # Check 3: Reverse Domain Lookup for unidentified or fallback ports
-                self.logger.info("Checking running processes with reverse dns lookup")
-                if conn['remote_port'] in COMMON_FALLBACK_PORTS or conn['remote_port'] not in COMMON_LEGITIMATE_PORTS:
-                    hostname = self.reverse_dns(conn['remote_addr'])
-
-                    if hostname:
-                        for domain in KNOWN_REMOTE_ACCESS_DOMAINS:
-                            if domain in hostname.lower():
-                                self.logger.debug(f"Found {hostname} on port {conn['remote_port']} and pid {conn['pid']}")
-                                return {
-                                    'method': 'network_reverse_domain_lookup',
-                                    'details': f"Connecting to {hostname} on port {conn['remote_port']} (remote access infrastructure)"
-                                }
+                suspicious = self.verdicts.get(key)
+                if suspicious is MISS:
+                    suspicious, final = self._analyze_connection(conn)
+                    if final:
+                        self.verdicts.put(key, suspicious)
+
+                if suspicious:
+                    return suspicious
                 
             return None
         
@@ -219,6 +581,127 @@ class ProcessDetector(BaseDetector):
             self.logger.debug(f"Connection analysis failed for PID {pid}: {e}")
             return None
 
+    def _analyze_connection(self, conn: dict) -> tuple[Optional[dict], bool]:
+        # Returns the finding and whether it is final; a clean verdict that still waits on a
+        # reverse lookup is not cached, so the late answer is seen next cycle.
+
+        # Check 2: PORT Based Blocking
+        if conn['local_port'] in SUSPICIOUS_PORTS:
+            tool = PORT_TO_TOOL.get(conn['local_port'], 'Unknown Remote Access Tool')
+
+            self.logger.debug(f"Found suspicious local port with {tool} on port {conn['local_port']} and pid {conn['pid']}")
+            return {
+                'method': 'network_port',
+                'details': f"Connecting to {tool} port {conn['local_port']} ({conn['remote_addr']})",
+                'inode': conn.get('inode')
+            }, True
+        
+        if conn['remote_port'] in SUSPICIOUS_PORTS:
+            tool = PORT_TO_TOOL.get(conn['remote_port'], 'Unknown Remote Access Tool')
+
+            self.logger.debug(f"Found suspicious remote port with {tool} on port {conn['remote_port']} and pid {conn['pid']}")
+            return {
+                'method': 'network_port',
+                'details': f"Connecting to {tool} port {conn['remote_port']} ({conn['remote_addr']})",
+                'inode': conn.get('inode')
+            }, True
+
+        # Checks 3 and 4 only look at fallback or unidentified ports; shared hosting and CDN
+        # addresses carry plenty of ordinary traffic on the well-known ones.
+        if not self._needs_reverse_dns(conn):
+            return None, True
+
+        # Check 3: Known remote access address ranges, no network round trip
+        owner = self.networks.match(conn['remote_addr'])
+        if owner:
+            self.logger.debug(f"Found {conn['remote_addr']} in {owner} range on port {conn['remote_port']} and pid {conn['pid']}")
+            return {
+                'method': 'network_ip_range',
+                'details': f"Connecting to {conn['remote_addr']} on port {conn['remote_port']} ({owner} infrastructure)",
+                'inode': conn.get('inode')
+            }, True
+
+        # Check 4: Reverse Domain Lookup
+        self.logger.info("Checking running processes with reverse dns lookup")
+        hostname = self._lookup_hostname(conn['remote_addr'])
+
+        if hostname:
+            for domain in KNOWN_REMOTE_ACCESS_DOMAINS:
+                if domain in hostname.lower():
+                    self.logger.debug(f"Found {hostname} on port {conn['remote_port']} and pid {conn['pid']}")
+                    return {
+                        'method': 'network_reverse_domain_lookup',
+                        'details': f"Connecting to {hostname} on port {conn['remote_port']} (remote access infrastructure)",
+                        'inode': conn.get('inode')
+                    }, True
+
+        return None, self.resolver is None or self.resolver.get(conn['remote_addr']) is not None
+
+    def _evict_closed_connections(self, snapshot: Optional[dict[int, list[dict]]]):
+        # With a snapshot every open socket is known; otherwise only those seen this cycle.
+        if snapshot is not None:
+            self._live_connections.update(
+                connection_key(conn) for connections in snapshot.values() for conn in connections
+            )
+
+        self.verdicts.evict(self._live_connections)
+        self._live_connections = set()
+
+    def _needs_reverse_dns(self, conn: dict) -> bool:
+        return conn['remote_port'] in COMMON_FALLBACK_PORTS or conn['remote_port'] not in COMMON_LEGITIMATE_PORTS
+
+    def _prefetch_hostnames(self, snapshot: dict[int, list[dict]]):
+        # Resolve every candidate address of this cycle concurrently, bounded by one deadline.
+        if self.resolver is None:
+            return
+
+        addresses = {
+            conn['remote_addr']
+            for connections in snapshot.values()
+            for conn in connections
+            if conn['state'] == 'ESTABLISHED'
+            and conn['local_port'] not in SUSPICIOUS_PORTS
+            and conn['remote_port'] not in SUSPICIOUS_PORTS
+            and self._needs_reverse_dns(conn)
+            and self.networks.match(conn['remote_addr']) is None
+            and self.verdicts.get(connection_key(conn)) is MISS
+        }
+
+        if addresses:
+            self.logger.debug(f"Resolving {len(addresses)} remote addresses")
+            self.resolver.resolve(addresses)
+
+    def _lookup_hostname(self, ip_address: str) -> str:
+        # Never waits: misses were batched by _prefetch_hostnames, anything still missing is
+        # queued here and its answer is used next cycle.
+        if self.resolver is None:
+            return ""
+
+        hostname = self.resolver.get(ip_address)
+        if hostname is None:
+            self.resolver.submit(ip_address)
+        return hostname or ""
+
+    def _on_hostname_resolved(self, ip_address: str, hostname: str):
+        # Runs on a resolver thread; processes talking to the host are re-checked, and the
+        # monitor loop is woken rather than left to find the answer on its next tick.
+        if hostname and any(domain in hostname.lower() for domain in KNOWN_REMOTE_ACCESS_DOMAINS):
+            self.logger.info(f"Resolved {ip_address} to remote access host {hostname}")
+            with self._resolved_lock:
+                self._resolved_addresses.add(ip_address)
+            if self._event_callback:
+                self._event_callback()
+
+    def _on_networks_updated(self, addresses: set[str]):
+        # Runs on the refresh thread; connections to newly resolved hosts are re-checked.
+        with self._resolved_lock:
+            self._resolved_addresses.update(addresses)
+
+    def _drain_resolved_addresses(self) -> set[str]:
+        with self._resolved_lock:
+            resolved = self._resolved_addresses
+            self._resolved_addresses = set()
+        return resolved
 
     def _check_if_active(self, pid: int) -> bool:
         try:
@@ -234,58 +717,24 @@ class ProcessDetector(BaseDetector):
             return False
 
     def _get_tier(self, process_name: str) -> str:
-        name_lower = process_name.lower()
-
-        allow_conference = config.get('remote_access',"allow_conference_tools", False)
-
-        critical_categories = [
-            'commercial_tools',
-            'vnc_variants', 
-            'windows_native',
-            'browser_extensions',
-            'admin_tools',
-            'screen_recording',
-            'virtual_camera',
-            'streaming_software'
-        ]
-
-        for category in critical_categories:
-            if category in PROCESS_BLOCKLIST:
-                category_procs = [p.lower() for p in PROCESS_BLOCKLIST[category]]
-                if name_lower in category_procs:
-                    return 'CRITICAL'
-                
-        if 'conference_tools_sharing' in PROCESS_BLOCKLIST:
-            conference_procs = [p.lower() for p in PROCESS_BLOCKLIST['conference_tools_sharing']]
-            if name_lower in conference_procs:
-                if allow_conference:
-                    return 'LOW'     
-                else:
-                    return 'CRITICAL'
-        
-        return 'UNKOWN'
+        signature = self.signatures.lookup(process_name)
+        return signature[1] if signature else 'UNKNOWN'
     
-    def _enumerate_processes(self) -> list[dict[str, Any]]:
-        from integritywatch.utils.platform.base import is_windows, is_linux, is_macos
-
+    def _enumerate_processes(self) -> list[ProcessView]:
+        # The table is updated in place, so each cycle only rewrites changed rows and the
+        # returned views stay valid until the next enumeration.
         if is_windows():
-            from integritywatch.utils.platform.windows import enumerate_processes
-            
-            processes = enumerate_processes()
-            self.logger.info(f"WMI: Enumerated {len(processes)} processes")
-            return processes
-        
+            from integritywatch.utils.platform.windows import iter_process_records
+            source = "WMI"
         elif is_linux():
-            from integritywatch.utils.platform.linux import enumerate_processes
-
-            processes = enumerate_processes()
-            self.logger.info(f"Linux: Enumerated {len(processes)} processes")
-            return processes
-
+            from integritywatch.utils.platform.linux import iter_process_records
+            source = "Linux"
         elif is_macos():
-            from integritywatch.utils.platform.macos import enumerate_processes
-            
-            processes = enumerate_processes()
-            self.logger.info(f"Linux: Enumerated {len(processes)} processes")
-            return processes
-        return []
\ No newline at end of file
+            from integritywatch.utils.platform.macos import iter_process_records
+            source = "macOS"
+        else:
+            return []
+
+        added, removed = self._process_table.update(iter_process_records(self._process_table.cached_path))
+        self.logger.info(f"{source}: Enumerated {len(self._process_table)} processes (+{added}/-{removed})")
+        return list(self._process_table)
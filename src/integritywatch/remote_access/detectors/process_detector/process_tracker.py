@@ -0,0 +1,127 @@
+from typing import Optional
+
+
+class TrackedProcess:
+    __slots__ = ('pid', 'starttime', 'name', 'path', 'name_threat', 'hash_threat', 'exe_digest', 'ancestry_threat', 'network_threat', 'threat_inode', 'socket_inodes')
+
+    def __init__(self, pid: int, starttime: int, name: str):
+        self.pid = pid
+        self.starttime = starttime
+        self.name = name
+        self.path = ''
+        self.reset()
+
+    def reset(self):
+        self.name_threat: Optional[dict] = None
+        self.hash_threat: Optional[dict] = None
+        self.exe_digest: Optional[str] = None
+        self.ancestry_threat: Optional[dict] = None
+        self.network_threat: Optional[dict] = None
+        self.threat_inode: Optional[int] = None
+        self.socket_inodes: frozenset = frozenset()
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'pid': self.pid,
+            'path': self.path,
+            'cmdline': '',
+            'starttime': self.starttime
+        }
+
+
+class ProcessTracker:
+    """Remembers classified processes between monitoring cycles, keyed by (pid, starttime).
+
+    A recycled PID comes back with a new start time and is treated as a new process; an
+    exec() keeps the key but changes the name, which marks the entry as changed.
+    """
+
+    def __init__(self):
+        self._by_pid: dict[int, TrackedProcess] = {}
+        self._socket_pids: set[int] = set()
+
+    def reconcile(self, identities: dict[int, tuple[int, str, int]]) -> tuple[list[TrackedProcess], int]:
+        # Returns the new or changed entries that need classifying, and how many exited.
+        exited = [pid for pid in self._by_pid if pid not in identities]
+        for pid in exited:
+            del self._by_pid[pid]
+
+        dirty = []
+        for pid, (starttime, name, _) in identities.items():
+            entry = self.observe(pid, starttime, name)
+            if entry is not None:
+                dirty.append(entry)
+
+        return dirty, len(exited)
+
+    def observe(self, pid: int, starttime: int, name: str) -> Optional[TrackedProcess]:
+        # Returns the entry when it is new or changed, None when it is already classified.
+        entry = self._by_pid.get(pid)
+
+        if entry is None or entry.starttime != starttime:
+            entry = TrackedProcess(pid, starttime, name)
+            self._by_pid[pid] = entry
+            return entry
+
+        if entry.name != name:
+            entry.name = name
+            entry.reset()
+            return entry
+
+        return None
+
+    def remove(self, pid: int):
+        self._by_pid.pop(pid, None)
+        self._socket_pids.discard(pid)
+
+    def update_sockets(self, snapshot: dict[int, list[dict]], resolved: set[str]) -> list[TrackedProcess]:
+        # Returns the entries whose connections need analysing again: the process gained a
+        # socket, lost the socket behind its network threat, or talks to an address whose
+        # reverse lookup only matched after the deadline of an earlier cycle.
+        for pid in self._socket_pids - snapshot.keys():
+            entry = self._by_pid.get(pid)
+            if entry is not None:
+                entry.socket_inodes = frozenset()
+                entry.network_threat = None
+                entry.threat_inode = None
+        self._socket_pids = set(snapshot)
+
+        recheck = []
+        for pid, connections in snapshot.items():
+            entry = self._by_pid.get(pid)
+            if entry is None:
+                continue
+
+            inodes = frozenset(conn['inode'] for conn in connections)
+            gained = not inodes <= entry.socket_inodes
+            lost_threat = entry.network_threat is not None and entry.threat_inode not in inodes
+            late_match = bool(resolved) and any(conn['remote_addr'] in resolved for conn in connections)
+
+            entry.socket_inodes = inodes
+            if gained or lost_threat or late_match:
+                recheck.append(entry)
+
+        return recheck
+
+    def get(self, pid: int) -> Optional[TrackedProcess]:
+        return self._by_pid.get(pid)
+
+    def threats(self) -> list[dict]:
+        threats = []
+        for entry in self._by_pid.values():
+            if entry.name_threat:
+                threats.append(entry.name_threat)
+            if entry.hash_threat:
+                threats.append(entry.hash_threat)
+            if entry.ancestry_threat:
+                threats.append(entry.ancestry_threat)
+            if entry.network_threat:
+                threats.append(entry.network_threat)
+        return threats
+
+    def __iter__(self):
+        return iter(self._by_pid.values())
+
+    def __len__(self) -> int:
+        return len(self._by_pid)
@@ -0,0 +1,56 @@
+from typing import Iterator, Optional
+
+
+class ProcessTree:
+    """Parent/child index over one process listing.
+
+    Built from the ppid gathered in the same enumeration pass, so walking a process's
+    ancestors costs one dict lookup per level and never touches the filesystem.
+    """
+
+    def __init__(self, parents: dict[int, int]):
+        self._parents = parents
+        self._children: Optional[dict[int, list[int]]] = None
+
+    @classmethod
+    def from_processes(cls, processes: list[dict]) -> 'ProcessTree':
+        return cls({proc['pid']: proc['ppid'] for proc in processes if 'ppid' in proc})
+
+    def parent(self, pid: int) -> Optional[int]:
+        return self._parents.get(pid)
+
+    def ancestors(self, pid: int) -> Iterator[int]:
+        # Nearest first; stops at the root or on a ppid loop left by PID reuse.
+        seen = {pid}
+        ppid = self._parents.get(pid)
+        while ppid and ppid not in seen:
+            yield ppid
+            seen.add(ppid)
+            ppid = self._parents.get(ppid)
+
+    def children(self, pid: int) -> list[int]:
+        if self._children is None:
+            self._children = {}
+            for child, ppid in self._parents.items():
+                self._children.setdefault(ppid, []).append(child)
+        return self._children.get(pid, [])
+
+    def descendants(self, pid: int) -> Iterator[int]:
+        seen = {pid}
+        stack = list(self.children(pid))
+        while stack:
+            child = stack.pop()
+            if child in seen:
+                continue
+            seen.add(child)
+            yield child
+            stack.extend(self.children(child))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ProcessTree) and self._parents == other._parents
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
@@ -0,0 +1,75 @@
+from typing import Optional
+
+from integritywatch.config import config
+
+from ...constants import PROCESS_BLOCKLIST
+
+CRITICAL_CATEGORIES = (
+    'commercial_tools',
+    'vnc_variants',
+    'windows_native',
+    'browser_extensions',
+    'admin_tools',
+    'screen_recording',
+    'virtual_camera',
+    'streaming_software'
+)
+CONFERENCE_CATEGORY = 'conference_tools_sharing'
+
+
+def normalize_process_name(name: str) -> str:
+    name = name.casefold()
+    if name.endswith('.exe'):
+        name = name[:-4]
+    return name
+
+
+class ProcessSignatureIndex:
+    """Maps a normalized process name straight to its (category, tier).
+
+    Built once from PROCESS_BLOCKLIST and the settings that affect tiers; refresh() only
+    rebuilds when one of those settings has changed since the last build.
+    """
+
+    def __init__(self, blocklist: dict[str, set[str]] = PROCESS_BLOCKLIST):
+        self._blocklist = blocklist
+        self._allow_conference: Optional[bool] = None
+        self._index: dict[str, tuple[str, str]] = {}
+        self.refresh()
+
+    def refresh(self) -> bool:
+        # Returns True when the index was rebuilt, so callers can re-tier cached verdicts.
+        allow_conference = bool(config.get('remote_access', "allow_conference_tools", False))
+        if allow_conference == self._allow_conference:
+            return False
+
+        self._index = self._build(allow_conference)
+        self._allow_conference = allow_conference
+        return True
+
+    def _build(self, allow_conference: bool) -> dict[str, tuple[str, str]]:
+        index = {}
+
+        # Critical categories go in first so a name listed twice keeps the stricter tier.
+        for category in CRITICAL_CATEGORIES:
+            for name in self._blocklist.get(category, ()):
+                index.setdefault(normalize_process_name(name), (category, 'CRITICAL'))
+
+        conference_tier = 'LOW' if allow_conference else 'CRITICAL'
+        for name in self._blocklist.get(CONFERENCE_CATEGORY, ()):
+            index.setdefault(normalize_process_name(name), (CONFERENCE_CATEGORY, conference_tier))
+
+        for category, names in self._blocklist.items():
+            for name in names:
+                index.setdefault(normalize_process_name(name), (category, 'UNKNOWN'))
+
+        return index
+
+    def lookup(self, process_name: str) -> Optional[tuple[str, str]]:
+        return self._index.get(normalize_process_name(process_name))
+
+    def __contains__(self, process_name: str) -> bool:
+        return normalize_process_name(process_name) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
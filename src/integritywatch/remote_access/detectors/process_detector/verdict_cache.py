@@ -0,0 +1,45 @@
+from typing import Iterable, Optional
+
+ConnectionKey = tuple  # (pid, local_addr, local_port, remote_addr, remote_port, inode)
+
+MISS = object()
+
+
+def connection_key(conn: dict) -> ConnectionKey:
+    return (conn['pid'], conn['local_addr'], conn['local_port'], conn['remote_addr'], conn['remote_port'], conn.get('inode'))
+
+
+class ConnectionVerdictCache:
+    """Analysis outcome per connection, kept for as long as the socket stays open.
+
+    A verdict is the finding dict or None for a clean connection; get() returns MISS for a
+    connection that has not been analyzed yet. Entries go away with their socket (evict())
+    or when an address starts matching something new (invalidate_addresses()).
+    """
+
+    def __init__(self):
+        self._verdicts: dict[ConnectionKey, Optional[dict]] = {}
+
+    def get(self, key: ConnectionKey):
+        return self._verdicts.get(key, MISS)
+
+    def put(self, key: ConnectionKey, verdict: Optional[dict]):
+        self._verdicts[key] = verdict
+
+    def evict(self, live_keys: set[ConnectionKey]) -> int:
+        gone = [key for key in self._verdicts if key not in live_keys]
+        for key in gone:
+            del self._verdicts[key]
+        return len(gone)
+
+    def invalidate_addresses(self, addresses: Iterable[str]):
+        addresses = set(addresses)
+        if not addresses:
+            return
+
+        stale = [key for key in self._verdicts if key[3] in addresses]
+        for key in stale:
+            del self._verdicts[key]
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
@@ -0,0 +1,166 @@
+import struct
+import threading
+from typing import Optional
+
+from integritywatch.utils.logger import get_logger
+
+Registers = tuple[int, int, int, int]  # eax, ebx, ecx, edx
+
+HYPERVISOR_LEAF = 0x40000000
+# Leaves read in one batch: standard vendor/features, the hypervisor range, and 0x40000100
+# where KVM moves its signature when it also exposes Hyper-V enlightenments.
+PROBE_LEAVES = (0, 1, *range(HYPERVISOR_LEAF, HYPERVISOR_LEAF + 0x11), 0x40000100)
+
+HYPERVISOR_BIT = 1 << 31  # CPUID.1:ECX[31]
+
+
+class CPUIDProbe:
+    """CPUID leaves read once per process and shared by every detector that needs them.
+
+    Leaves come from the `cpuid` package in a single batch on first use. Without it the
+    probe falls back to the first processor block of /proc/cpuinfo, which gives the vendor
+    and the hypervisor flag but no raw registers. `registers` injects a leaf -> register
+    fixture instead of touching the CPU at all.
+    """
+
+    def __init__(self, registers: Optional[dict[int, Registers]] = None, cpuinfo_path: str = '/proc/cpuinfo'):
+        self.logger = get_logger("utils.cpuid_probe")
+        self.cpuinfo_path = cpuinfo_path
+        self._source: Optional[str] = None
+        self.error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._registers: dict[int, Registers] = {}
+        self._cpuinfo: dict[str, str] = {}
+        self._loaded = False
+
+        if registers is not None:
+            self._registers = dict(registers)
+            self._source = 'fixture'
+            self._loaded = True
+
+    def registers(self, leaf: int) -> Optional[Registers]:
+        self._load()
+        return self._registers.get(leaf)
+
+    @property
+    def source(self) -> Optional[str]:
+        # 'fixture', 'cpuid', 'cpuinfo' or None when nothing could be read.
+        self._load()
+        return self._source
+
+    @property
+    def available(self) -> bool:
+        return self.source is not None
+
+    @property
+    def vendor(self) -> str:
+        # CPU vendor id, e.g. "GenuineIntel"; "" when unknown.
+        leaf = self.registers(0)
+        if leaf is not None:
+            _, ebx, ecx, edx = leaf
+            return struct.pack('<III', ebx, edx, ecx).decode('ascii', errors='ignore').strip('\x00 ')
+        return self._cpuinfo.get('vendor_id', "")
+
+    @property
+    def max_leaf(self) -> Optional[int]:
+        leaf = self.registers(0)
+        return None if leaf is None else leaf[0]
+
+    @property
+    def hypervisor_bit(self) -> Optional[bool]:
+        # None when neither CPUID nor /proc/cpuinfo could be read.
+        leaf = self.registers(1)
+        if leaf is not None:
+            return bool(leaf[2] & HYPERVISOR_BIT)
+        if 'flags' in self._cpuinfo:
+            return 'hypervisor' in self._cpuinfo['flags'].split()
+        return None
+
+    @property
+    def hypervisor_max_leaf(self) -> Optional[int]:
+        # EAX of leaf 0x40000000, the highest hypervisor leaf when one is present.
+        leaf = self.registers(HYPERVISOR_LEAF)
+        return None if leaf is None else leaf[0]
+
+    def hypervisor_vendor(self, leaf: int = HYPERVISOR_LEAF) -> str:
+        # Hypervisor signature from EBX/ECX/EDX; some report it in EBX/EDX/ECX order.
+        registers = self.registers(leaf)
+        if registers is None:
+            return ""
+
+        _, ebx, ecx, edx = registers
+        for order in ((ebx, ecx, edx), (ebx, edx, ecx)):
+            vendor = struct.pack('<III', *order).decode('ascii', errors='ignore').strip('\x00 ')
+            if len(vendor) >= 3 and not all(c in '@\x00 ' for c in vendor):
+                return vendor
+        return ""
+
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._read_cpuid() or self._read_cpuinfo()
+            self._loaded = True
+
+    def _read_cpuid(self) -> bool:
+        try:
+            from cpuid import cpuid
+        except ImportError:
+            self.logger.debug("cpuid module not available, falling back to /proc/cpuinfo")
+            return False
+
+        try:
+            self._registers = {leaf: tuple(cpuid(leaf)) for leaf in PROBE_LEAVES}
+        except Exception as e:
+            self.error = f"CPUID query failed: {e}"
+            self.logger.warning(self.error)
+            return False
+
+        self._source = 'cpuid'
+        return True
+
+    def _read_cpuinfo(self) -> bool:
+        # Only the first processor block matters; stop as soon as its flags line is in.
+        try:
+            with open(self.cpuinfo_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        break
+                    key, _, value = line.partition(':')
+                    key = key.strip()
+                    if key in ('vendor_id', 'flags'):
+                        self._cpuinfo[key] = value.strip()
+                        if key == 'flags':
+                            break
+        except OSError as e:
+            self.error = self.error or f"Could not read {self.cpuinfo_path}: {e}"
+            return False
+
+        if not self._cpuinfo:
+            return False
+
+        self._source = 'cpuinfo'
+        return True
+
+
+_probe: Optional[CPUIDProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_cpuid_probe() -> CPUIDProbe:
+    global _probe
+    if _probe is None:
+        with _probe_lock:
+            if _probe is None:
+                _probe = CPUIDProbe()
+    return _probe
+
+
+def set_cpuid_probe(probe: Optional[CPUIDProbe]):
+    # Swap the process-wide probe, e.g. for a register fixture; None resets it.
+    global _probe
+    with _probe_lock:
+        _probe = probe
@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from integritywatch.utils.logger import get_logger
+
+
+class ReverseDNSResolver:
+    """Bounded, cached reverse-DNS lookups that never block a caller past its deadline.
+
+    Lookups run on a fixed number of daemon worker threads. Answers are cached for `ttl`
+    seconds and failures (including lookups that overrun `timeout`) for `negative_ttl`.
+    A lookup that is still running when its deadline passes is reported as failed for now;
+    its answer replaces the negative entry once it arrives and is passed to `on_result`.
+    `lookup` is any callable mapping an IP to a hostname ("" when unknown), so a local stub
+    can stand in for the system resolver. At most `max_entries` answers are kept; past that,
+    expired entries go first, then the least recently stored.
+    """
+
+    def __init__(self,
+                 lookup: Callable[[str], str],
+                 max_workers: int = 4,
+                 timeout: float = 2.0,
+                 ttl: float = 300.0,
+                 negative_ttl: float = 60.0,
+                 on_result: Optional[Callable[[str, str], None]] = None,
+                 max_entries: int = 4096):
+        self.logger = get_logger("utils.dns_resolver")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        self._lookup = lookup
+        self._on_result = on_result
+        self._max_workers = max_workers
+
+        self._queue: queue.Queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._cache: OrderedDict[str, tuple[str, float]] = OrderedDict()  # ip -> (hostname or "", expires_at), oldest first
+        self._pending: dict[str, float] = {}            # ip -> deadline
+        self._workers: list[threading.Thread] = []
+
+    def get(self, ip: str) -> Optional[str]:
+        # Cached hostname, "" for a cached failure, None while a lookup is still in time.
+        with self._condition:
+            return self._get_locked(ip, time.monotonic())
+
+    def submit(self, ip: str):
+        now = time.monotonic()
+
+        with self._condition:
+            entry = self._cache.get(ip)
+            if (entry and entry[1] > now) or ip in self._pending:
+                return
+
+            self._pending[ip] = now + self.timeout
+
+        self._start_workers()
+        self._queue.put(ip)
+
+    def resolve(self, ips: Iterable[str], timeout: Optional[float] = None) -> dict[str, Optional[str]]:
+        # Submits every address at once and waits at most `timeout` for the whole batch.
+        ips = list(dict.fromkeys(ips))
+        for ip in ips:
+            self.submit(ip)
+
+        now = time.monotonic()
+        wait_until = now + (self.timeout if timeout is None else timeout)
+
+        with self._condition:
+            while True:
+                results = {ip: self._get_locked(ip, now) for ip in ips}
+                # An answer evicted by a batch larger than max_entries stays None; it is no
+                # longer pending, so there is nothing left to wait for.
+                if all(hostname is not None or ip not in self._pending for ip, hostname in results.items()) \
+                        or now >= wait_until:
+                    return results
+
+                self._condition.wait(wait_until - now)
+                now = time.monotonic()
+
+    def _get_locked(self, ip: str, now: float) -> Optional[str]:
+        entry = self._cache.get(ip)
+        if entry and entry[1] > now:
+            return entry[0]
+
+        deadline = self._pending.get(ip)
+        if deadline is None:
+            return None
+
+        if deadline <= now:
+            self._store_locked(ip, "", now + self.negative_ttl, now)
+            return ""
+
+        return None
+
+    def _store_locked(self, ip: str, hostname: str, expires_at: float, now: float):
+        self._cache[ip] = (hostname, expires_at)
+        self._cache.move_to_end(ip)
+        if len(self._cache) > self.max_entries:
+            self._prune_locked(now)
+
+    def _prune_locked(self, now: float):
+        expired = [ip for ip, (_, expires_at) in self._cache.items() if expires_at <= now]
+        for ip in expired:
+            del self._cache[ip]
+
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _start_workers(self):
+        if len(self._workers) >= self._max_workers:
+            return
+
+        with self._condition:
+            while len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._worker_loop, name="rdns-worker", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _worker_loop(self):
+        while True:
+            ip = self._queue.get()
+
+            try:
+                hostname = self._lookup(ip) or ""
+            except Exception as e:
+                self.logger.debug(f"Reverse lookup failed for {ip}: {e}")
+                hostname = ""
+
+            now = time.monotonic()
+            with self._condition:
+                self._pending.pop(ip, None)
+                self._store_locked(ip, hostname, now + (self.ttl if hostname else self.negative_ttl), now)
+                self._condition.notify_all()
+
+            if self._on_result:
+                try:
+                    self._on_result(ip, hostname)
+                except Exception as e:
+                    self.logger.debug(f"Resolver callback failed for {ip}: {e}")
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from integritywatch.utils.logger import get_logger
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+FileKey = tuple[int, int, int, int]  # (st_dev, st_ino, st_size, st_mtime_ns)
+
+
+def stat_key(path: str) -> Optional[FileKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class ExecutableFingerprintCache:
+    """SHA-256 digests of executables, keyed by the file's (st_dev, st_ino, st_size, st_mtime).
+
+    Each unique binary is hashed at most once, on a small background pool; lookup() never
+    blocks and returns None until the digest is known. Digests are persisted to `cache_path`
+    by save() so a warm start only stats files. An edited or replaced binary gets a new key
+    and is hashed again.
+    """
+
+    def __init__(self,
+                 cache_path: Optional[str] = None,
+                 max_workers: int = 2,
+                 on_result: Optional[Callable[[FileKey, str], None]] = None):
+        self.logger = get_logger("utils.exe_fingerprint")
+        self.cache_path = Path(cache_path) if cache_path else None
+
+        self._on_result = on_result
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="exe-hash")
+        self._condition = threading.Condition()
+        self._digests: dict[FileKey, str] = {}
+        self._pending: set[FileKey] = set()
+        self._dirty = False
+
+        self._load()
+
+    def lookup(self, path: str) -> Optional[str]:
+        # Cached digest, "" when the file could not be read, None while hashing is pending.
+        key = stat_key(path)
+        if key is None:
+            return ""
+
+        with self._condition:
+            digest = self._digests.get(key)
+            if digest is not None or key in self._pending:
+                return digest
+            self._pending.add(key)
+
+        self._executor.submit(self._hash_file, key, path)
+        return None
+
+    def resolve(self, paths: Iterable[str], timeout: float) -> dict[str, Optional[str]]:
+        # Looks every path up at once and waits at most `timeout` for the pending hashes.
+        keys = {}
+        results = {}
+        for path in dict.fromkeys(paths):
+            results[path] = self.lookup(path)
+            if results[path] is None:
+                keys[path] = stat_key(path)
+
+        if not keys:
+            return results
+
+        with self._condition:
+            self._condition.wait_for(lambda: not any(key in self._pending for key in keys.values()), timeout)
+            for path, key in keys.items():
+                results[path] = self._digests.get(key)
+
+        return results
+
+    def save(self):
+        if self.cache_path is None or not self._dirty:
+            return
+
+        with self._condition:
+            entries = [[*key, digest] for key, digest in self._digests.items() if digest]
+            self._dirty = False
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': 1, 'entries': entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save executable hash cache: {e}")
+
+    def _load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+
+            if data.get('version') != 1:
+                return
+
+            for dev, ino, size, mtime_ns, digest in data.get('entries', []):
+                self._digests[(dev, ino, size, mtime_ns)] = digest
+
+            self.logger.debug(f"Loaded {len(self._digests)} cached executable hashes")
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable executable hash cache: {e}")
+
+    def _hash_file(self, key: FileKey, path: str):
+        sha256 = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    sha256.update(chunk)
+            digest = sha256.hexdigest()
+        except OSError as e:
+            self.logger.debug(f"Cannot hash {path}: {e}")
+            digest = ""
+
+        # A binary rewritten while it was hashed no longer matches its key.
+        if digest and stat_key(path) != key:
+            digest = ""
+
+        with self._condition:
+            self._pending.discard(key)
+            self._digests[key] = digest
+            self._dirty = self._dirty or bool(digest)
+            self._condition.notify_all()
+
+        if digest and self._on_result:
+            try:
+                self._on_result(key, digest)
+            except Exception as e:
+                self.logger.debug(f"Fingerprint callback failed for {path}: {e}")
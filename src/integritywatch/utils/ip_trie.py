@@ -0,0 +1,63 @@
+import ipaddress
+from typing import Any, Optional
+
+# Trie nodes are [zero_child, one_child, label] lists; a label marks the end of a prefix.
+_ZERO, _ONE, _LABEL = 0, 1, 2
+
+
+class IPPrefixTrie:
+    """Longest-prefix match of IPv4 and IPv6 addresses against CIDR ranges.
+
+    A lookup walks at most one node per prefix bit (32 for IPv4, 128 for IPv6) whatever the
+    number of ranges loaded. IPv4-mapped IPv6 addresses (::ffff:a.b.c.d) match IPv4 ranges.
+    """
+
+    def __init__(self):
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+        self._count = 0
+
+    def insert(self, cidr: str, label: Any):
+        network = ipaddress.ip_network(cidr, strict=False)
+        bits = network.max_prefixlen
+        value = int(network.network_address)
+
+        node = self._roots[network.version]
+        for i in range(network.prefixlen):
+            bit = (value >> (bits - 1 - i)) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, None]
+            node = child
+
+        if node[_LABEL] is None:
+            self._count += 1
+        node[_LABEL] = label
+
+    def match(self, address: str) -> Optional[Any]:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+
+        bits = ip.max_prefixlen
+        value = int(ip)
+
+        node = self._roots[ip.version]
+        found = node[_LABEL]
+        for i in range(bits):
+            node = node[(value >> (bits - 1 - i)) & 1]
+            if node is None:
+                break
+            if node[_LABEL] is not None:
+                found = node[_LABEL]
+
+        return found
+
+    def __contains__(self, address: str) -> bool:
+        return self.match(address) is not None
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,4 +1,5 @@
 import platform as plat
+from typing import Callable, Optional
 
 def get_current_platform() -> str:
     return plat.system().lower()
@@ -12,55 +13,59 @@ def is_linux() -> bool:
 def is_macos() -> bool:
     return get_current_platform() == 'darwin'
 
-def get_cpuid_registers(leaf: int) -> tuple:
-    # Execute the given instruction and return raw register values.
+def is_admin() -> bool:
     try:
-        from cpuid import cpuid
-        return cpuid(leaf)
-    except:
-        return (0,0,0,0)
+        if is_windows():
+            import ctypes
+            return ctypes.windll.shell32.IsUserAnAdmin() != 0
+        else:
+            import os
+            return os.geteuid() == 0
+    except Exception:
+        return False
+
+def port_predicate(ports: Optional[set[int]], ignore_remote_ports: Optional[set[int]]) -> Optional[Callable[[int, int], bool]]:
+    # Shared row filter for the connection snapshots: keep a socket when either port is in
+    # `ports` or its remote port is not in `ignore_remote_ports`; None keeps everything.
+    if not ports and not ignore_remote_ports:
+        return None
+
+    ports = ports or set()
+
+    if not ignore_remote_ports:
+        return lambda local_port, remote_port: local_port in ports or remote_port in ports
+
+    return lambda local_port, remote_port: (
+        local_port in ports or remote_port in ports or remote_port not in ignore_remote_ports
+    )
+
+def get_cpuid_registers(leaf: int) -> tuple:
+    # Raw register values from the shared CPUID probe; zeros when the leaf is unavailable.
+    from integritywatch.utils.cpuid_probe import get_cpuid_probe
+    return get_cpuid_probe().registers(leaf) or (0,0,0,0)
 
 def get_cpuid_vendor(leaf: int) -> str:
-    try:
-        from cpuid import cpuid
-        import struct
-        
-        eax, ebx, ecx, edx = cpuid(leaf)
-        
-        if leaf == 0:
-            vendor = struct.pack('<III', ebx, edx, ecx).decode('ascii', errors='ignore')
-            return vendor.strip()
-        else:
-            vendor1 = struct.pack('<III', ebx, ecx, edx).decode('ascii', errors='ignore').strip()
-            
-            if vendor1 and len(vendor1) >= 3:
-                if not all(c in '@\x00 ' for c in vendor1):
-                    return vendor1
-            
-            vendor2 = struct.pack('<III', ebx, edx, ecx).decode('ascii', errors='ignore').strip()
-            if vendor2 and len(vendor2) >= 3:
-                if not all(c in '@\x00 ' for c in vendor2):
-                    return vendor2
-            
-            return
-    except:
-        return
+    from integritywatch.utils.cpuid_probe import get_cpuid_probe
+    probe = get_cpuid_probe()
+    if leaf == 0:
+        return probe.vendor
+    return probe.hypervisor_vendor(leaf) or None
 
 
 def get_cpuid_features() -> dict:
     # Get CPU feature flags from CPUID leaf 1
-    try:
-        from cpuid import cpuid
-        eax,ebx,ecx,edx = cpuid(1)
-
-        return {
-            'eax':eax,
-            'ebx':ebx,
-            'ecx':ecx,
-            'edx':edx
-        }
-    except:
+    from integritywatch.utils.cpuid_probe import get_cpuid_probe
+    registers = get_cpuid_probe().registers(1)
+    if registers is None:
         return {}
+
+    eax,ebx,ecx,edx = registers
+    return {
+        'eax':eax,
+        'ebx':ebx,
+        'ecx':ecx,
+        'edx':edx
+    }
     
 def get_mac_addresses() -> list:
     mac_addresses=[]
@@ -98,32 +103,15 @@ def _get_mac_windows() -> list:
     return mac_addresses
 
 def _get_mac_linux() -> list:
-    import os
+    from integritywatch.utils.platform.linux import read_sysfs_entries
 
     mac_addresses = []
-    net_path = '/sys/class/net/'
 
-    try:
-        if not os.path.exists(net_path):
-            return []
-        
-        for interface in os.listdir(net_path):
-            if interface == 'lo':
-                continue
-
-            address_file = os.path.join(net_path, interface, 'address')
-            
-            if os.path.exists(address_file):
-                try:
-                    with open(address_file, 'r') as f:
-                        mac = f.read().strip().upper()
-                        # Validate MAC format
-                        if len(mac) == 17 and mac.count(':') == 5:
-                            mac_addresses.append(mac)
-                except:
-                    continue        
-    except:
-        pass
+    for values in read_sysfs_entries('/sys/class/net/', ('address',), skip=('lo',), memoize=False).values():
+        mac = (values['address'] or "").upper()
+        # Validate MAC format
+        if len(mac) == 17 and mac.count(':') == 5:
+            mac_addresses.append(mac)
 
     return mac_addresses
 
@@ -1,4 +1,8 @@
-from typing import Any
+import errno
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from integritywatch.utils.platform.base import port_predicate
 
 TCP_STATE = {
     '01': 'ESTABLISHED',
@@ -14,6 +18,60 @@ TCP_STATE = {
     '0B': 'CLOSING'
 }
 
+# NETLINK_SOCK_DIAG (inet_diag) constants from linux/netlink.h, linux/sock_diag.h and linux/inet_diag.h
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+INET_DIAG_REQ_BYTECODE = 1
+INET_DIAG_BC_JMP = 1
+INET_DIAG_BC_S_GE = 2
+INET_DIAG_BC_S_LE = 3
+INET_DIAG_BC_D_GE = 4
+INET_DIAG_BC_D_LE = 5
+
+# Errors that mean sock_diag will never work in this process (module missing, or blocked by
+# policy); anything else, e.g. ENOBUFS under a burst of sockets, is retried on the next query.
+SOCK_DIAG_FATAL_ERRNOS = (errno.EPROTONOSUPPORT, errno.EACCES)
+# Errors that mean one (protocol, family) dump is unsupported, e.g. udp_diag or IPv6 not
+# in the kernel; only that combination is read from /proc from then on.
+SOCK_DIAG_UNSUPPORTED_ERRNOS = (errno.ENOENT, errno.EAFNOSUPPORT, errno.EOPNOTSUPP)
+
+TCP_STATE_BY_CODE = {int(code, 16): state for code, state in TCP_STATE.items()}
+TCP_CODE_BY_STATE = {state: code for code, state in TCP_STATE_BY_CODE.items()}
+
+# (path, protocol, hex digits per address) for the /proc socket tables
+PROC_NET_TABLES = (
+    ('/proc/net/tcp', 'tcp', 8),
+    ('/proc/net/tcp6', 'tcp', 32),
+    ('/proc/net/udp', 'udp', 8),
+    ('/proc/net/udp6', 'udp', 32),
+)
+
+# Threads that walk /proc/<pid>/fd; readlink and getdents release the GIL.
+FD_SCAN_WORKERS = 4
+
+_sock_diag_available = None
+_sock_diag_unsupported: set[tuple[int, int]] = set()
+_numpy = None
+_hex_table = None
+_fd_scan_skipped = 0
+
+# Memoized sysfs attribute values keyed by (directory path, attribute). Only attributes
+# fixed until reboot (DMI identity, PCI IDs) go in, so every probe in the process shares
+# one read of each; values that can change, like MAC addresses, are read every time.
+_sysfs_values: dict[tuple[str, str], Optional[str]] = {}
+_sysfs_lock = threading.Lock()
+# sysfs attributes are at most a page long.
+SYSFS_READ_SIZE = 4096
+
+DMI_IDENTITY_FIELDS = (
+    'sys_vendor', 'product_name', 'product_version', 'board_vendor', 'board_name',
+    'bios_vendor', 'bios_version', 'chassis_vendor'
+)
+
 def read_proc_cpuinfo() -> str:
     try:
         with open('/proc/cpuinfo', 'r') as f:
@@ -27,37 +85,162 @@ def check_hypervisor_flag() -> bool:
     return 'hypervisor' in  cpuinfo.lower()
 
 def read_dmi_file(filename: str) -> str:
+    return read_sysfs_attributes('/sys/class/dmi/id', (filename,))[filename] or ""
+    
+def get_firmware_info() -> dict:
+    values = read_sysfs_attributes('/sys/class/dmi/id', ('sys_vendor', 'product_name', 'bios_vendor', 'bios_version'))
+    return {key: value or "" for key, value in values.items()}
+
+def get_dmi_identity() -> dict:
+    # World-readable DMI strings naming the platform; serials and UUIDs are root-only.
+    values = read_sysfs_attributes('/sys/class/dmi/id', DMI_IDENTITY_FIELDS)
+    return {key: value for key, value in values.items() if value}
+
+def read_hypervisor_type() -> str:
+    # "xen" inside Xen domains (dom0 included); the directory is absent elsewhere.
+    return read_sysfs_attributes('/sys/hypervisor', ('type',))['type'] or ""
+
+def is_xen_control_domain() -> bool:
+    # dom0 lists "control_d" in its capabilities; guests list nothing.
+    try:
+        with open('/proc/xen/capabilities', 'r') as f:
+            return 'control_d' in f.read()
+    except OSError:
+        return False
+
+def read_kernel_osrelease() -> str:
+    return read_sysfs_attributes('/proc/sys/kernel', ('osrelease',))['osrelease'] or ""
+
+def iter_loaded_modules() -> Iterator[str]:
+    # Names of the loaded kernel modules; built-in drivers do not show up here.
+    try:
+        with open('/proc/modules', 'r') as f:
+            for line in f:
+                yield line.split(' ', 1)[0]
+    except OSError:
+        return
+
+def read_sysfs_attributes(directory: str, attributes: Iterable[str], memoize: bool = True) -> dict[str, Optional[str]]:
+    # Stripped contents of each attribute file of `directory`, None where unreadable.
+    # `memoize` is only for attributes fixed until reboot (DMI strings, PCI IDs).
+    import os
+
+    directory = directory.rstrip('/')
+    attributes = tuple(attributes)
+    values = _sysfs_memoized(directory, attributes) if memoize else {}
+
+    missing = [attr for attr in attributes if attr not in values]
+    if missing:
+        buffer = bytearray(SYSFS_READ_SIZE)
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            dir_fd = None
+        try:
+            for attr in missing:
+                values[attr] = None if dir_fd is None else _read_sysfs_file(dir_fd, attr, buffer)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        if memoize:
+            _sysfs_memoize(directory, {attr: values[attr] for attr in missing})
+
+    return {attr: values[attr] for attr in attributes}
+
+def read_sysfs_entries(directory: str, attributes: Iterable[str], skip: Iterable[str] = (),
+                       memoize: bool = True) -> dict[str, dict[str, Optional[str]]]:
+    # entry -> attribute values for every subdirectory of `directory` (e.g. each device
+    # under /sys/bus/pci/devices): one readdir, then only the reads not memoized yet.
+    import os
+
+    directory = directory.rstrip('/')
+    attributes, skip = tuple(attributes), set(skip)
+    try:
+        base_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return {}
+
+    entries = {}
+    buffer = bytearray(SYSFS_READ_SIZE)
+    try:
+        for entry in os.listdir(base_fd):
+            if entry in skip:
+                continue
+
+            path = f"{directory}/{entry}"
+            values = _sysfs_memoized(path, attributes) if memoize else {}
+            missing = [attr for attr in attributes if attr not in values]
+            if missing:
+                try:
+                    entry_fd = os.open(entry, os.O_RDONLY | os.O_DIRECTORY, dir_fd=base_fd)
+                except OSError:
+                    continue
+                try:
+                    for attr in missing:
+                        values[attr] = _read_sysfs_file(entry_fd, attr, buffer)
+                finally:
+                    os.close(entry_fd)
+                if memoize:
+                    _sysfs_memoize(path, {attr: values[attr] for attr in missing})
+
+            entries[entry] = {attr: values[attr] for attr in attributes}
+    finally:
+        os.close(base_fd)
+
+    return entries
+
+def _sysfs_memoized(path: str, attributes: tuple[str, ...]) -> dict[str, Optional[str]]:
+    # The lock only guards the memo itself; file reads happen outside it.
+    with _sysfs_lock:
+        return {attr: _sysfs_values[(path, attr)] for attr in attributes if (path, attr) in _sysfs_values}
+
+def _sysfs_memoize(path: str, values: dict[str, Optional[str]]):
+    with _sysfs_lock:
+        for attr, value in values.items():
+            _sysfs_values.setdefault((path, attr), value)
+
+def _read_sysfs_file(dir_fd: int, name: str, buffer: bytearray) -> Optional[str]:
+    # `buffer` belongs to the calling read_sysfs_* call, so concurrent callers never share it.
+    import os
+
+    try:
+        fd = os.open(name, os.O_RDONLY, dir_fd=dir_fd)
+    except OSError:
+        return None
+    try:
+        length = os.readv(fd, [buffer])
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    return buffer[:length].decode('utf-8', errors='replace').strip()
+
+def read_smbios_table() -> bytes:
+    # Raw SMBIOS structure table as exported by the kernel; readable by root only.
+    try:
+        with open('/sys/firmware/dmi/tables/DMI', 'rb') as f:
+            return f.read()
+    except OSError:
+        return b""
+
+def read_boot_id() -> str:
+    # Random UUID the kernel picks at every boot.
     try:
-        with open(f'/sys/class/dmi/id/{filename}', 'r') as f:
+        with open('/proc/sys/kernel/random/boot_id', 'r') as f:
             return f.read().strip()
-    except:
+    except OSError:
         return ""
-    
-def get_firmware_info() -> dict:
-    return {
-        'sys_vendor': read_dmi_file('sys_vendor'),
-        'product_name': read_dmi_file('product_name'),
-        'bios_vendor': read_dmi_file('bios_vendor'),
-        'bios_version': read_dmi_file('bios_version')
-    }
 
 def get_network_macs() -> list[dict]:
-    import os
     macs = []
-    try:
-        net_path = '/sys/class/net'
-        for iface in os.listdir(net_path):
-            mac_file = f'{net_path}/{iface}/address'
-            if os.path.exists(mac_file):
-                with open(mac_file) as f:
-                    mac = f.read().strip()
-                    if mac and mac != '00:00:00:00:00:00':
-                        macs.append({
-                            'mac':mac,
-                            'interface': iface
-                        })
-    except:
-        pass
+    for iface, values in read_sysfs_entries('/sys/class/net', ('address',), memoize=False).items():
+        mac = values['address']
+        if mac and mac != '00:00:00:00:00:00':
+            macs.append({
+                'mac':mac,
+                'interface': iface
+            })
     return macs
 
 def get_acpi_tables() -> list:
@@ -85,68 +268,114 @@ def get_acpi_tables() -> list:
         return []
     
 def get_pci_device_ids() -> list[tuple[int, int]]:
-    try:
-        import os
-        base_path = '/sys/bus/pci/devices/'
-        devices = []
+    devices = []
 
-        for device_entry in os.listdir(base_path):
-            vendor_file = os.path.join(base_path,device_entry,"vendor")
-            device_file = os.path.join(base_path,device_entry,"device")
+    for values in read_sysfs_entries('/sys/bus/pci/devices', ('vendor', 'device')).values():
+        try:
+            devices.append((int(values['vendor'], 16), int(values['device'], 16)))
+        except (TypeError, ValueError): # unable to read pci device files
+            continue
 
-            try:
-                with open(vendor_file, 'r') as vf:
-                    vendor_id = int(vf.read().strip(), 16)
-                
-                with open(device_file, 'r') as df:
-                    device_id = int(df.read().strip(), 16)
-                
-                devices.append((vendor_id, device_id))
-
-            except: # unable to open pci device files
-                continue
+    return devices
 
-        return devices
-    except (IOError, OSError, PermissionError) as e:
-        return []
-    
 def enumerate_processes() -> list[dict[str, Any]]:
+    from integritywatch.utils.process_table import RECORD_FIELDS
+    return [dict(zip(RECORD_FIELDS, record)) for record in iter_process_records()]
+
+def iter_process_records(path_cache: Optional[Callable[[int, int, str], Optional[str]]] = None) -> Iterator[tuple]:
+    # (pid, ppid, starttime, session, tty_nr, comm, exe, cmdline) per process, from one
+    # /proc/<pid>/stat read; `path_cache(pid, starttime, comm)` can spare the readlink for
+    # processes already known from an earlier pass.
+    import os
+
+    try:
+        pids = [pid for pid in os.listdir('/proc') if pid.isdigit()]
+    except OSError:
+        return
+
+    for pid in pids:
+        stat = read_process_stat(pid)
+        if stat is None:
+            continue
+        name, fields = stat
+
+        try:
+            pid_int = int(pid)
+            starttime = int(fields[19])
+            ppid, session, tty_nr = int(fields[1]), int(fields[3]), int(fields[4])
+        except (ValueError, IndexError):
+            continue
+
+        path = path_cache(pid_int, starttime, name) if path_cache else None
+        if path is None:
+            path = read_process_path(pid_int)
+
+        yield (pid_int, ppid, starttime, session, tty_nr, name, path, '')
+
+def list_process_identities() -> dict[int, tuple[int, str, int]]:
+    # pid -> (starttime, comm, ppid), one /proc/<pid>/stat read per process and no readlink.
+    # (pid, starttime) identifies a process even after its PID is recycled.
     import os
-    processes = []
+    identities = {}
 
     try:
         for pid in os.listdir('/proc'):
             if not pid.isdigit():
                 continue
-            try:
-                with open(f'/proc/{pid}/comm', 'r') as f:
-                    name = f.read().strip()
-                
-                path = ''
-                try:
-                    path = os.readlink(f'/proc/{pid}/exe')
-                except:
-                    pass
-
-                processes.append({
-                    'name': name,
-                    'pid': int(pid),
-                    'path': path,
-                    'cmdline': ''
-                })
-            except:
+
+            stat = read_process_stat(pid)
+            if stat is None:
                 continue
 
-        return processes
-    
+            name, fields = stat
+            try:
+                identities[int(pid)] = (int(fields[19]), name, int(fields[1]))
+            except (ValueError, IndexError):
+                continue
     except Exception:
-        return []
+        return {}
+
+    return identities
+
+def read_process_stat(pid) -> Optional[tuple[str, list[str]]]:
+    # Returns (comm, fields after comm); fields[0] is state, fields[1] ppid, fields[3] session,
+    # fields[4] tty_nr, fields[19] starttime.
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    # comm may itself contain spaces or parentheses, so split around the last ')'.
+    open_paren = data.find('(')
+    close_paren = data.rfind(')')
+    if open_paren == -1 or close_paren == -1:
+        return None
+
+    return data[open_paren + 1:close_paren], data[close_paren + 2:].split()
+
+def read_process_path(pid: int) -> str:
+    import os
+    try:
+        return os.readlink(f'/proc/{pid}/exe')
+    except OSError:
+        return ''
+
+def read_process_cmdline(pid: int) -> str:
+    # Arguments are NUL-separated; kernel threads and zombies have an empty cmdline.
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            data = f.read()
+    except OSError:
+        return ''
+
+    return data.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
 
 def get_tcp_connections_for_pid(pid: int) -> list[dict]:
     try:
         import os
 
-        tcp_data = _parse_proc_net_tcp()
+        tcp_data = read_socket_tables(tuple(TCP_STATE.values()))
 
         socket_inodes = _get_socket_inodes_for_pid(pid)
 
@@ -159,6 +388,7 @@ def get_tcp_connections_for_pid(pid: int) -> list[dict]:
                     'remote_addr': conn['remote_addr'],
                     'remote_port': conn['remote_port'],
                     'state': conn['state'],
+                    'protocol': conn['protocol'],
                     'pid': pid
                 })
 
@@ -167,65 +397,441 @@ def get_tcp_connections_for_pid(pid: int) -> list[dict]:
     except Exception:
         return []
     
-def _parse_proc_net_tcp() -> list[dict]:
-    connections = []
-
+def get_all_connections(states: tuple = ('ESTABLISHED', 'LISTEN'),
+                        ports: Optional[set[int]] = None,
+                        ignore_remote_ports: Optional[set[int]] = None) -> dict[int, list[dict]]:
+    # Per-cycle snapshot: the socket tables are read once and joined against a
+    # single inode -> PID index, instead of re-reading both for every PID.
+    # sock_diag filters in the kernel; the columnar /proc parser is the fallback.
+    # A row is kept when either port is in `ports` or its remote port is not in
+    # `ignore_remote_ports` (no port sets means every row in `states`).
     try:
-        with open('/proc/net/tcp', 'r') as f:
-            lines = f.readlines()[1:]
+        socket_data = query_sock_diag(states, ports, ignore_remote_ports)
+
+        if socket_data is None:
+            socket_data = read_socket_tables(states, ports, ignore_remote_ports)
+
+        if not socket_data:
+            return {}
+
+        inode_to_pid = _build_socket_inode_index()
 
-        for line in lines:
-            parts = line.split()
-            if len(parts) < 10:
+        connections = {}
+        for conn in socket_data:
+            pid = inode_to_pid.get(conn['inode'])
+            if pid is None:
                 continue
 
-            local_addr, local_port = _parse_address(parts[1])
-            remote_addr, remote_port = _parse_address(parts[2])
-            state_hex = parts[3]
-            inode = int(parts[9])
-
-            connections.append({
-                'local_addr': local_addr,
-                'local_port': local_port,
-                'remote_addr': remote_addr,
-                'remote_port': remote_port,
-                'state': TCP_STATE.get(state_hex, 'UNKNOWN'),
-                'inode': inode
+            connections.setdefault(pid, []).append({
+                'local_addr': conn['local_addr'],
+                'local_port': conn['local_port'],
+                'remote_addr': conn['remote_addr'],
+                'remote_port': conn['remote_port'],
+                'state': conn['state'],
+                'protocol': conn['protocol'],
+                'inode': conn['inode'],
+                'pid': pid
             })
 
         return connections
-    except:
-        return []
-    
-def _parse_address(addr_str: str) -> tuple:
-    addr_hex, port_hex = addr_str.split(':')
 
-    ip_int = int(addr_hex, 16)
-    ip = f"{ip_int & 0xFF}.{(ip_int >> 8) & 0xFF}.{(ip_int >> 16) & 0xFF}.{(ip_int >> 24) & 0xFF}"
-    
-    port = int(port_hex, 16)
-    return ip, port
-                
-def _get_socket_inodes_for_pid(pid: int) -> set:
+    except Exception:
+        return {}
+
+def query_sock_diag(states: tuple = ('ESTABLISHED', 'LISTEN'),
+                    ports: Optional[set[int]] = None,
+                    ignore_remote_ports: Optional[set[int]] = None) -> Optional[list[dict]]:
+    """Dump TCP and UDP sockets through NETLINK_SOCK_DIAG, filtered by state in the kernel.
+
+    A plain `ports` set is compiled to inet_diag bytecode and filtered in the kernel too;
+    `ignore_remote_ports` cannot be expressed there and is applied before decoding addresses.
+    A (protocol, family) pair the kernel refuses to dump is read from its /proc table
+    instead, so one missing diag module does not cost the whole snapshot.
+    Returns None when netlink is unavailable so callers can fall back to /proc.
+    """
+    global _sock_diag_available
+
+    if _sock_diag_available is False:
+        return None
+
+    import socket
+
+    state_mask = 0
+    for state in states:
+        if state in TCP_CODE_BY_STATE:
+            state_mask |= 1 << TCP_CODE_BY_STATE[state]
+
+    bytecode = b''
+    keep = port_predicate(ports, ignore_remote_ports)
+    if ports and not ignore_remote_ports:
+        bytecode = _build_port_filter(ports)
+        keep = None
+
+    connections = []
+    fallback_tables = []
+    try:
+        for protocol, protocol_name in ((socket.IPPROTO_TCP, 'tcp'), (socket.IPPROTO_UDP, 'udp')):
+            for family, addr_width in ((socket.AF_INET, 8), (socket.AF_INET6, 32)):
+                if (protocol, family) not in _sock_diag_unsupported:
+                    try:
+                        connections.extend(_sock_diag_dump(family, protocol, state_mask, bytecode, keep))
+                        continue
+                    except OSError as e:
+                        if e.errno in SOCK_DIAG_FATAL_ERRNOS:
+                            raise
+                        if e.errno in SOCK_DIAG_UNSUPPORTED_ERRNOS:
+                            _sock_diag_unsupported.add((protocol, family))
+                fallback_tables.extend(t for t in PROC_NET_TABLES if t[1:] == (protocol_name, addr_width))
+    except AttributeError:
+        # No AF_NETLINK in this build of Python
+        _sock_diag_available = False
+        return None
+    except OSError:
+        _sock_diag_available = False
+        return None
+
+    _sock_diag_available = True
+    if fallback_tables:
+        connections.extend(read_socket_tables(states, ports, ignore_remote_ports, tables=fallback_tables))
+    return connections
+
+def _sock_diag_dump(family: int, protocol: int, state_mask: int, bytecode: bytes = b'', keep=None) -> list[dict]:
+    # Raises OSError carrying the kernel's errno when the dump is refused.
     import os
-    inodes = set()
+    import socket
+    import struct
+
+    # struct inet_diag_req_v2: family, protocol, ext, pad, states, then a zeroed inet_diag_sockid (48 bytes)
+    request = struct.pack('=BBBBI', family, protocol, 0, 0, state_mask) + bytes(48)
+    if bytecode:
+        request += struct.pack('=HH', 4 + len(bytecode), INET_DIAG_REQ_BYTECODE) + bytecode
+
+    header = struct.pack('=IHHII', 16 + len(request), SOCK_DIAG_BY_FAMILY, NLM_F_REQUEST | NLM_F_DUMP, 1, 0)
+    protocol_name = 'tcp' if protocol == socket.IPPROTO_TCP else 'udp'
+
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG) as sock:
+        sock.sendto(header + request, (0, 0))
+
+        buffer = bytearray(1 << 16)
+        view = memoryview(buffer)
+        connections = []
+
+        while True:
+            received = sock.recv_into(buffer)
+            if received == 0:
+                return connections
+
+            offset = 0
+            while offset + 16 <= received:
+                msg_len, msg_type = struct.unpack_from('=IH', buffer, offset)
+                if msg_len < 16:
+                    return connections
+
+                if msg_type == NLMSG_DONE:
+                    return connections
+
+                if msg_type == NLMSG_ERROR:
+                    error = struct.unpack_from('=i', buffer, offset + 16)[0]
+                    if error != 0:
+                        raise OSError(-error, os.strerror(-error))
+
+                elif msg_type == SOCK_DIAG_BY_FAMILY:
+                    # Ports are checked first so filtered-out rows never allocate address strings.
+                    local_port, remote_port = struct.unpack_from('>HH', buffer, offset + 20)
+                    if keep is None or keep(local_port, remote_port):
+                        connections.append(_decode_inet_diag_msg(view, offset + 16, protocol_name))
+
+                offset += (msg_len + 3) & ~3
+
+def _decode_inet_diag_msg(data: memoryview, offset: int, protocol: str) -> dict:
+    import socket
+    import struct
+
+    # struct inet_diag_msg: family, state, timer, retrans, inet_diag_sockid, expires, rqueue, wqueue, uid, inode
+    family, state = struct.unpack_from('=BB', data, offset)
+    local_port, remote_port = struct.unpack_from('>HH', data, offset + 4)
+    inode = struct.unpack_from('=I', data, offset + 68)[0]
+
+    addr_len = 4 if family == socket.AF_INET else 16
+    local_addr = socket.inet_ntop(family, data[offset + 8:offset + 8 + addr_len])
+    remote_addr = socket.inet_ntop(family, data[offset + 24:offset + 24 + addr_len])
+
+    return {
+        'local_addr': local_addr,
+        'local_port': local_port,
+        'remote_addr': remote_addr,
+        'remote_port': remote_port,
+        'state': TCP_STATE_BY_CODE.get(state, 'UNKNOWN'),
+        'protocol': protocol,
+        'inode': inode
+    }
+
+def _build_port_filter(ports: set[int]) -> bytes:
+    # inet_diag bytecode accepting a socket whose source or destination port is in `ports`.
+    # Each clause tests "port >= p and port <= p"; a failing test jumps past the clause
+    # into the next one, and a JMP after each clause skips the rest once one matched.
+    import struct
+
+    bytecode = b''
+    for port in sorted(ports):
+        for ge_op, le_op in ((INET_DIAG_BC_S_GE, INET_DIAG_BC_S_LE), (INET_DIAG_BC_D_GE, INET_DIAG_BC_D_LE)):
+            clause = (
+                struct.pack('=BBH', ge_op, 8, 20) + struct.pack('=BBH', 0, 0, port) +
+                struct.pack('=BBH', le_op, 8, 12) + struct.pack('=BBH', 0, 0, port)
+            )
+            if bytecode:
+                bytecode += struct.pack('=BBH', INET_DIAG_BC_JMP, 4, len(clause) + 4)
+            bytecode += clause
+
+    return bytecode
+
+def _build_socket_inode_index() -> dict[int, int]:
+    global _fd_scan_skipped
+    index = {}
 
     try:
-        fd_dir = f'/proc/{pid}/fd'
+        inodes_by_pid, _fd_scan_skipped = scan_socket_inodes()
+    except OSError:
+        return index
+
+    for pid in sorted(inodes_by_pid):
+        for inode in inodes_by_pid[pid]:
+            # A socket shared after fork() belongs to whichever owner is seen first.
+            index.setdefault(inode, pid)
+
+    return index
+
+def last_fd_scan_skipped() -> int:
+    # PIDs the most recent socket ownership scan could not read (EACCES/EPERM).
+    return _fd_scan_skipped
+
+def scan_socket_inodes(pids: Optional[list[int]] = None, max_workers: int = FD_SCAN_WORKERS) -> tuple[dict[int, set[int]], int]:
+    # pid -> socket inodes held, plus how many PIDs were skipped for lack of permission.
+    # Paths are resolved relative to directory fds so no per-fd path string is built.
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    proc_fd = os.open('/proc', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        if pids is None:
+            pids = [int(entry.name) for entry in os.scandir(proc_fd) if entry.name.isdigit()]
+
+        if not pids:
+            return {}, 0
+
+        chunk_size = max(1, -(-len(pids) // max_workers))
+        chunks = [pids[i:i + chunk_size] for i in range(0, len(pids), chunk_size)]
 
-        for fd_name in os.listdir(fd_dir):
+        if len(chunks) == 1:
+            results = [_scan_fd_chunk(proc_fd, chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                results = list(executor.map(lambda chunk: _scan_fd_chunk(proc_fd, chunk), chunks))
+    finally:
+        os.close(proc_fd)
+
+    inodes_by_pid = {}
+    skipped = 0
+    for chunk_inodes, chunk_skipped in results:
+        inodes_by_pid.update(chunk_inodes)
+        skipped += chunk_skipped
+
+    return inodes_by_pid, skipped
+
+def _scan_fd_chunk(proc_fd: int, pids: list[int]) -> tuple[dict[int, set[int]], int]:
+    import os
+    inodes_by_pid = {}
+    skipped = 0
+
+    for pid in pids:
+        try:
+            fd_dir = os.open(f'{pid}/fd', os.O_RDONLY | os.O_DIRECTORY, dir_fd=proc_fd)
+        except PermissionError:
+            skipped += 1
+            continue
+        except OSError:
+            # The process exited between listing /proc and opening its fd directory.
+            continue
+
+        inodes = set()
+        try:
+            with os.scandir(fd_dir) as entries:
+                for entry in entries:
+                    try:
+                        link = os.readlink(entry.name, dir_fd=fd_dir)
+                    except OSError:
+                        continue
+
+                    if link.startswith('socket:['):
+                        inodes.add(int(link[8:-1]))
+        except PermissionError:
+            skipped += 1
+            continue
+        except OSError:
+            continue
+        finally:
+            os.close(fd_dir)
+
+        if inodes:
+            inodes_by_pid[pid] = inodes
+
+    return inodes_by_pid, skipped
+
+def read_socket_tables(states: tuple = ('ESTABLISHED', 'LISTEN'),
+                       ports: Optional[set[int]] = None,
+                       ignore_remote_ports: Optional[set[int]] = None,
+                       tables: Iterable[tuple[str, str, int]] = PROC_NET_TABLES) -> list[dict]:
+    """Columnar parse of /proc/net/{tcp,tcp6,udp,udp6}, or just the given `tables`.
+
+    Each table is read in one call and its state and port columns are decoded in bulk,
+    vectorized with NumPy when it is installed. Only rows passing the state and port
+    filters (same rules as get_all_connections) are turned into dicts.
+    """
+    state_codes = {TCP_CODE_BY_STATE[state] for state in states if state in TCP_CODE_BY_STATE}
+    np = _load_numpy()
+
+    connections = []
+    for path, protocol, addr_width in tables:
+        try:
+            with open(path, 'rb') as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            continue
+
+        if not lines:
+            continue
+
+        matches = None
+        if np is not None:
+            matches = _match_rows_numpy(np, lines, addr_width, state_codes, ports, ignore_remote_ports)
+        if matches is None:
+            matches = _match_rows_python(lines, addr_width, state_codes, ports, ignore_remote_ports)
+
+        for index in matches:
             try:
-                link = os.readlink(f'{fd_dir}/{fd_name}')
+                connections.append(_decode_proc_net_row(lines[index], protocol))
+            except (ValueError, IndexError):
+                continue
+
+    return connections
+
+def _match_rows_numpy(np, lines: list[bytes], addr_width: int, state_codes: set[int],
+                      ports: Optional[set[int]], ignore_remote_ports: Optional[set[int]]):
+    # Past the variable-width "sl:" column every row has the same fixed-width layout:
+    # "LOCALADDR:PORT REMOTEADDR:PORT ST", so the rows stack into one uint8 matrix.
+    global _hex_table
+
+    head_width = 2 * addr_width + 14
+    heads = b''.join(line[line.find(b':') + 2:][:head_width] for line in lines)
+    if len(heads) != head_width * len(lines):
+        return None
+
+    if _hex_table is None:
+        _hex_table = np.zeros(256, dtype=np.int32)
+        for value, char in enumerate(b'0123456789ABCDEF'):
+            _hex_table[char] = value
+        for value, char in enumerate(b'abcdef', start=10):
+            _hex_table[char] = value
+
+    rows = np.frombuffer(heads, dtype=np.uint8).reshape(len(lines), head_width)
+    weights = np.array([4096, 256, 16, 1], dtype=np.int32)
+
+    local_ports = _hex_table[rows[:, addr_width + 1:addr_width + 5]] @ weights
+    remote_ports = _hex_table[rows[:, 2 * addr_width + 7:2 * addr_width + 11]] @ weights
+    state_column = _hex_table[rows[:, 2 * addr_width + 12:2 * addr_width + 14]] @ weights[2:]
+
+    mask = np.isin(state_column, list(state_codes))
 
-                if link.startswith('socket:['):
-                    inode = int(link[8:-1])
-                    inodes.add(inode)
-            except:
+    if ports or ignore_remote_ports:
+        port_mask = np.zeros(len(lines), dtype=bool)
+        if ports:
+            port_list = list(ports)
+            port_mask |= np.isin(local_ports, port_list) | np.isin(remote_ports, port_list)
+        if ignore_remote_ports:
+            port_mask |= ~np.isin(remote_ports, list(ignore_remote_ports))
+        mask &= port_mask
+
+    return np.flatnonzero(mask).tolist()
+
+def _match_rows_python(lines: list[bytes], addr_width: int, state_codes: set[int],
+                       ports: Optional[set[int]], ignore_remote_ports: Optional[set[int]]) -> list[int]:
+    keep = port_predicate(ports, ignore_remote_ports)
+    head_width = 2 * addr_width + 14
+    state_at = 2 * addr_width + 12
+
+    matches = []
+    for index, line in enumerate(lines):
+        start = line.find(b':') + 2
+        if start < 2 or len(line) < start + head_width:
+            continue
+
+        try:
+            if int(line[start + state_at:start + state_at + 2], 16) not in state_codes:
                 continue
-    except:
-        pass
 
-    return inodes
+            if keep is not None:
+                local_port = int(line[start + addr_width + 1:start + addr_width + 5], 16)
+                remote_port = int(line[start + 2 * addr_width + 7:start + 2 * addr_width + 11], 16)
+                if not keep(local_port, remote_port):
+                    continue
+        except ValueError:
+            continue
+
+        matches.append(index)
+
+    return matches
+
+def _decode_proc_net_row(line: bytes, protocol: str) -> dict:
+    # Fields after "sl:": local, remote, st, tx:rx, tr:tm, retrnsmt, uid, timeout, inode
+    parts = line[line.find(b':') + 2:].split()
+
+    local_addr, local_port = _parse_address(parts[0])
+    remote_addr, remote_port = _parse_address(parts[1])
+
+    return {
+        'local_addr': local_addr,
+        'local_port': local_port,
+        'remote_addr': remote_addr,
+        'remote_port': remote_port,
+        'state': TCP_STATE_BY_CODE.get(int(parts[2], 16), 'UNKNOWN'),
+        'protocol': protocol,
+        'inode': int(parts[8])
+    }
+
+def _parse_address(addr_str: bytes) -> tuple:
+    import binascii
+    import socket
+
+    addr_hex, port_hex = addr_str.split(b':')
+    raw = binascii.unhexlify(addr_hex)
+
+    # The kernel prints each 32-bit word of the address in host (little-endian) order.
+    if len(raw) == 4:
+        ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+    else:
+        ip = socket.inet_ntop(socket.AF_INET6, b''.join(raw[i:i + 4][::-1] for i in range(0, 16, 4)))
+
+    return ip, int(port_hex, 16)
+
+def _load_numpy():
+    global _numpy
+
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+
+    return _numpy or None
+
+def _get_socket_inodes_for_pid(pid: int) -> set:
+    try:
+        inodes_by_pid, _ = scan_socket_inodes([pid], max_workers=1)
+    except OSError:
+        return set()
+
+    return inodes_by_pid.get(pid, set())
 
 def reverse_dns_lookup(ip_address: str) -> str:
     try:
@@ -1,5 +1,7 @@
 import subprocess
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
+
+from integritywatch.utils.platform.base import port_predicate
 
 def run_sysctl(key: str) -> str:
     try:
@@ -13,91 +15,185 @@ def check_hypervisor_feature() -> bool:
     features = run_sysctl('machdep.cpu.features')
     return 'hypervisor' in features.lower()
 
+def get_boot_time() -> str:
+    # "{ sec = 1700000000, usec = 0 } ..." - fixed for one boot session.
+    return run_sysctl('kern.boottime')
+
+def get_platform_uuid() -> str:
+    import re
+
+    try:
+        result = subprocess.run(
+            ['ioreg', '-rd1', '-c', 'IOPlatformExpertDevice'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except Exception:
+        return ""
+
+    match = re.search(r'"IOPlatformUUID" = "([^"]+)"', result.stdout)
+    return match.group(1) if match else ""
+
 def enumerate_processes() -> list[dict[str, Any]]:
+    from integritywatch.utils.process_table import RECORD_FIELDS
+    return [dict(zip(RECORD_FIELDS, record)) for record in iter_process_records()]
+
+def iter_process_records(path_cache=None) -> Iterator[tuple]:
+    # (pid, ppid, starttime, session, tty_nr, name, path, cmdline); ps gives no start time
+    # or session here, so those stay 0. `path_cache` is accepted for parity with Linux.
     import subprocess
-    processes = []
 
     try:
         result = subprocess.run(
-            ['ps', '-eo', 'pid,comm'],
+            ['ps', '-eo', 'pid,ppid,comm'],
             capture_output=True,
             text=True,
             timeout=5
         )
-
-        if result.returncode == 0:
-            for line in result.stdout.strip().split('\n')[1:]:
-                parts = line.strip().split(None, 1)
-                if len(parts) == 2:
-                    try:
-                        pid = int(parts[0])
-                        command = parts[1]
-                        name = command.split('/')[-1]
-
-                        processes.append({
-                            'name': name,
-                            'pid': pid,
-                            'path': command,
-                            'cmdline': ''
-                        })
-                    except:
-                        continue
-        
-        return processes
     except Exception:
-        return []
+        return
+
+    if result.returncode != 0:
+        return
+
+    for line in result.stdout.strip().split('\n')[1:]:
+        parts = line.strip().split(None, 2)
+        if len(parts) == 3:
+            try:
+                pid = int(parts[0])
+                ppid = int(parts[1])
+            except ValueError:
+                continue
+
+            command = parts[2]
+            name = command.split('/')[-1]
+            yield (pid, ppid, 0, 0, 0, name, command, '')
     
+# lsof fields requested with -F: pid, protocol, name (addresses) and TCP info (state).
+LSOF_FIELDS = 'pPnT'
+LSOF_TIMEOUT = 10
+
+def get_all_connections(states: tuple = ('ESTABLISHED', 'LISTEN'),
+                        ports: Optional[set[int]] = None,
+                        ignore_remote_ports: Optional[set[int]] = None) -> dict[int, list[dict]]:
+    # Per-cycle snapshot from a single lsof run over every TCP socket, consumed while it
+    # streams. Row filtering matches linux.get_all_connections.
+    import subprocess
+    import threading
+
+    keep = port_predicate(ports, ignore_remote_ports)
+
+    try:
+        proc = subprocess.Popen(
+            ['lsof', '-iTCP', '-n', '-P', '-F', LSOF_FIELDS],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+    except OSError:
+        return {}
+
+    watchdog = threading.Timer(LSOF_TIMEOUT, proc.kill)
+    watchdog.start()
+
+    connections = {}
+    try:
+        for conn in parse_lsof_fields(proc.stdout):
+            if conn['state'] not in states:
+                continue
+            if keep and not keep(conn['local_port'], conn['remote_port']):
+                continue
+            connections.setdefault(conn['pid'], []).append(conn)
+    except Exception:
+        return {}
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        proc.wait()
+
+    return connections
+
 def get_tcp_connections_for_pid(pid: int) -> list[dict]:
     import subprocess
 
     try:
         result = subprocess.run(
-            ['-lsof', '-iTCP', '-n', '-P','-p', str(pid)],
+            ['lsof', '-iTCP', '-n', '-P', '-a', '-p', str(pid), '-F', LSOF_FIELDS],
             capture_output=True,
             text=True,
             timeout=5
         )
 
-        if result.returncode != 0:
+        # lsof exits with 1 when the process holds no matching sockets.
+        if result.returncode not in (0, 1):
             return []
+
+        return [conn for conn in parse_lsof_fields(result.stdout.splitlines()) if conn['pid'] == pid]
         
-        connections = []
-        lines = result.stdout.strip().split('\n')[1:]
+    except:
+        return []
 
-        for line in lines:
-            parts = line.split()
+def parse_lsof_fields(lines: Iterable[str]) -> Iterator[dict]:
+    # Parses `lsof -F pPnT` output: a 'p' line opens a process, an 'f' line each of its
+    # files, followed by that file's P (protocol), n (addresses) and T (TCP info) fields.
+    pid = None
+    protocol = name = state = None
 
-            if len(parts) < 9:
-                continue
+    def flush():
+        if pid is None or not name:
+            return None
+        return _lsof_connection(pid, protocol, name, state)
 
-            name = parts[8]
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line:
+            continue
 
-            if '->' not in name:
-                continue
+        tag, value = line[0], line[1:]
 
-            local, remote = name.split('->')
-            local_addr, local_port = local.rsplit(':', 1)
-            
-            remote_parts = remote.split()
-            remote_addr, remote_port = remote_parts[0].rsplit(':', 1)
-            
-            state = 'UNKNOWN'
-            if len(parts) > 9:
-                state = parts[9].strip('()')
-            
-            connections.append({
-                'local_addr': local_addr,
-                'local_port': int(local_port),
-                'remote_addr': remote_addr,
-                'remote_port': int(remote_port),
-                'state': state,
-                'pid': pid
-            })
-        
-        return connections
-        
-    except:
-        return []
+        if tag == 'p' or tag == 'f':
+            conn = flush()
+            if conn:
+                yield conn
+            protocol = name = state = None
+            if tag == 'p':
+                pid = int(value)
+        elif tag == 'P':
+            protocol = value.lower()
+        elif tag == 'n':
+            name = value
+        elif tag == 'T' and value.startswith('ST='):
+            state = value[3:]
+
+    conn = flush()
+    if conn:
+        yield conn
+
+def _lsof_connection(pid: int, protocol: Optional[str], name: str, state: Optional[str]) -> Optional[dict]:
+    local, _, remote = name.partition('->')
+
+    try:
+        local_addr, local_port = _split_lsof_endpoint(local)
+        remote_addr, remote_port = _split_lsof_endpoint(remote) if remote else ('', 0)
+    except ValueError:
+        return None
+
+    return {
+        'local_addr': local_addr,
+        'local_port': local_port,
+        'remote_addr': remote_addr,
+        'remote_port': remote_port,
+        'state': state or 'UNKNOWN',
+        'protocol': protocol or 'tcp',
+        'inode': None,
+        'pid': pid
+    }
+
+def _split_lsof_endpoint(endpoint: str) -> tuple[str, int]:
+    # "10.0.0.1:5900", "[fe80::1]:5900" or "*:5900"
+    addr, _, port = endpoint.rpartition(':')
+    return addr.strip('[]'), 0 if port == '*' else int(port)
     
 def reverse_dns_lookup(ip_address: str) -> str:
     try:
@@ -1,4 +1,6 @@
-from typing import Any
+from typing import Any, Iterator, Optional
+
+from integritywatch.utils.platform.base import port_predicate
 
 TCP_STATE = {
     1: 'CLOSED',
@@ -44,6 +46,25 @@ def get_firmware_info() -> dict:
     except Exception as e:
         return {'error': f"Error in Getting Firmware info in Windows, error: {str(e)}"}
     
+def get_product_uuid() -> str:
+    try:
+        import wmi
+        c = wmi.WMI()
+        return c.Win32_ComputerSystemProduct()[0].UUID or ""
+    except Exception:
+        return ""
+
+def get_boot_time() -> int:
+    # Boot time to the minute, derived from the tick count; stable for one boot session.
+    try:
+        import ctypes
+        import time
+        ctypes.windll.kernel32.GetTickCount64.restype = ctypes.c_ulonglong
+        uptime = ctypes.windll.kernel32.GetTickCount64() / 1000
+        return int((time.time() - uptime) // 60)
+    except Exception:
+        return 0
+
 def get_network_adapters() -> list[dict]:
     try:
         import wmi
@@ -453,125 +474,170 @@ def get_session_protocol() -> int:
     
 
 def enumerate_processes() -> list[dict[str, Any]]:
-    processes = []
+    from integritywatch.utils.process_table import RECORD_FIELDS
+    return [dict(zip(RECORD_FIELDS, record)) for record in iter_process_records()]
 
+def iter_process_records(path_cache=None) -> Iterator[tuple]:
+    # (pid, ppid, starttime, session, tty_nr, name, path, cmdline) from one WMI query;
+    # there is no tty on Windows and the start time is left at 0.
     try:
         import wmi
         c = wmi.WMI()
+        procs = c.Win32_Process()
+    except Exception:
+        return
 
-        for proc in c.Win32_Process():
-            try:
-                processes.append({
-                    'name': proc.Name or "Unknown",
-                    'pid': proc.ProcessId or 0,
-                    'path': proc.ExecutablePath or "",
-                    'cmdline': proc.CommandLine or ""
-                })
-            except:
+    for proc in procs:
+        try:
+            yield (
+                proc.ProcessId or 0,
+                proc.ParentProcessId or 0,
+                0,
+                proc.SessionId or 0,
+                0,
+                proc.Name or "Unknown",
+                proc.ExecutablePath or "",
+                proc.CommandLine or ""
+            )
+        except Exception:
+            continue
+    
+# GetExtendedTcpTable arguments and row layouts (MIB_TCPROW_OWNER_PID, MIB_TCP6ROW_OWNER_PID)
+AF_INET = 2
+AF_INET6 = 23
+TCP_TABLE_OWNER_PID_ALL = 5
+ERROR_INSUFFICIENT_BUFFER = 122
+TCP_ROW_SIZE = 24
+TCP6_ROW_SIZE = 56
+
+def get_all_connections(states: tuple = ('ESTABLISHED', 'LISTEN'),
+                        ports: Optional[set[int]] = None,
+                        ignore_remote_ports: Optional[set[int]] = None) -> dict[int, list[dict]]:
+    # Per-cycle snapshot: one owner-PID TCP table per address family, grouped by PID.
+    # Row filtering matches linux.get_all_connections.
+    keep = port_predicate(ports, ignore_remote_ports)
+    connections = {}
+
+    try:
+        for conn in _read_tcp_tables():
+            if conn['state'] not in states:
                 continue
-        
-        return processes
+            if keep and not keep(conn['local_port'], conn['remote_port']):
+                continue
+            connections.setdefault(conn['pid'], []).append(conn)
     except Exception:
-        return []
-    
+        return {}
+
+    return connections
+
 def get_tcp_connections_for_pid(pid: int) -> list[dict]:
     # Scaning the TCP table to get the info on the connections
     try:
-        import ctypes
-        from ctypes import wintypes
-        import socket
-        import struct
-
-        class MIB_TCPROW_OWNER_PID(ctypes.Structure):
-            _fields_ = [
-                ("dwState", wintypes.DWORD),
-                ("dwLocalAddr", wintypes.DWORD),
-                ("dwLocalPort", wintypes.DWORD),
-                ("dwRemoteAddr", wintypes.DWORD),
-                ("dwRemotePort", wintypes.DWORD),
-                ("dwOwningPid", wintypes.DWORD),
-            ]
-        
-        class MIB_TCPTABLE_OWNER_PID(ctypes.Structure):
-            _fields_ = [
-                ("dwNumEntries", wintypes.DWORD),
-                ("table", MIB_TCPROW_OWNER_PID * 1),
-            ]
-        
-        iphlpapi = ctypes.windll.iphlpapi
-
-        # Defining the function
-        GetExtendedTcpTable = iphlpapi.GetExtendedTcpTable
-        GetExtendedTcpTable.argtypes = [
-            ctypes.c_void_p,      
-            ctypes.POINTER(wintypes.DWORD), 
-            wintypes.BOOL,     
-            wintypes.DWORD,    
-            ctypes.c_int,      
-            wintypes.DWORD     
-        ]
-        GetExtendedTcpTable.restype = wintypes.UINT
-
-        # First Function Call for buffer
-        size = wintypes.DWORD(0)
-        GetExtendedTcpTable(
-            None,  # NULL pointer
-            ctypes.byref(size), # Output to size needed as not enough buffer is provided
-            False, # Get Border?
-            2, # AF_INET (IPv4)
-            5, # TCP_TABLE_OWNER_PID_ALL
-            0  # Reserved
-        ) 
+        return [conn for conn in _read_tcp_tables() if conn['pid'] == pid]
+    except Exception:
+        return []
 
+def _read_tcp_tables() -> Iterator[dict]:
+    for family, parse in ((AF_INET, parse_tcp_table), (AF_INET6, parse_tcp6_table)):
+        data = _fetch_tcp_table(family)
+        if data:
+            yield from parse(data)
+
+def _fetch_tcp_table(family: int) -> Optional[bytes]:
+    import ctypes
+    from ctypes import wintypes
+
+    iphlpapi = ctypes.windll.iphlpapi
+
+    # Defining the function
+    GetExtendedTcpTable = iphlpapi.GetExtendedTcpTable
+    GetExtendedTcpTable.argtypes = [
+        ctypes.c_void_p,      
+        ctypes.POINTER(wintypes.DWORD), 
+        wintypes.BOOL,     
+        wintypes.DWORD,    
+        ctypes.c_int,      
+        wintypes.DWORD     
+    ]
+    GetExtendedTcpTable.restype = wintypes.UINT
+
+    # First call reports the size needed; the table can grow before the second call,
+    # in which case the size is updated and the call is retried.
+    size = wintypes.DWORD(0)
+    GetExtendedTcpTable(None, ctypes.byref(size), False, family, TCP_TABLE_OWNER_PID_ALL, 0)
+
+    for _ in range(3):
         if size.value == 0:
-            return []
-        
-        # Second Function call for allocation
+            return None
+
         buffer = ctypes.create_string_buffer(size.value)
-        result = GetExtendedTcpTable(
-            buffer, # Actual buffer of required size
-            ctypes.byref(size), # Size of buffer
-            False,
-            2,
-            5,
-            0
-        )
-        
-        if result != 0:
-            return []
-        
-        table = ctypes.cast(buffer, ctypes.POINTER(MIB_TCPTABLE_OWNER_PID)).contents
-        num_entries = table.dwNumEntries
+        result = GetExtendedTcpTable(buffer, ctypes.byref(size), False, family, TCP_TABLE_OWNER_PID_ALL, 0)
 
-        connections = []
+        if result == 0:
+            return buffer.raw[:size.value]
+        if result != ERROR_INSUFFICIENT_BUFFER:
+            return None
 
-        for i in range(num_entries):
-            row_ptr = ctypes.cast(
-                ctypes.addressof(table.table) + (i * ctypes.sizeof(MIB_TCPROW_OWNER_PID)),
-                ctypes.POINTER(MIB_TCPROW_OWNER_PID)
-            )
-            row = row_ptr.contents
-
-            if row.dwOwningPid == pid:
-                ip_int = row.dwLocalAddr
-                local_addr =  f"{ip_int & 0xFF}.{(ip_int >> 8) & 0xFF}.{(ip_int >> 16 & 0xFF)}.{(ip_int>>24 & 0xFF)}"
-
-                ip_int = row.dwRemoteAddr
-                remote_addr = f"{ip_int & 0xFF}.{(ip_int >> 8) & 0xFF}.{(ip_int >> 16 & 0xFF)}.{(ip_int>>24 & 0xFF)}"
-
-                connections.append({
-                    'local_addr': local_addr,
-                    'local_port': socket.ntohs(row.dwLocalPort & 0xFFFF),
-                    'remote_addr': remote_addr,
-                    'remote_port': socket.ntohs(row.dwRemotePort & 0xFFFF),
-                    'state': TCP_STATE.get(row.dwState, 'UNKNOWN'),
-                    'pid': pid
-                })
-        
-        return connections
-    
-    except Exception:
-        return []
+    return None
+
+def parse_tcp_table(data: bytes) -> Iterator[dict]:
+    # MIB_TCPTABLE_OWNER_PID: DWORD count, then rows of state, local addr, local port,
+    # remote addr, remote port, owning pid. Addresses and ports are in network byte order.
+    import socket
+    import struct
+
+    count = struct.unpack_from('<I', data, 0)[0]
+    offset = 4
+
+    for _ in range(count):
+        if offset + TCP_ROW_SIZE > len(data):
+            break
+
+        state, = struct.unpack_from('<I', data, offset)
+        local_port, = struct.unpack_from('>H', data, offset + 8)
+        remote_port, = struct.unpack_from('>H', data, offset + 16)
+        pid, = struct.unpack_from('<I', data, offset + 20)
+
+        yield {
+            'local_addr': socket.inet_ntoa(data[offset + 4:offset + 8]),
+            'local_port': local_port,
+            'remote_addr': socket.inet_ntoa(data[offset + 12:offset + 16]),
+            'remote_port': remote_port,
+            'state': TCP_STATE.get(state, 'UNKNOWN'),
+            'protocol': 'tcp',
+            'inode': None,
+            'pid': pid
+        }
+        offset += TCP_ROW_SIZE
+
+def parse_tcp6_table(data: bytes) -> Iterator[dict]:
+    # MIB_TCP6TABLE_OWNER_PID: DWORD count, then rows of local addr[16], scope id, local
+    # port, remote addr[16], scope id, remote port, state, owning pid.
+    import ipaddress
+    import struct
+
+    count = struct.unpack_from('<I', data, 0)[0]
+    offset = 4
+
+    for _ in range(count):
+        if offset + TCP6_ROW_SIZE > len(data):
+            break
+
+        local_port, = struct.unpack_from('>H', data, offset + 20)
+        remote_port, = struct.unpack_from('>H', data, offset + 44)
+        state, pid = struct.unpack_from('<II', data, offset + 48)
+
+        yield {
+            'local_addr': str(ipaddress.IPv6Address(data[offset:offset + 16])),
+            'local_port': local_port,
+            'remote_addr': str(ipaddress.IPv6Address(data[offset + 24:offset + 40])),
+            'remote_port': remote_port,
+            'state': TCP_STATE.get(state, 'UNKNOWN'),
+            'protocol': 'tcp',
+            'inode': None,
+            'pid': pid
+        }
+        offset += TCP6_ROW_SIZE
     
 def reverse_dns_lookup(ip_address: str) -> str:
     try:
@@ -0,0 +1,195 @@
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, Optional
+
+# Order of the fields in the records the platform enumerators yield.
+RECORD_FIELDS = ('pid', 'ppid', 'starttime', 'session', 'tty_nr', 'name', 'path', 'cmdline')
+
+ProcessRecord = tuple[int, int, int, int, int, str, str, str]
+
+_NUMERIC_COLUMNS = {'pid': 'q', 'ppid': 'q', 'starttime': 'Q', 'session': 'q', 'tty_nr': 'q'}
+
+
+class StringPool:
+    """Interned strings addressed by a small integer id; id 0 is always ""."""
+
+    __slots__ = ('_ids', '_values')
+
+    def __init__(self):
+        self._ids: dict[str, int] = {"": 0}
+        self._values: list[str] = [""]
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._values)
+            value = sys.intern(value)
+            self._ids[value] = string_id
+            self._values.append(value)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._values[string_id]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class ProcessView:
+    """Read-only, dict-compatible view of one row of a ProcessTable.
+
+    Views are cheap to hand out but only valid until the table's next update(), which may
+    move rows around; use to_dict() to keep a process past that point.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'ProcessTable', row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._value(key, self._row)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in _FIELDS:
+            return default
+        return self._table._value(key, self._row)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELDS
+
+    def keys(self) -> tuple[str, ...]:
+        return RECORD_FIELDS
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: self._table._value(key, self._row) for key in RECORD_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"ProcessView({self.to_dict()!r})"
+
+
+_FIELDS = frozenset(RECORD_FIELDS)
+
+
+class ProcessTable:
+    """Process listing stored column-wise and updated in place between cycles.
+
+    Numeric fields live in typed arrays, names and paths are interned once and stored as
+    ids, so a steady-state cycle rewrites a few integers per process instead of building a
+    fresh dict for each one. Exited processes are removed by moving the last row into their
+    slot.
+    """
+
+    def __init__(self):
+        self._columns: dict[str, array] = {key: array(code) for key, code in _NUMERIC_COLUMNS.items()}
+        self._name_ids = array('I')
+        self._path_ids = array('I')
+        self._cmdlines: list[str] = []
+
+        self.names = StringPool()
+        self.paths = StringPool()
+        self._rows: dict[int, int] = {}  # pid -> row
+
+    def update(self, records: Iterable[ProcessRecord]) -> tuple[int, int]:
+        # Returns how many processes were added and how many were removed.
+        pids, ppids, starttimes = self._columns['pid'], self._columns['ppid'], self._columns['starttime']
+        sessions, ttys = self._columns['session'], self._columns['tty_nr']
+        seen = bytearray(len(pids))
+        added = 0
+
+        for pid, ppid, starttime, session, tty_nr, name, path, cmdline in records:
+            row = self._rows.get(pid)
+
+            if row is None:
+                row = len(pids)
+                self._rows[pid] = row
+                pids.append(pid)
+                ppids.append(ppid)
+                starttimes.append(starttime)
+                sessions.append(session)
+                ttys.append(tty_nr)
+                self._name_ids.append(self.names.intern(name))
+                self._path_ids.append(self.paths.intern(path))
+                self._cmdlines.append(cmdline)
+                seen.append(1)
+                added += 1
+                continue
+
+            seen[row] = 1
+            ppids[row] = ppid
+            sessions[row] = session
+            ttys[row] = tty_nr
+            if starttimes[row] != starttime or self.names[self._name_ids[row]] != name:
+                starttimes[row] = starttime
+                self._name_ids[row] = self.names.intern(name)
+            if self.paths[self._path_ids[row]] != path:
+                self._path_ids[row] = self.paths.intern(path)
+            if self._cmdlines[row] != cmdline:
+                self._cmdlines[row] = cmdline
+
+        removed = 0
+        for row in range(len(seen) - 1, -1, -1):
+            if not seen[row]:
+                self._remove_row(row)
+                removed += 1
+
+        # Names of long-gone processes would otherwise pile up over days of uptime.
+        if len(self.names) + len(self.paths) > 4 * len(self._cmdlines) + 1024:
+            self._compact_pools()
+
+        return added, removed
+
+    def get(self, pid: int) -> Optional[ProcessView]:
+        row = self._rows.get(pid)
+        return None if row is None else ProcessView(self, row)
+
+    def cached_path(self, pid: int, starttime: int, name: str) -> Optional[str]:
+        # Executable path from the last update when the same process (not a recycled PID,
+        # not re-exec'd under a new name) is still there; lets enumerators skip resolving it.
+        row = self._rows.get(pid)
+        if row is None or self._columns['starttime'][row] != starttime or self.names[self._name_ids[row]] != name:
+            return None
+        return self.paths[self._path_ids[row]]
+
+    def column(self, key: str) -> array:
+        return self._columns[key]
+
+    def _value(self, key: str, row: int) -> Any:
+        if key == 'name':
+            return self.names[self._name_ids[row]]
+        if key == 'path':
+            return self.paths[self._path_ids[row]]
+        if key == 'cmdline':
+            return self._cmdlines[row]
+        return self._columns[key][row]
+
+    def _compact_pools(self):
+        names, paths = StringPool(), StringPool()
+        for row in range(len(self._cmdlines)):
+            self._name_ids[row] = names.intern(self.names[self._name_ids[row]])
+            self._path_ids[row] = paths.intern(self.paths[self._path_ids[row]])
+        self.names, self.paths = names, paths
+
+    def _remove_row(self, row: int):
+        last = len(self._cmdlines) - 1
+        del self._rows[self._columns['pid'][row]]
+
+        if row != last:
+            for column in (*self._columns.values(), self._name_ids, self._path_ids):
+                column[row] = column[last]
+            self._cmdlines[row] = self._cmdlines[last]
+            self._rows[self._columns['pid'][row]] = row
+
+        for column in (*self._columns.values(), self._name_ids, self._path_ids):
+            column.pop()
+        self._cmdlines.pop()
+
+    def __iter__(self) -> Iterator[ProcessView]:
+        return (ProcessView(self, row) for row in range(len(self._cmdlines)))
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._rows
+
+    def __len__(self) -> int:
+        return len(self._cmdlines)
@@ -1,6 +1,13 @@
+import threading
+import time
+from typing import Optional
+
+from ...config import config
 from ...utils.logger import get_logger
+from ...utils.platform.base import is_windows
 
-from .result import DetectionResult, TechniqueResult, VERDICT_BLOCK, VERDICT_CLEAN, VERDICT_FLAG
+from .result import DetectionResult, TechniqueResult, VERDICT_BLOCK, VERDICT_CLEAN, VERDICT_FLAG, TIMEOUT_ERROR, NOT_EVALUATED
+from .result_cache import VMResultCache, compute_fingerprint
 from ..detectors.base import BaseDetector
 
 from ..detectors.hardware.cpu.hypervisor_bit import HypervisorBitDetector
@@ -8,9 +15,13 @@ from ..detectors.hardware.cpu.vmid import CPUIDVendorDetector
 from ..detectors.hardware.firmware.pci_devices import PCIDetector
 from ..detectors.hardware.firmware.smbios_tables import SMBIOSDetector
 from ..detectors.hardware.firmware.kernel_objects import KernelObjectDetector
+from ..detectors.hardware.kernel.guest_probes import GuestProbeDetector
 from ..detectors.hardware.network.mac_address import MACAddressDetector
 from ..detectors.sandbox.virtual_registry import VirtualRegistryDetector
 
+# Seconds a single detector may run before it is reported as timed out.
+DEFAULT_DETECTOR_TIMEOUT = 15.0
+
 TIER_MAPPING = {
             "Firmware Table Scan": "CRITICAL",
             "Virtual Registry Detection": "CRITICAL", 
@@ -19,10 +30,14 @@ TIER_MAPPING = {
             "Kernel Object Detection": "HIGH",
             "CPUID Hypervisor Bit": "HIGH",
             "CPUID Vendor String": "HIGH", # Not very consistent
+            "Linux Guest Probes": "HIGH",
             
             "MAC Address Check": "LOW",
         }
 
+# Order tiers are evaluated in by fail-fast mode; a single CRITICAL hit decides the verdict.
+TIER_ORDER = {"CRITICAL": 0, "HIGH": 1, "LOW": 2}
+
 
 class DetectionEngine:
     def __init__(self):
@@ -35,6 +50,7 @@ class DetectionEngine:
         return [
             HypervisorBitDetector(),
             CPUIDVendorDetector(),
+            GuestProbeDetector(),
             VirtualRegistryDetector(),
             SMBIOSDetector(),
             PCIDetector(),
@@ -42,42 +58,200 @@ class DetectionEngine:
             MACAddressDetector(),
         ]
     
-    def run(self) -> DetectionResult:
+    def run(self, force_rescan: bool = False, fail_fast: Optional[bool] = None) -> DetectionResult:
+        # Hardware does not change between launches, so a result recorded for the same
+        # fingerprint is replayed unless a rescan is forced.
+        if fail_fast is None:
+            fail_fast = config.get('vm_detector', "fail_fast", False)
+        scan = self._scan_fail_fast if fail_fast else self._scan
+
+        cache_path = config.get_path('vm_detector', "result_cache")
+        if not cache_path:
+            return scan()
+
+        cache = VMResultCache(cache_path)
+        fingerprint = compute_fingerprint()
+        force_rescan = force_rescan or config.get('vm_detector', "force_rescan", False)
+
+        if not force_rescan:
+            cached = cache.load(fingerprint, fail_fast)
+            if cached is not None:
+                self.logger.info(f"Hardware fingerprint unchanged, using cached VM verdict: {cached.verdict}")
+                return cached
+
+        result = scan()
+        cache.store(fingerprint, result, fail_fast)
+        return result
+
+    def _scan(self) -> DetectionResult:
         result = DetectionResult()
 
         self.logger.info("Starting detection engine...")
 
+        # Every detector gets its own thread and deadline, so the scan takes as long as
+        # the slowest probe rather than the sum of all of them.
+        default_timeout = config.get('vm_detector', "detector_timeout", DEFAULT_DETECTOR_TIMEOUT)
+        overrides = config.get('vm_detector', "detector_timeouts", {}) or {}
+
+        outcomes: dict[str, TechniqueResult] = {}
+        workers = []
+        started = time.monotonic()
+
         for detector in self.detectors:
-            try:
-                tech_res = detector.safe_detect()
-
-                tech_res.tier = self.TIER_MAPPING.get(tech_res.name, "LOW")
-
-                if tech_res.detected:
-                    if tech_res.tier == "CRITICAL":
-                        result.critical_hits += 1
-                    elif tech_res.tier == "HIGH":
-                        result.high_hits += 1
-                    elif tech_res.tier == "LOW":
-                        result.low_hits += 1
-                
-                result.techniques.append(tech_res)
-            
-            except Exception as e:
-                self.logger.error(f"Detector {detector.name} failed {e}")
-                # Added the Failed test as False
-                err_res = TechniqueResult(
-                    name=detector.name,
-                    detected=False,
-                    tier=self.TIER_MAPPING.get(detector.name, "LOW"),
-                    error=str(e)
-                )
-                result.techniques.append(err_res)
+            worker = threading.Thread(
+                target=self._run_detector,
+                args=(detector, outcomes),
+                name=f"vm-{detector.name}",
+                daemon=True
+            )
+            deadline = started + overrides.get(detector.name, default_timeout)
+            workers.append((detector, worker, deadline))
+            worker.start()
+
+        for detector, worker, deadline in sorted(workers, key=lambda w: w[2]):
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        for detector, worker, deadline in workers:
+            tech_res = outcomes.get(detector.name) or self._timed_out(detector, deadline - started)
+            self._record(result, tech_res)
 
+        self.logger.info(f"Detection engine finished in {time.monotonic() - started:.2f}s")
         self._apply_logic(result)
 
         return result
+
+    def _scan_fail_fast(self) -> DetectionResult:
+        # One detector at a time, highest tier first and cheapest first within a tier,
+        # stopping as soon as no outcome of the remaining detectors could change the verdict.
+        result = DetectionResult()
+
+        self.logger.info("Starting detection engine (fail-fast)...")
+
+        default_timeout = config.get('vm_detector', "detector_timeout", DEFAULT_DETECTOR_TIMEOUT)
+        overrides = config.get('vm_detector', "detector_timeouts", {}) or {}
+
+        pending = self._schedule()
+        started = time.monotonic()
+
+        while pending:
+            if self._verdict_settled(result, pending):
+                self.logger.info(f"Verdict settled, skipping {len(pending)} detector(s)")
+                for detector in pending:
+                    # Detectors that could never run here keep their own reason.
+                    if not detector.can_run():
+                        self._record(result, detector.safe_detect())
+                        continue
+                    self._record(result, TechniqueResult(
+                        name=detector.name,
+                        detected=False,
+                        details="Skipped, verdict already settled",
+                        error=NOT_EVALUATED
+                    ))
+                break
+
+            detector = pending.pop(0)
+            timeout = overrides.get(detector.name, default_timeout)
+            outcomes: dict[str, TechniqueResult] = {}
+            worker = threading.Thread(
+                target=self._run_detector,
+                args=(detector, outcomes),
+                name=f"vm-{detector.name}",
+                daemon=True
+            )
+            worker.start()
+            worker.join(timeout=timeout)
+
+            self._record(result, outcomes.get(detector.name) or self._timed_out(detector, timeout))
+
+        self.logger.info(f"Detection engine finished in {time.monotonic() - started:.3f}s")
+        self._apply_logic(result)
+
+        return result
+
+    def _schedule(self) -> list[BaseDetector]:
+        return sorted(
+            self.detectors,
+            key=lambda d: (TIER_ORDER.get(self.TIER_MAPPING.get(d.name, "LOW"), len(TIER_ORDER)), d.cost_estimate)
+        )
+
+    def _verdict_settled(self, result: DetectionResult, pending: list[BaseDetector]) -> bool:
+        # Verdicts only get stricter with more hits, so the verdict is final once it equals
+        # the one we would get if every remaining detector that can run came back positive.
+        critical, high, low = result.critical_hits, result.high_hits, result.low_hits
+        current = self._verdict(critical, high, low)
+
+        for detector in pending:
+            if not detector.can_run():
+                continue
+            tier = self.TIER_MAPPING.get(detector.name, "LOW")
+            if tier == "CRITICAL":
+                critical += 1
+            elif tier == "HIGH":
+                high += 1
+            else:
+                low += 1
+
+        return self._verdict(critical, high, low) == current
+
+    def _timed_out(self, detector: BaseDetector, timeout: float) -> TechniqueResult:
+        self.logger.error(f"Detector {detector.name} timed out after {timeout:.1f}s")
+        return TechniqueResult(
+            name=detector.name,
+            detected=False,
+            details="Detection check timed out",
+            error=f"{TIMEOUT_ERROR} after {timeout:.1f}s"
+        )
+
+    def _run_detector(self, detector: BaseDetector, outcomes: dict[str, TechniqueResult]):
+        # WMI-backed probes need COM initialised on the thread that uses it.
+        com_initialized = False
+        if is_windows():
+            try:
+                import pythoncom
+                pythoncom.CoInitialize()
+                com_initialized = True
+            except ImportError:
+                pass
+
+        try:
+            tech_res = detector.safe_detect()
+        except Exception as e:
+            self.logger.error(f"Detector {detector.name} failed {e}")
+            # Added the Failed test as False
+            tech_res = TechniqueResult(
+                name=detector.name,
+                detected=False,
+                error=str(e)
+            )
+        finally:
+            if com_initialized:
+                pythoncom.CoUninitialize()
+
+        outcomes[detector.name] = tech_res
+
+    def _record(self, result: DetectionResult, tech_res: TechniqueResult):
+        tech_res.tier = self.TIER_MAPPING.get(tech_res.name, "LOW")
+
+        if tech_res.detected:
+            if tech_res.tier == "CRITICAL":
+                result.critical_hits += 1
+            elif tech_res.tier == "HIGH":
+                result.high_hits += 1
+            elif tech_res.tier == "LOW":
+                result.low_hits += 1
+        
+        result.techniques.append(tech_res)
     
+    @staticmethod
+    def _verdict(critical_hits: int, high_hits: int, low_hits: int) -> str:
+        # Only firmware-level (CRITICAL) evidence blocks; HIGH and LOW hits, however many,
+        # flag the session for review.
+        if critical_hits:
+            return VERDICT_BLOCK
+        if high_hits or low_hits:
+            return VERDICT_FLAG
+        return VERDICT_CLEAN
+
     def _apply_logic(self, result: DetectionResult):
         # Decision Tree for Comprehensive Analysis
 
@@ -85,9 +259,13 @@ class DetectionEngine:
         high_detection = result.high_hits > 0
         low_detection = result.low_hits > 0
 
+        result.verdict = self._verdict(result.critical_hits, result.high_hits, result.low_hits)
+
+        # Hardening is only claimed for a tier whose checks actually ran; a tier that was
+        # skipped, unsupported or errored says nothing about what the VM hides.
+        evaluated = {t.tier for t in result.techniques if t.error is None}
+
         if critical_detection:
-            result.verdict = VERDICT_BLOCK
-            
             # Check for Sandbox specifically (Special Case)
             is_sandbox = any(t.name == "Virtual Registry Detection" and t.detected for t in result.techniques)
 
@@ -95,27 +273,23 @@ class DetectionEngine:
                 result.reason = "Sandbox environment detected (Critical isolation)"
             elif high_detection and low_detection:
                 result.reason = "Virtual machine detected (default configuration - no hardening)"
-            elif high_detection and not low_detection:
+            elif high_detection and not low_detection and "LOW" in evaluated:
                 result.reason = "Virtual machine detected (basic hardening - MAC spoofed)"
-            elif not high_detection and low_detection:
+            elif not high_detection and low_detection and "HIGH" in evaluated:
                 result.reason = "Virtual machine detected (firmware exposed only)"
             else:
                 result.reason = "Virtual machine detected (firmware-level indicators)"
         
-        elif high_detection >= 2:
-            result.verdict = VERDICT_BLOCK
-            if low_detection:
-                result.reason = "Virtual machine detected (moderate hardening - firmware hidden)"
-            else:
-                result.reason = "Virtual machine detected (advanced hardening - firmware and MAC hidden)"
-        
-        elif (high_detection < 2 and high_detection > 0) or low_detection:
-            result.verdict = VERDICT_FLAG
+        elif high_detection or low_detection:
             result.reason = "Suspicious indicators detected (possible false positive - manual review required)"
         
         else:
-            result.verdict = VERDICT_CLEAN
             result.reason = "System appears clean"
 
+        # Hardening level above is read off the checks that ran; say when some did not.
+        skipped = sum(1 for t in result.techniques if t.error == NOT_EVALUATED)
+        if skipped:
+            result.reason += f" [fail-fast: {skipped} check(s) not evaluated]"
+
 
         
\ No newline at end of file
@@ -9,6 +9,14 @@ VERDICT_BLOCK = "BLOCK"
 VERDICT_FLAG = "FLAG"
 VERDICT_CLEAN = "ALLOW"
 
+# Errors of a technique that was skipped before probing anything.
+PLATFORM_UNSUPPORTED = "Platform not supported"
+INSUFFICIENT_PERMISSIONS = "Insufficient permissions"
+# Error prefix of a technique that did not finish within its deadline.
+TIMEOUT_ERROR = "Timed out"
+# Error of a technique skipped by fail-fast mode once the verdict was settled.
+NOT_EVALUATED = "Not evaluated"
+
 @dataclass
 class TechniqueResult:
     name: str
@@ -16,6 +24,8 @@ class TechniqueResult:
     tier: str = "UNKNOWN"
     details: str = ""
     error: Optional[str] = None
+    # Structured evidence behind `details` (e.g. signature hits with their offsets).
+    data: dict = field(default_factory=dict)
 
     def is_detected(self) -> bool:
         return self.detected
@@ -25,9 +35,21 @@ class TechniqueResult:
             'name': self.name,
             'detected': self.detected,
             'details': self.details,
-            'error': self.error
+            'error': self.error,
+            'data': self.data
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TechniqueResult':
+        return cls(
+            name=data['name'],
+            detected=bool(data['detected']),
+            tier=data.get('tier', "UNKNOWN"),
+            details=data.get('details', ""),
+            error=data.get('error'),
+            data=data.get('data') or {}
+        )
+
 @dataclass
 class DetectionResult:
     techniques: list[TechniqueResult] = field(default_factory=list)
@@ -38,6 +60,19 @@ class DetectionResult:
     high_hits: int = 0
     low_hits: int = 0
 
+    from_cache: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DetectionResult':
+        return cls(
+            techniques=[TechniqueResult.from_dict(t) for t in data.get('techniques', [])],
+            verdict=data['verdict'],
+            reason=data['reason'],
+            critical_hits=data.get('critical_hits', 0),
+            high_hits=data.get('high_hits', 0),
+            low_hits=data.get('low_hits', 0)
+        )
+
     def to_json(self) -> str:
         data = {
             "module": "vm_detector",
@@ -51,7 +86,8 @@ class DetectionResult:
             "details": [t.to_dict() for t in self.techniques],
             "meta": {
                 "version":"0.1.0",
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "cached": self.from_cache
             }
         }
 
@@ -71,8 +107,11 @@ class DetectionResult:
                 status_color = GREEN
                 status_text = "PASS"
             
-            if tech.error == "Platform not supported":
+            if tech.error == PLATFORM_UNSUPPORTED:
                 continue
+            if tech.error == NOT_EVALUATED:
+                status_color = CYAN
+                status_text = "SKIPPED"
 
             tier_color = PURPLE if tech.tier == "CRITICAL" else (YELLOW if tech.tier == "HIGH" else CYAN)
 
@@ -80,9 +119,10 @@ class DetectionResult:
 
             if tech.detected:
                 print(f"    {YELLOW}↳ {tech.details}{RESET}")
-            if tech.error:
+            if tech.error and tech.error != NOT_EVALUATED:
                 print(f"    {RED}↳ ERROR: {tech.error}{RESET}")
         
         verdict_color = RED if self.verdict == "BLOCK" else (YELLOW if self.verdict == "FLAG" else GREEN)
         print(f"{CYAN}{'-'*60}{RESET}")
-        print(f"VM VERDICT: {verdict_color}{self.verdict}{RESET} | {self.reason}")
+        cached = " (cached hardware scan)" if self.from_cache else ""
+        print(f"VM VERDICT: {verdict_color}{self.verdict}{RESET} | {self.reason}{cached}")
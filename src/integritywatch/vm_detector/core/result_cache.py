@@ -0,0 +1,155 @@
+import dataclasses
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from pathlib import Path
+from typing import Optional
+
+from ...utils.logger import get_logger
+from ...utils.cpuid_probe import get_cpuid_probe
+from ...config import DATA_DIR
+from ...utils.platform.base import is_admin, is_windows, is_linux, is_macos
+from .result import DetectionResult, PLATFORM_UNSUPPORTED, VERDICT_BLOCK
+
+CACHE_VERSION = 2
+SCAN_MODE_FULL = "full"
+SCAN_MODE_FAIL_FAST = "fail_fast"
+KEY_PATH = DATA_DIR / "cache.key"
+
+
+def compute_fingerprint() -> str:
+    """Cheap digest of what a full VM scan depends on: boot session, board UUID, PCI ID
+    set, CPU vendor and privilege level (root-only probes change what a scan can see).
+    Any of them changing means the cached verdict no longer applies."""
+    parts = [f"vendor={get_cpuid_probe().vendor}", f"admin={is_admin()}"]
+
+    if is_linux():
+        from ...utils.platform import linux
+        firmware = linux.get_firmware_info()
+        parts.append(f"boot={linux.read_boot_id()}")
+        # product_uuid is root-only; the public DMI strings stand in for it otherwise.
+        parts.append(f"board={linux.read_dmi_file('product_uuid') or json.dumps(firmware, sort_keys=True)}")
+        parts.append(f"pci={sorted(linux.get_pci_device_ids())}")
+
+    elif is_windows():
+        from ...utils.platform import windows
+        parts.append(f"boot={windows.get_boot_time()}")
+        parts.append(f"board={windows.get_product_uuid()}")
+        parts.append(f"pci={sorted(windows.get_pci_device_ids())}")
+
+    elif is_macos():
+        from ...utils.platform import macos
+        parts.append(f"boot={macos.get_boot_time()}")
+        parts.append(f"board={macos.get_platform_uuid()}")
+
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class VMResultCache:
+    """BLOCK verdicts persisted per hardware fingerprint and signed with HMAC-SHA256.
+
+    The key and the cache both live in the candidate's own profile, so a signature only
+    catches corruption, not a forged file. That is why only BLOCK is ever stored: the worst
+    a hand-written cache can do is block the person who wrote it, while ALLOW and FLAG are
+    always decided by a fresh scan.
+    """
+
+    def __init__(self, cache_path: Path, key_path: Path = KEY_PATH):
+        self.logger = get_logger("vm_detector.result_cache")
+        self.cache_path = Path(cache_path)
+        self.key_path = key_path
+
+    def load(self, fingerprint: str, fail_fast: bool = False) -> Optional[DetectionResult]:
+        # A full scan answers any run; a fail-fast one only another fail-fast run.
+        try:
+            with open(self.cache_path, 'r') as f:
+                envelope = json.load(f)
+
+            payload = envelope['payload']
+            expected = self._sign(payload)
+            if expected is None or not hmac.compare_digest(expected, envelope.get('mac', '')):
+                self.logger.warning("VM result cache failed integrity check, ignoring it")
+                return None
+
+            data = json.loads(payload)
+            if data.get('version') != CACHE_VERSION or data.get('fingerprint') != fingerprint:
+                self.logger.info("Hardware fingerprint changed, VM result cache invalidated")
+                return None
+            if data.get('mode') != SCAN_MODE_FULL and not (fail_fast and data.get('mode') == SCAN_MODE_FAIL_FAST):
+                return None
+
+            result = DetectionResult.from_dict(data['result'])
+            if result.verdict != VERDICT_BLOCK:
+                return None
+            result.from_cache = True
+            return result
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable VM result cache: {e}")
+            return None
+
+    def store(self, fingerprint: str, result: DetectionResult, fail_fast: bool = False):
+        if result.verdict != VERDICT_BLOCK:
+            return
+
+        # Only complete scans are replayed: a detector that errored, timed out, lacked
+        # privileges or was skipped could have changed the outcome. Platform-unsupported
+        # detectors never run on this machine, so they do not make a scan partial.
+        if any(t.error and t.error != PLATFORM_UNSUPPORTED for t in result.techniques):
+            self.logger.info("VM scan is incomplete, not caching its result")
+            return
+
+        result_data = dataclasses.asdict(result)
+        result_data.pop('from_cache', None)
+        payload = json.dumps(
+            {'version': CACHE_VERSION, 'fingerprint': fingerprint, 'result': result_data,
+             'mode': SCAN_MODE_FAIL_FAST if fail_fast else SCAN_MODE_FULL},
+            sort_keys=True
+        )
+
+        mac = self._sign(payload, create_key=True)
+        if mac is None:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'payload': payload, 'mac': mac}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save VM result cache: {e}")
+
+    def _sign(self, payload: str, create_key: bool = False) -> Optional[str]:
+        key = self._load_key(create_key)
+        if key is None:
+            return None
+        return hmac.new(key, payload.encode(), hashlib.sha256).hexdigest()
+
+    def _load_key(self, create: bool) -> Optional[bytes]:
+        try:
+            return self.key_path.read_bytes()
+        except FileNotFoundError:
+            if not create:
+                return None
+        except OSError as e:
+            self.logger.warning(f"Cannot read VM result cache key: {e}")
+            return None
+
+        key = secrets.token_bytes(32)
+        try:
+            self.key_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+        except FileExistsError:
+            return self.key_path.read_bytes()
+        except OSError as e:
+            self.logger.warning(f"Cannot create VM result cache key: {e}")
+            return None
+
+        return key
@@ -1,17 +1,18 @@
 from abc import ABC, abstractmethod
-import os
 
-from ..core.result import TechniqueResult
+from ..core.result import TechniqueResult, PLATFORM_UNSUPPORTED, INSUFFICIENT_PERMISSIONS
 from ...utils.logger import get_logger
-from integritywatch.utils.platform.base import get_current_platform, is_windows
+from integritywatch.utils.platform.base import get_current_platform, is_admin
 
 class BaseDetector(ABC):
     """Abstract base class for all VM/sandbox detectors."""
     
-    def __init__(self, name: str, supported_platforms: list[str], requires_admin: bool = False):
+    def __init__(self, name: str, supported_platforms: list[str], requires_admin: bool = False, cost: float = 0.01):
         self.name = name
         self.supported_platforms = supported_platforms
         self.requires_admin = requires_admin
+        # Typical seconds per detect(), used to order fail-fast scans within a tier.
+        self.cost_estimate = cost
         self.logger = get_logger(f'vm_detector.{name.lower().replace(" ", "_")}')
         self._current_platform = get_current_platform()
     
@@ -21,15 +22,12 @@ class BaseDetector(ABC):
         return self._current_platform in self.supported_platforms
     
     def is_admin(self) -> bool:
-        try:
-            if is_windows():
-                import ctypes
-                return ctypes.windll.shell32.IsUserAnAdmin() != 0
-            else: 
-                return os.geteuid() == 0
-        except Exception:
-            return False
+        return is_admin()
     
+    def can_run(self) -> bool:
+        # False when safe_detect() would skip this detector without probing anything.
+        return self.is_platform_supported() and not (self.requires_admin and not self.is_admin())
+
     @abstractmethod
     def detect(self) -> TechniqueResult:
         pass
@@ -41,7 +39,7 @@ class BaseDetector(ABC):
                 name=self.name,
                 detected=False,
                 details=f"Unsupported platform: {self._current_platform}",
-                error="Platform not supported"
+                error=PLATFORM_UNSUPPORTED
             )
         
         if self.requires_admin and not self.is_admin():
@@ -50,7 +48,7 @@ class BaseDetector(ABC):
                 name=self.name,
                 detected=False,
                 details="Requires elevated privileges",
-                error="Insufficient permissions"
+                error=INSUFFICIENT_PERMISSIONS
             )
         
         try:
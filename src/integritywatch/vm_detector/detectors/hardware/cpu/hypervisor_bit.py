@@ -1,5 +1,6 @@
 from ...base import BaseDetector
 from ....core.result import TechniqueResult
+from integritywatch.utils.cpuid_probe import get_cpuid_probe
 
 class HypervisorBitDetector(BaseDetector):
     # Detecting VM's by checking hypervisor present bit in CPUID leaf 1.
@@ -8,37 +9,28 @@ class HypervisorBitDetector(BaseDetector):
         super().__init__(
             name="CPUID Hypervisor Bit",
             supported_platforms=['windows', 'linux'],
-            requires_admin=False
+            requires_admin=False,
+            cost=0.001
         )
 
     def detect(self) -> TechniqueResult:
         self.logger.info("Checking CPU Hypervisor Present bit...")
         
-        try:
-            from integritywatch.utils.platform import base
-        except ImportError:
-            return TechniqueResult(
-                name=self.name,
-                detected=False,
-                error="CPU platform module not available"
-            )
-        
+        probe = get_cpuid_probe()
+
         # Check 1: Check hypervisor bit
-        features = base.get_cpuid_features()
-        if not features:
+        hypervisor_bit = probe.hypervisor_bit
+        if hypervisor_bit is None:
             return TechniqueResult(
                 name=self.name,
                 detected=False,
-                error="Could not read CPUID features"
+                error=probe.error or "Could not read CPUID features"
             )
         
-        ecx = features.get('ecx', 0)
-        hypervisor_bit = (ecx >> 31) & 1
-        
-        self.logger.debug(f"CPUID leaf 1 ECX: 0x{ecx:08X}, Bit 31: {hypervisor_bit}")
+        self.logger.debug(f"Hypervisor bit: {int(hypervisor_bit)} (source: {probe.source})")
         
         # If bit is 0, definitely not a VM
-        if hypervisor_bit == 0:
+        if not hypervisor_bit:
             return TechniqueResult(
                 name=self.name,
                 detected=False,
@@ -46,29 +38,28 @@ class HypervisorBitDetector(BaseDetector):
             )
         
         # Check 2: Bit is 1 - Verify with leaf 0x40000000 EAX
-        try:
-            eax, ebx, ecx_hv, edx = base.get_cpuid_registers(0x40000000)
-            
-            self.logger.debug(f"CPUID 0x40000000 EAX: 0x{eax:08X}")
-            
-            # Checking if eax is empty or not
-            if eax >= 0x40000000:
-                return TechniqueResult(
-                    name=self.name,
-                    detected=True,
-                    details=f"Hypervisor detected (EAX=0x{eax:08X})"
-                )
-            else:
-                # False positive
-                return TechniqueResult(
-                    name=self.name,
-                    detected=False,
-                    details="Hypervisor bit set but no VM (Hyper-V host or WSL)"
-                )
-        except Exception as e:
-            self.logger.warning(f"Failed to verify hypervisor: {e}")
+        eax = probe.hypervisor_max_leaf
+        if eax is None:
+            # Only /proc/cpuinfo was readable; the kernel sets its flag from the same bit.
+            return TechniqueResult(
+                name=self.name,
+                detected=True,
+                details="Hypervisor flag set in /proc/cpuinfo (leaf 0x40000000 unavailable)"
+            )
+
+        self.logger.debug(f"CPUID 0x40000000 EAX: 0x{eax:08X}")
+        
+        # Checking if eax is empty or not
+        if eax >= 0x40000000:
+            return TechniqueResult(
+                name=self.name,
+                detected=True,
+                details=f"Hypervisor detected (EAX=0x{eax:08X})"
+            )
+        else:
+            # False positive
             return TechniqueResult(
                 name=self.name,
                 detected=False,
-                details="Unable to verify hypervisor presence"
-            )
\ No newline at end of file
+                details="Hypervisor bit set but no VM (Hyper-V host or WSL)"
+            )
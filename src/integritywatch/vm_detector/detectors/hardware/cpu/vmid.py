@@ -1,5 +1,6 @@
 from ...base import BaseDetector
 from ....core.result import TechniqueResult
+from integritywatch.utils.cpuid_probe import CPUIDProbe, get_cpuid_probe
 
 VM_VENDOR_STRINGS = {
     'VMwareVMware': 'VMware',
@@ -27,22 +28,22 @@ class CPUIDVendorDetector(BaseDetector):
         super().__init__(
             name="CPUID Vendor String",
             supported_platforms=['windows', 'linux'],
-            requires_admin=False
+            requires_admin=False,
+            cost=0.001
         )
 
     def detect(self) -> TechniqueResult:
         self.logger.info("Scanning CPUID Vendor strings...")
-        try:
-            from integritywatch.utils.platform import base
-        except ImportError:
+        probe = get_cpuid_probe()
+        if probe.registers(0x40000000) is None:
             return TechniqueResult(
                 name=self.name,
                 detected=False,
-                error="CPU platform module not available"
+                error=probe.error or "CPUID leaves not available"
             )
         
         #Check 1: Checking for leaf 0x40000000 (hypervisor vendor - standard)
-        result = self._check_leaf(base, 0x40000000)
+        result = self._check_leaf(probe, 0x40000000)
         if result['detected']:
             return TechniqueResult(
                 name=self.name,
@@ -51,7 +52,7 @@ class CPUIDVendorDetector(BaseDetector):
             )
         
         #Check 2: Checking for leaf 0x40000100 (hypervisor vendor - extended)
-        result = self._check_leaf(base, 0x40000100)
+        result = self._check_leaf(probe, 0x40000100)
         if result['detected']:
             return TechniqueResult(
                 name=self.name,
@@ -65,8 +66,8 @@ class CPUIDVendorDetector(BaseDetector):
             details="No VM vendor strings found in CPUID"
         )
     
-    def _check_leaf(self, cpu_module, leaf: int) -> dict:
-        vendor_str = cpu_module.get_cpuid_vendor(leaf)
+    def _check_leaf(self, probe: CPUIDProbe, leaf: int) -> dict:
+        vendor_str = probe.hypervisor_vendor(leaf)
 
         if not vendor_str:
             self.logger.warning(f"No String found for the leaf 0x{leaf:08X}")
@@ -0,0 +1,100 @@
+import os
+import struct
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+ACPI_HEADER_SIZE = 36
+# FADT fields up to P_LVL3_LAT, needed for the C-state latency check.
+FADT_MIN_SIZE = 84
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ACPITableHeader:
+    signature: bytes
+    length: int
+    revision: int
+    checksum: int
+    oem_id: bytes
+    oem_table_id: bytes
+    raw: bytes  # header as read; extends to FADT_MIN_SIZE for FACP
+
+    @classmethod
+    def parse(cls, raw: bytes) -> Optional['ACPITableHeader']:
+        if len(raw) < ACPI_HEADER_SIZE:
+            return None
+        length, revision, checksum = struct.unpack_from('<IBB', raw, 4)
+        return cls(
+            signature=raw[0:4],
+            length=length,
+            revision=revision,
+            checksum=checksum,
+            oem_id=raw[10:16],
+            oem_table_id=raw[16:24],
+            raw=raw
+        )
+
+
+class ACPITableReader:
+    """One ACPI table file read header-first.
+
+    header() costs a single small read, so cheap triage can run on every table; the body is
+    only streamed through chunks() when a content scan is actually needed, and never held
+    in memory as a whole. sysfs table files cannot be mmap'd, hence fixed-size chunks.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = None
+        self._size: Optional[int] = None
+
+    def __enter__(self) -> 'ACPITableReader':
+        self._file = open(self.path, 'rb', buffering=0)
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+        self._file = None
+
+    def header(self) -> Optional[ACPITableHeader]:
+        # None for files too short to hold an SDT header.
+        raw = os.pread(self._file.fileno(), ACPI_HEADER_SIZE, 0)
+        if raw[0:4] == b'FACP':
+            raw += os.pread(self._file.fileno(), FADT_MIN_SIZE - ACPI_HEADER_SIZE, ACPI_HEADER_SIZE)
+        return ACPITableHeader.parse(raw)
+
+    @property
+    def size(self) -> int:
+        # sysfs reports the table length as the file size; count it by hand when it does not.
+        if self._size is None:
+            size = os.fstat(self._file.fileno()).st_size
+            if size <= 0:
+                size = sum(len(window) - overlap for _, window, overlap in self._windows(0))
+            self._size = size
+        return self._size
+
+    def chunks(self, overlap: int = 0) -> Iterator[tuple[int, memoryview]]:
+        # (file offset, window) pairs; each window starts with the last `overlap` bytes of
+        # the previous one so matches spanning a boundary are not lost. Windows share one
+        # buffer and are only valid until the next iteration.
+        for offset, window, _ in self._windows(overlap):
+            yield offset, window
+
+    def _windows(self, overlap: int) -> Iterator[tuple[int, memoryview, int]]:
+        buffer = bytearray(overlap + self.chunk_size)
+        view = memoryview(buffer)
+        self._file.seek(0)
+        offset, kept = 0, 0
+
+        while True:
+            read = self._file.readinto(view[kept:kept + self.chunk_size])
+            if not read:
+                break
+            end = kept + read
+            yield offset, view[:end], kept
+
+            carry = min(overlap, end)
+            buffer[:carry] = bytes(view[end - carry:end])
+            offset += end - carry
+            kept = carry
@@ -24,7 +24,8 @@ class KernelObjectDetector(BaseDetector):
         super().__init__(
             name="Kernel Object Detection",
             supported_platforms=['windows'],
-            requires_admin=False
+            requires_admin=False,
+            cost=0.005
         )
 
     def detect(self) -> TechniqueResult:
@@ -52,7 +52,8 @@ class PCIDetector(BaseDetector):
     def __init__(self):
         super().__init__(name="PCI Device Detection",
                          supported_platforms=['windows','linux'],
-                         requires_admin=False
+                         requires_admin=False,
+                         cost=0.005
         )
 
     def detect(self) -> TechniqueResult:
@@ -0,0 +1,136 @@
+import struct
+from typing import Iterator, Optional
+
+# Structure types the firmware checks look at.
+SMBIOS_BIOS = 0
+SMBIOS_SYSTEM = 1
+SMBIOS_BASEBOARD = 2
+SMBIOS_PROCESSOR = 4
+SMBIOS_MEMORY_DEVICE = 17
+SMBIOS_END_OF_TABLE = 127
+
+# Offsets of string-number fields in the formatted area, per (type, field), from DSP0134.
+SMBIOS_STRING_FIELDS = {
+    (SMBIOS_BIOS, 'vendor'): 0x04,
+    (SMBIOS_BIOS, 'version'): 0x05,
+    (SMBIOS_SYSTEM, 'manufacturer'): 0x04,
+    (SMBIOS_SYSTEM, 'product_name'): 0x05,
+    (SMBIOS_SYSTEM, 'version'): 0x06,
+    (SMBIOS_SYSTEM, 'serial_number'): 0x07,
+    (SMBIOS_SYSTEM, 'family'): 0x1A,
+    (SMBIOS_BASEBOARD, 'manufacturer'): 0x04,
+    (SMBIOS_BASEBOARD, 'product'): 0x05,
+    (SMBIOS_PROCESSOR, 'manufacturer'): 0x07,
+    (SMBIOS_PROCESSOR, 'version'): 0x10,
+    (SMBIOS_MEMORY_DEVICE, 'device_locator'): 0x10,
+    (SMBIOS_MEMORY_DEVICE, 'manufacturer'): 0x17,
+    (SMBIOS_MEMORY_DEVICE, 'serial_number'): 0x18,
+    (SMBIOS_MEMORY_DEVICE, 'part_number'): 0x1A,
+}
+
+# GetSystemFirmwareTable('RSMB') prefixes the table with a RawSMBIOSData header.
+RSMB_HEADER = struct.Struct('<BBBBI')
+
+
+class SMBIOSStructure:
+    """One structure of the table: formatted area plus its string set.
+
+    The string set is only split and decoded the first time a string field is read.
+    """
+
+    __slots__ = ('type', 'handle', 'formatted', '_raw_strings', '_strings')
+
+    def __init__(self, type_: int, handle: int, formatted: memoryview, raw_strings: memoryview):
+        self.type = type_
+        self.handle = handle
+        self.formatted = formatted
+        self._raw_strings = raw_strings
+        self._strings: Optional[list[str]] = None
+
+    def string(self, number: int) -> str:
+        # Strings are numbered from 1; 0 means the field is not set.
+        if number <= 0:
+            return ""
+        if self._strings is None:
+            raw = bytes(self._raw_strings).rstrip(b'\0')
+            self._strings = [s.decode('ascii', errors='replace').strip() for s in raw.split(b'\0')] if raw else []
+        return self._strings[number - 1] if number <= len(self._strings) else ""
+
+    def string_at(self, offset: int) -> str:
+        # String referenced by the string-number byte at `offset` of the formatted area;
+        # empty when the structure is too short to have that field (older SMBIOS versions).
+        if offset >= len(self.formatted):
+            return ""
+        return self.string(self.formatted[offset])
+
+    def field(self, name: str) -> str:
+        offset = SMBIOS_STRING_FIELDS.get((self.type, name))
+        return "" if offset is None else self.string_at(offset)
+
+
+class SMBIOSTable:
+    """SMBIOS structure table walked once and indexed by structure type.
+
+    Takes the raw table from /sys/firmware/dmi/tables/DMI or, via from_rsmb(), the blob
+    Windows returns for the RSMB provider, so both platforms share the same field checks.
+    """
+
+    def __init__(self, data: bytes):
+        self._raw = bytes(data)
+        self._data = memoryview(self._raw)
+        self._by_type: dict[int, list[SMBIOSStructure]] = {}
+        self.truncated = False
+        self._walk()
+
+    @classmethod
+    def from_rsmb(cls, blob: bytes) -> 'SMBIOSTable':
+        if len(blob) < RSMB_HEADER.size:
+            return cls(b'')
+        length = RSMB_HEADER.unpack_from(blob)[4]
+        return cls(blob[RSMB_HEADER.size:RSMB_HEADER.size + length])
+
+    def _walk(self):
+        data, raw = self._data, self._raw
+        offset = 0
+
+        while offset + 4 <= len(data):
+            type_, length, handle = struct.unpack_from('<BBH', data, offset)
+            strings_start = offset + length
+            if length < 4 or strings_start > len(data):
+                self.truncated = True
+                break
+
+            # The string set ends with a double NUL, which also covers an empty set.
+            strings_end = raw.find(b'\0\0', strings_start)
+            if strings_end < 0:
+                self.truncated = True
+                break
+
+            if type_ == SMBIOS_END_OF_TABLE:
+                break
+
+            structure = SMBIOSStructure(
+                type_, handle, data[offset:strings_start], data[strings_start:strings_end]
+            )
+            self._by_type.setdefault(type_, []).append(structure)
+            offset = strings_end + 2
+
+    def structures(self, type_: int) -> list[SMBIOSStructure]:
+        return self._by_type.get(type_, [])
+
+    def first(self, type_: int) -> Optional[SMBIOSStructure]:
+        structures = self._by_type.get(type_)
+        return structures[0] if structures else None
+
+    def field_values(self, type_: int, name: str) -> Iterator[tuple[int, str]]:
+        # (handle, value) for every non-empty `name` field across structures of `type_`.
+        for structure in self.structures(type_):
+            value = structure.field(name)
+            if value:
+                yield structure.handle, value
+
+    def types(self) -> list[int]:
+        return sorted(self._by_type)
+
+    def __len__(self) -> int:
+        return sum(len(structures) for structures in self._by_type.values())
@@ -1,7 +1,13 @@
 import struct
+from typing import Iterable
 from ...base import BaseDetector
 from ....core.result import TechniqueResult
-from integritywatch.utils.platform.base import is_windows, is_linux, get_current_platform, get_cpuid_vendor
+from integritywatch.utils.platform.base import is_windows, is_linux, get_current_platform
+from integritywatch.utils.cpuid_probe import get_cpuid_probe
+from .acpi_tables import ACPITableHeader, ACPITableReader, FADT_MIN_SIZE
+from .smbios import (
+    SMBIOSTable, SMBIOS_BIOS, SMBIOS_SYSTEM, SMBIOS_BASEBOARD, SMBIOS_PROCESSOR, SMBIOS_MEMORY_DEVICE
+)
 
 # Constants based on Signatures found in VM's
 VM_SIGNATURES = [
@@ -14,26 +20,125 @@ VM_SIGNATURES = [
 HARDENER_MARKER = b'777777'
 AMD_SHORT = b'Advanced Micro Devices'
 AMD_FULL = b'Advanced Micro Devices, Inc.'
+XEN_EXCEPTION = b'pxen'
+
+# Hypervisor names as they appear in firmware vendor/product strings.
+FIRMWARE_VM_INDICATORS = [
+    'vmware', 'virtualbox', 'qemu', 'kvm',
+    'hyper-v', 'xen', 'parallels', 'innotek',
+    'bochs', 'bhyve', 'virtual machine'
+]
+
+# SMBIOS string fields that name the platform vendor; a hypervisor brand in any of them
+# (e.g. memory device manufacturer "QEMU") gives the VM away.
+SMBIOS_VM_FIELDS = [
+    (SMBIOS_SYSTEM, 'manufacturer'), (SMBIOS_SYSTEM, 'product_name'), (SMBIOS_SYSTEM, 'family'),
+    (SMBIOS_BASEBOARD, 'manufacturer'), (SMBIOS_BASEBOARD, 'product'),
+    (SMBIOS_BIOS, 'vendor'), (SMBIOS_BIOS, 'version'),
+    (SMBIOS_PROCESSOR, 'manufacturer'), (SMBIOS_PROCESSOR, 'version'),
+    (SMBIOS_MEMORY_DEVICE, 'manufacturer'), (SMBIOS_MEMORY_DEVICE, 'part_number'),
+]
+
+
+def _build_table_markers() -> list[tuple[str, bytes, bool]]:
+    # Every marker the table checks look for, as (group, marker, caseless) in priority
+    # order. Brands and 'pxen' match case-insensitively, the hardener and AMD strings
+    # exactly. 'vbox'/'VBOX' are the same marker once case is ignored.
+    markers = []
+    seen = set()
+
+    for i, signature in enumerate(VM_SIGNATURES):
+        if signature.lower() in seen:
+            continue
+        seen.add(signature.lower())
+        markers.append((f"brand{i}", signature, True))
+
+    markers += [('pxen', XEN_EXCEPTION, True), ('hardener', HARDENER_MARKER, False),
+                ('amd_full', AMD_FULL, False), ('amd_short', AMD_SHORT, False)]
+    return markers
+
+
+TABLE_MARKER_ORDER = _build_table_markers()
+TABLE_MARKERS = {group: marker for group, marker, _ in TABLE_MARKER_ORDER}
+
+MAX_MARKER_LENGTH = max(len(marker) for marker in TABLE_MARKERS.values())
+
+# Tables whose body is a fixed binary layout (integers, addresses, bit fields) with no
+# room for vendor strings; only their header (OEM ID, OEM table ID, creator ID) can hold
+# a marker, so the body is never read. AML tables (DSDT, SSDT) and anything not listed
+# here are scanned in full.
+FIXED_LAYOUT_TABLES = frozenset({
+    b'FACP', b'FACS', b'APIC', b'HPET', b'MCFG', b'SRAT', b'SLIT', b'BGRT', b'FPDT',
+    b'WAET', b'BOOT', b'ECDT', b'DMAR', b'IVRS', b'TPM2', b'SPCR', b'MSCT', b'PCCT',
+    b'PPTT', b'HMAT', b'CEDT', b'LPIT', b'SBST', b'WDAT', b'WDRT', b'WSMT', b'EINJ',
+    b'ERST', b'HEST', b'BERT', b'CPEP', b'RASF', b'PMTT', b'NFIT', b'GTDT', b'IORT',
+})
+
+
+def find_table_markers(table_data) -> list[tuple[str, int]]:
+    # (group, offset) for every marker in the table, in offset order. Each marker is a
+    # C-level bytes.find over the table (lowercased once for the caseless ones), and only
+    # markers present at all have their further offsets located. Where two markers start
+    # at the same offset only the first in TABLE_MARKER_ORDER is kept ('VMware, Inc.'
+    # over 'VMware', AMD_FULL over AMD_SHORT); overlaps at other offsets ('Xen' inside
+    # 'pxen') are all reported.
+    data = bytes(table_data)
+    lowered = data.lower()
+    found: dict[int, tuple[int, str]] = {}
+
+    for rank, (group, marker, caseless) in enumerate(TABLE_MARKER_ORDER):
+        haystack, needle = (lowered, marker.lower()) if caseless else (data, marker)
+        offset = haystack.find(needle)
+        while offset != -1:
+            if offset not in found or found[offset][0] > rank:
+                found[offset] = (rank, group)
+            offset = haystack.find(needle, offset + 1)
+
+    return [(found[offset][1], offset) for offset in sorted(found)]
+
+
+def find_table_markers_chunked(chunks: Iterable[tuple[int, memoryview]]) -> list[tuple[str, int]]:
+    # Same as find_table_markers over (offset, window) chunks overlapping by
+    # MAX_MARKER_LENGTH - 1 bytes. Hits that start that close to a window's end might be
+    # the prefix of a longer marker cut off by the boundary, so they are held back and
+    # taken from the next window instead, which sees them whole.
+    hits = []
+    pending = []
+    settled = 0
+    for offset, window in chunks:
+        cutoff = offset + len(window) - (MAX_MARKER_LENGTH - 1)
+        pending = []
+        for group, start in find_table_markers(window):
+            start += offset
+            if start < settled:
+                continue
+            (hits if start < cutoff else pending).append((group, start))
+        settled = max(settled, cutoff)
+    return hits + pending
+
+
+def _table_name(table_id: int) -> str:
+    # Firmware table ids are the 4-char signature packed little-endian ('FACP', 'DSDT', ...).
+    return struct.pack('<I', table_id & 0xFFFFFFFF).decode('ascii', errors='replace')
+
 
 class SMBIOSDetector(BaseDetector):
     def __init__(self):
-        needs_admin = is_linux()
+        # On Linux only the deep SMBIOS/ACPI stage needs root; it checks for it itself so
+        # the unprivileged DMI identity stage still runs for everyone.
         super().__init__(
             name="Firmware Table Scan",
             supported_platforms=['windows', 'linux'],
-            requires_admin=needs_admin
+            requires_admin=False,
+            cost=0.25
         )
 
         self._cpu_vendor = None
     
     def detect(self) -> TechniqueResult:
         if self._cpu_vendor is None:
-            try:
-                self._cpu_vendor = get_cpuid_vendor(0)
-                self.logger.debug(f"CPU Vendor: {self._cpu_vendor}")
-            except Exception as e:
-                self.logger.warning(f"Could not get CPU vendor: {e}")
-                self._cpu_vendor = "" 
+            self._cpu_vendor = get_cpuid_probe().vendor
+            self.logger.debug(f"CPU Vendor: {self._cpu_vendor}")
         if is_windows():
             return self._detect_windows()
         elif is_linux():
@@ -65,12 +170,13 @@ class SMBIOSDetector(BaseDetector):
                 if not table_data:
                     continue
 
-                result = self._scan_table(table_data, is_acpi=True)
+                result = self._scan_table(table_data, is_acpi=True, table_name=_table_name(table_id))
                 if result['detected']:
                     return TechniqueResult(
                         name=self.name,
                         detected=True,
-                        details=result['details']
+                        details=result['details'],
+                        data=result.get('data', {})
                     )
 
             # -----------Started Scanning for SMBIOS Table Scan------------
@@ -81,13 +187,19 @@ class SMBIOSDetector(BaseDetector):
                 if not table_data:
                     continue
 
-                # For SMBIOS table, only brand detection is relevant
-                result = self._scan_table(table_data, is_acpi=False)
+                # Targeted field checks on the parsed structures first, then the raw
+                # brand scan for strings outside those fields (OEM strings and the like).
+                table_name = f"RSMB {table_id:#x}"
+                result = self._check_smbios(SMBIOSTable.from_rsmb(table_data), table_name)
+                if not result['detected']:
+                    # For SMBIOS table, only brand detection is relevant
+                    result = self._scan_table(table_data, is_acpi=False, table_name=table_name)
                 if result['detected']:
                     return TechniqueResult(
                         name=self.name,
                         detected=True,
-                        details=result['details']
+                        details=result['details'],
+                        data=result.get('data', {})
                     )
             
             # Checking if HPET table exist or not.
@@ -109,83 +221,161 @@ class SMBIOSDetector(BaseDetector):
             self.logger.error(f"Firmware scan failed: {e}. Falling back to WMI.")
             return self._detect_fallback()
 
-    def _scan_table(self, table_data: bytes, is_acpi: bool) -> dict:
-        # Performs scan of compelte table data looking for VM signature.
-        search_data = table_data.lower()
-
-        # Check 1: Brand Detection
-        for signature in VM_SIGNATURES:
-            if search_data.find(signature.lower()) != -1:
-                # Special Handling of 'Xen' string
-                if signature == b'Xen':
-                    if search_data.find(b'pxen') != -1: # Both 'Xen' and 'pxen' should be there in VM
-                        continue
-                return {
-                    'detected': True,
-                    'details': f"VM brand signature found: '{signature.decode('ascii', errors='replace')}'"
-                }
-        
-        # If the table is not of ACPI skip rest of the checks
-        if not is_acpi or len(table_data) < 36: # Min size for header fields
-            return {'detected': False}
-        
-        # Check 2: Hardener Tool Detection ('777777' marker)
-        oem_id = table_data[10:16]
-        oem_table_id = table_data[16:24]
-        if HARDENER_MARKER in oem_id or HARDENER_MARKER in oem_table_id:
+    def _scan_table(self, table_data: bytes, is_acpi: bool, table_name: str = "") -> dict:
+        # Performs scan of complete in-memory table data looking for VM signature.
+        header = ACPITableHeader.parse(table_data[:FADT_MIN_SIZE]) if is_acpi else None
+        if header is not None:
+            result = self._check_acpi_header(header, len(table_data), table_name)
+            if result['detected']:
+                return result
+            if header.signature in FIXED_LAYOUT_TABLES:
+                table_data = header.raw
+
+        return self._check_markers(find_table_markers(table_data), is_acpi, table_name)
+
+    def _check_acpi_header(self, header: ACPITableHeader, size: int, table_name: str) -> dict:
+        # Checks that only need the SDT header (plus the FADT fixed fields for FACP).
+        evidence = {'table': table_name, 'oem_id': header.oem_id.decode('ascii', errors='replace'),
+                    'oem_table_id': header.oem_table_id.decode('ascii', errors='replace')}
+
+        # Check 1: Hardener Tool Detection ('777777' marker)
+        if HARDENER_MARKER in header.oem_id or HARDENER_MARKER in header.oem_table_id:
             return {
                 'detected': True,
-                'details': f"VMwareHardenedLoader artifact found in OEMID/OEMTableID"
+                'details': f"VMwareHardenedLoader artifact found in OEMID/OEMTableID",
+                'data': evidence
             }
-        
-        signature = table_data[0:4]
-        header_len = struct.unpack_from('<I', table_data, 4)[0] # Used little endian because it is parsing bytes that are on CPU in that order.
 
-        # Check 3: AMD Manufacturer String Spoofing
-        has_short = AMD_SHORT in table_data
-        has_full = AMD_FULL in table_data
-        cpu_vendor = self._cpu_vendor
-        
-        if (has_short and not has_full) or ((cpu_vendor != "AuthenticAMD" and cpu_vendor != "") and (has_short or has_full)):
-            return {
-                'detected': True, 
-                'details': "Spoofed AMD manufacturer string detected (short form without Inc.)"
-            }        
-
-        # Check 4: FADT-Table Specific Checks
-        if signature == b'FACP':
+        # Check 2: FADT-Table Specific Checks
+        if header.signature == b'FACP':
             # Check for valid header length
-            if header_len > len(table_data):
+            if header.length > size:
                 return {
                     'detected': True,
-                    'details': f"Corrupt ACPI header in FADT: Declared length ({header_len}) > actual length ({len(table_data)})"
+                    'details': f"Corrupt ACPI header in FADT: Declared length ({header.length}) > actual length ({size})",
+                    'data': evidence
                 }
             
             # Check Buffer Size Validation
             # It needs atleast 84 bytes to read P_Lvl2_Lat and P_Lvl3_Lat
-            if len(table_data) < 84:
+            if len(header.raw) < FADT_MIN_SIZE:
                 return {
                     'detected': True,
-                    'details': f"FADT buffer too small: {len(table_data)} bytes (expected >= 84)"
+                    'details': f"FADT buffer too small: {len(header.raw)} bytes (expected >= {FADT_MIN_SIZE})",
+                    'data': evidence
                 }
             
             # Checking latency values of P_Lv12_lat and P_Lvl3_Lat
-            p_lv12_lat = struct.unpack_from('<H', table_data, 80)[0]
-            p_lv13_lat = struct.unpack_from('<H', table_data, 82)[0]
+            p_lv12_lat = struct.unpack_from('<H', header.raw, 80)[0]
+            p_lv13_lat = struct.unpack_from('<H', header.raw, 82)[0]
 
             if p_lv12_lat == 0x0FFF or p_lv13_lat == 0x0FFF:
                 return {
                     'detected': True,
-                    'details': f"invalid FADT C-state latency values: P_Lv12={hex(p_lv12_lat)}, P_Lv13={hex(p_lv13_lat)}"
+                    'details': f"invalid FADT C-state latency values: P_Lv12={hex(p_lv12_lat)}, P_Lv13={hex(p_lv13_lat)}",
+                    'data': evidence
                 }
+
+        return {'detected': False}
+
+    def _check_smbios(self, table: SMBIOSTable, table_name: str) -> dict:
+        # Brand check on the SMBIOS string fields that name the platform vendor; each field
+        # is a direct lookup in the parsed table rather than a scan of the whole blob.
+        for type_, field_name in SMBIOS_VM_FIELDS:
+            for handle, value in table.field_values(type_, field_name):
+                brands = self._brand_hits(find_table_markers(value.encode('ascii', errors='replace')))
+                if brands:
+                    group, _ = brands[0]
+                    return {
+                        'detected': True,
+                        'details': f"VM brand '{TABLE_MARKERS[group].decode('ascii')}' in SMBIOS type {type_} {field_name}: '{value}'",
+                        'data': {'table': table_name, 'type': type_, 'handle': handle, 'field': field_name, 'value': value}
+                    }
+
+        return {'detected': False}
+
+    def _brand_hits(self, hits: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        brand_hits = [(group, offset) for group, offset in hits if group.startswith('brand')]
+        # Special Handling of 'Xen' string, both 'Xen' and 'pxen' should be there in VM
+        if any(group == 'pxen' for group, _ in hits):
+            brand_hits = [(group, offset) for group, offset in brand_hits if TABLE_MARKERS[group] != b'Xen']
+        return brand_hits
+
+    def _check_markers(self, hits: list[tuple[str, int]], is_acpi: bool, table_name: str) -> dict:
+        # Checks over the markers found anywhere in the table body.
+        groups = {group for group, _ in hits}
+        evidence = {
+            'table': table_name,
+            'hits': [{'marker': TABLE_MARKERS[group].decode('ascii'), 'offset': offset} for group, offset in hits]
+        }
+
+        # Check 3: Brand Detection
+        brand_hits = self._brand_hits(hits)
+        if brand_hits:
+            group, offset = brand_hits[0]
+            more = f" (+{len(brand_hits) - 1} more)" if len(brand_hits) > 1 else ""
+            return {
+                'detected': True,
+                'details': f"VM brand signature found: '{TABLE_MARKERS[group].decode('ascii', errors='replace')}' at offset {offset:#x}{more}",
+                'data': evidence
+            }
+
+        # If the table is not of ACPI skip rest of the checks
+        if not is_acpi:
+            return {'detected': False}
+
+        # Check 4: AMD Manufacturer String Spoofing
+        has_full = 'amd_full' in groups
+        has_short = has_full or 'amd_short' in groups
+        cpu_vendor = self._cpu_vendor
         
+        if (has_short and not has_full) or ((cpu_vendor != "AuthenticAMD" and cpu_vendor != "") and (has_short or has_full)):
+            return {
+                'detected': True, 
+                'details': "Spoofed AMD manufacturer string detected (short form without Inc.)",
+                'data': evidence
+            }        
+
         # If no check passed table is cleaned
         return {'detected': False}
     
     def _detect_linux(self) -> TechniqueResult:
-        self.logger.info("Enumerating ACPI tables (Linux)...")
         try:
             from integritywatch.utils.platform import linux
+
+            # Cheap stage: world-readable DMI identity strings, a handful of tiny sysfs reads.
+            # The deep table scans below only run when these are inconclusive.
+            identity = linux.get_dmi_identity()
+            detected_in = self._check_firmware_fields(identity)
+            if detected_in:
+                return TechniqueResult(
+                    name=self.name,
+                    detected=True,
+                    details=f"VM indicators in DMI identity - {', '.join(detected_in)}",
+                    data={'table': "/sys/class/dmi/id", 'fields': identity}
+                )
+
+            if not self.is_admin():
+                self.logger.info("DMI identity clean; SMBIOS/ACPI deep scan needs root, skipping it")
+                return TechniqueResult(
+                    name=self.name,
+                    detected=False,
+                    details=f"No VM indicators in DMI identity ({len(identity)} fields); deep table scan needs root"
+                )
+
+            self.logger.info("Parsing SMBIOS structure table (Linux)...")
+            smbios_data = linux.read_smbios_table()
+            if smbios_data:
+                result = self._check_smbios(SMBIOSTable(smbios_data), "DMI")
+                if result['detected']:
+                    return TechniqueResult(
+                        name=self.name,
+                        detected=True,
+                        details=result['details'],
+                        data=result.get('data', {})
+                    )
+
+            self.logger.info("Enumerating ACPI tables (Linux)...")
             table_files = linux.get_acpi_tables()
 
             if not table_files:
@@ -198,14 +388,14 @@ class SMBIOSDetector(BaseDetector):
             for filename in table_files:
                 self.logger.debug(f"Scanning table file: {filename}")
                 try: #Opening each table in ACPI table path
-                    with open(filename, 'rb') as f:
-                        table_data = f.read()
-                        result = self._scan_table(table_data, is_acpi=True)
+                    with ACPITableReader(filename) as table:
+                        result = self._scan_acpi_file(table, str(filename))
                         if result['detected']:
                             return TechniqueResult(
                                 name=self.name,
                                 detected=True,
-                                details=f"VM artifact in {filename}: {result['details']}"
+                                details=f"VM artifact in {filename}: {result['details']}",
+                                data=result.get('data', {})
                             )
                 except Exception as e:
                     self.logger.warning(f"Could not read or scan {filename}: {e}")
@@ -223,6 +413,32 @@ class SMBIOSDetector(BaseDetector):
                 error="Unable to do ACPI table scan {e}"
             )
 
+    def _scan_acpi_file(self, table: ACPITableReader, table_name: str) -> dict:
+        # Header triage first; the body is only streamed when the header checks pass and
+        # the table type can carry strings at all.
+        header = table.header()
+        if header is not None:
+            result = self._check_acpi_header(header, table.size, table_name)
+            if result['detected']:
+                return result
+            if header.signature in FIXED_LAYOUT_TABLES:
+                return self._check_markers(find_table_markers(header.raw), is_acpi=True, table_name=table_name)
+
+        hits = find_table_markers_chunked(table.chunks(overlap=MAX_MARKER_LENGTH - 1))
+        return self._check_markers(hits, is_acpi=True, table_name=table_name)
+
+
+    def _check_firmware_fields(self, firmware: dict) -> list[str]:
+        # "key: value" for every firmware string naming a hypervisor.
+        detected_in = []
+        for key, value in firmware.items():
+            if value:
+                value_lower = str(value).lower()
+                for indicator in FIRMWARE_VM_INDICATORS:
+                    if indicator in value_lower:
+                        detected_in.append(f"{key}: {value}")
+                        break
+        return detected_in
 
     def _detect_fallback(self) -> TechniqueResult:
         # Fallback Test of firmware
@@ -243,24 +459,9 @@ class SMBIOSDetector(BaseDetector):
                 error=firmware['error']
             )
         
-        vm_indicators = [
-            'vmware', 'virtualbox', 'qemu', 'kvm',
-            'hyper-v', 'xen', 'parallels', 'innotek'
-        ]
-
-        fields_checked = []
-        detected_in = []
+        fields_checked = [f"{key}={value}" for key, value in firmware.items() if value]
+        detected_in = self._check_firmware_fields(firmware)
 
-        for key, value in firmware.items():
-            if value:
-                value_lower = str(value).lower()
-                fields_checked.append(f"{key}={value}")
-
-                for indicator in vm_indicators:
-                    if indicator in value_lower:
-                        detected_in.append(f"{key}: {value}")
-                        
-        
         if detected_in:
             return TechniqueResult(
                 name=self.name,
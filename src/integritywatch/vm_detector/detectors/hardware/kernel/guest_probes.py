@@ -0,0 +1,90 @@
+from ...base import BaseDetector
+from ....core.result import TechniqueResult
+
+# Drivers that only load inside a guest, by module name as listed in /proc/modules.
+# Modules that also load on hosts are left out: vmw_vmci comes with VMware Workstation,
+# and dom0 loads xen_* backends and helpers. virtio front-ends are guest-only; a KVM host
+# uses the vhost_* back-ends instead.
+GUEST_MODULES = {
+    'virtio_pci': 'KVM/QEMU (virtio)',
+    'virtio_net': 'KVM/QEMU (virtio)',
+    'virtio_blk': 'KVM/QEMU (virtio)',
+    'virtio_scsi': 'KVM/QEMU (virtio)',
+    'virtio_balloon': 'KVM/QEMU (virtio)',
+    'virtio_console': 'KVM/QEMU (virtio)',
+    'vboxguest': 'VirtualBox',
+    'vboxsf': 'VirtualBox',
+    'vmw_balloon': 'VMware',
+    'vmxnet3': 'VMware',
+    'hv_vmbus': 'Hyper-V',
+    'xen_blkfront': 'Xen',
+    'xen_netfront': 'Xen',
+    'prl_tg': 'Parallels',
+    'prl_fs': 'Parallels',
+}
+
+# Kernel release suffixes of kernels built to run as a guest of a specific platform.
+GUEST_KERNEL_MARKERS = {
+    'microsoft-standard': 'WSL2 (Hyper-V)',
+    '-azure': 'Microsoft Azure',
+    '-aws': 'Amazon EC2',
+    '-gcp': 'Google Cloud',
+}
+
+
+class GuestProbeDetector(BaseDetector):
+    # Unprivileged Linux probes that each read one small kernel-exported file.
+
+    def __init__(self):
+        super().__init__(
+            name="Linux Guest Probes",
+            supported_platforms=['linux'],
+            requires_admin=False,
+            cost=0.002
+        )
+
+    def detect(self) -> TechniqueResult:
+        from integritywatch.utils.platform import linux
+
+        findings = []
+        evidence = {}
+
+        # Check 1: Xen exposes the hypervisor type to its domains, dom0 included, so the
+        # control domain (the host side) is ruled out first
+        hypervisor_type = "" if linux.is_xen_control_domain() else linux.read_hypervisor_type()
+        if hypervisor_type:
+            evidence['hypervisor_type'] = hypervisor_type
+            findings.append(f"/sys/hypervisor/type is '{hypervisor_type}'")
+
+        # Check 2: Guest drivers loaded as modules
+        modules = {}
+        for module in linux.iter_loaded_modules():
+            vendor = GUEST_MODULES.get(module)
+            if vendor:
+                modules.setdefault(vendor, []).append(module)
+        if modules:
+            evidence['modules'] = modules
+            findings.extend(f"{vendor} guest modules loaded ({', '.join(names)})" for vendor, names in modules.items())
+
+        # Check 3: Guest-flavoured kernel build
+        osrelease = linux.read_kernel_osrelease()
+        release_lower = osrelease.lower()
+        for marker, platform in GUEST_KERNEL_MARKERS.items():
+            if marker in release_lower:
+                evidence['osrelease'] = osrelease
+                findings.append(f"{platform} kernel '{osrelease}'")
+                break
+
+        if findings:
+            return TechniqueResult(
+                name=self.name,
+                detected=True,
+                details="; ".join(findings),
+                data=evidence
+            )
+
+        return TechniqueResult(
+            name=self.name,
+            detected=False,
+            details="No hypervisor interface, guest modules or guest kernel found"
+        )
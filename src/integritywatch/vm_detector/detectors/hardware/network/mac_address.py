@@ -1,59 +1,8 @@
 from ...base import BaseDetector
 from ....core.result import TechniqueResult
+from .oui_database import format_prefix, get_oui_database, is_locally_administered, parse_mac
 
-VM_MAC_PREFIXES = {
-    # VMware
-    '00:05:69': 'VMware',
-    '00:0C:29': 'VMware',
-    '00:1C:14': 'VMware',
-    '00:50:56': 'VMware',
-    '00:0F:4B': 'VMware',
-    '00:1C:42': 'VMware (Parallels clash)',
-    
-    # Oracle VirtualBox
-    '08:00:27': 'VirtualBox',
-    
-    # Microsoft Hyper-V / Virtual PC
-    '00:03:FF': 'Microsoft Virtual PC',
-    '00:12:5A': 'Microsoft Hyper-V',
-    '00:15:5D': 'Microsoft Hyper-V',
-    '00:17:FA': 'Microsoft Hyper-V',
-    '00:1D:D8': 'Microsoft Hyper-V',
-    '00:25:AE': 'Microsoft Hyper-V',
-    
-    # Parallels
-    '00:1C:42': 'Parallels',
-    
-    # Xen
-    '00:16:3E': 'Xen',
-    
-    # QEMU/KVM
-    '52:54:00': 'QEMU/KVM',
-    
-    # Red Hat Virtualization
-    '00:1A:4A': 'Red Hat KVM',
-    
-    # Amazon EC2
-    '02:00:00': 'Amazon EC2 (legacy)',
-    '02:01:00': 'Amazon EC2',
-    '12:00:00': 'Amazon EC2',
-    '12:01:00': 'Amazon EC2',
-    
-    # Google Cloud
-    '42:01:0A': 'Google Cloud',
-    
-    # Azure
-    '00:0D:3A': 'Microsoft Azure',
-    
-    # Nutanix
-    '50:6B:8D': 'Nutanix AHV',
-    
-    # Proxmox
-    'BC:24:11': 'Proxmox',
-    
-    # bhyve (FreeBSD)
-    '58:9C:FC': 'bhyve',
-}
+# VM and cloud vendor MAC blocks live in vm_oui.txt, see oui_database.py for the format.
 
 class MACAddressDetector(BaseDetector):
 
@@ -61,7 +10,8 @@ class MACAddressDetector(BaseDetector):
         super().__init__(
             name="MAC Address Check",
             supported_platforms=['windows', 'linux', 'macos'],
-            requires_admin=False
+            requires_admin=False,
+            cost=0.005
         )
     
     def detect(self) -> TechniqueResult:
@@ -88,25 +38,42 @@ class MACAddressDetector(BaseDetector):
 
         self.logger.debug(f"Found {len(mac_addresses)} network interfaces")
         
+        database = get_oui_database()
+        locally_administered = []
+
         for mac in mac_addresses:
             self.logger.debug(f"Checking MAC: {mac}")
             
-            oui = mac[:8].upper()  # Format: XX:XX:XX
-            
+            mac_value = parse_mac(mac)
+            if mac_value is None:
+                continue
+
             # Check against known VM prefixes
-            if oui in VM_MAC_PREFIXES:
-                vendor = VM_MAC_PREFIXES[oui]
+            match = database.lookup(mac_value)
+            if match:
+                vendor, length = match
+                oui = format_prefix(mac_value, length)
                 self.logger.info(f"VM MAC prefix detected: {oui} ({vendor})")
                 
                 return TechniqueResult(
                     name=self.name,
                     detected=True,
-                    details=f"VM-specific MAC address detected: {mac} (OUI: {oui}, Vendor: {vendor})"
+                    details=f"VM-specific MAC address detected: {mac} (OUI: {oui}, Vendor: {vendor})",
+                    data={'mac': mac, 'prefix': oui, 'prefix_length': length, 'vendor': vendor}
                 )
+
+            # Randomised/software-assigned addresses carry no vendor; report them apart.
+            if is_locally_administered(mac_value):
+                locally_administered.append(mac)
         
         self.logger.info("No VM MAC prefixes detected")
+        details = f"All {len(mac_addresses)} network adapters have non-VM MAC addresses"
+        if locally_administered:
+            details += f" ({len(locally_administered)} locally administered: {', '.join(locally_administered)})"
+
         return TechniqueResult(
             name=self.name,
             detected=False,
-            details=f"All {len(mac_addresses)} network adapters have non-VM MAC addresses"
+            details=details,
+            data={'locally_administered': locally_administered}
         )
@@ -0,0 +1,115 @@
+import bisect
+import mmap
+import threading
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_OUI_PATH = Path(__file__).parent / 'vm_oui.txt'
+
+# Fixed-width records, sorted: 12 hex digits of the 48-bit prefix value, '/', 2-digit prefix
+# length (24 for MA-L/OUI, 28 for MA-M, 36 for MA-S), a space, the space-padded vendor name
+# and '\n'. Record i starts at i * RECORD_SIZE, so the file is searched in place.
+RECORD_SIZE = 48
+KEY_SIZE = 15
+PREFIX_LENGTHS = (36, 28, 24)  # longest block first
+
+MAC_BITS = 48
+LOCALLY_ADMINISTERED_BIT = 0x02 << 40  # U/L bit of the first octet
+
+
+def parse_mac(mac: str) -> Optional[int]:
+    # "AA:BB:CC:DD:EE:FF" / "AA-BB-..." / "aabb.ccdd.eeff" -> 48-bit int, None if malformed.
+    digits = mac.replace(':', '').replace('-', '').replace('.', '')
+    if len(digits) != 12:
+        return None
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+def is_locally_administered(mac: int) -> bool:
+    return bool(mac & LOCALLY_ADMINISTERED_BIT)
+
+
+def format_prefix(mac: int, length: int) -> str:
+    # Prefix of `mac` as colon-separated hex, e.g. "00:1C:42" or "70:B3:D5:1E:0" for a /36.
+    digits = f"{mac:012X}"[:length // 4]
+    return ':'.join(digits[i:i + 2] for i in range(0, len(digits), 2))
+
+
+class _RecordKeys:
+    # Sequence view of the record keys in the mapped file, for bisect.
+
+    def __init__(self, data: mmap.mmap, count: int):
+        self._data = data
+        self._count = count
+
+    def __getitem__(self, i: int) -> bytes:
+        offset = i * RECORD_SIZE
+        return self._data[offset:offset + KEY_SIZE]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class OUIDatabase:
+    """MAC prefix -> vendor lookups over a bundled fixed-width registry file.
+
+    The file is mmap'd on the first lookup and binary-searched in place, so startup costs
+    nothing however large the registry is and a lookup is a handful of key comparisons per
+    block size. MA-M (/28) and MA-S (/36) blocks win over the OUI (/24) they sit in.
+    """
+
+    def __init__(self, path: Path = DEFAULT_OUI_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Optional[mmap.mmap] = None
+        self._keys: Optional[_RecordKeys] = None
+
+    def lookup(self, mac: int) -> Optional[tuple[str, int]]:
+        # (vendor, prefix length) of the most specific block containing `mac`.
+        keys = self._load()
+        if keys is None:
+            return None
+
+        for length in PREFIX_LENGTHS:
+            prefix = (mac >> (MAC_BITS - length)) << (MAC_BITS - length)
+            key = f"{prefix:012X}/{length:02d}".encode('ascii')
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                offset = i * RECORD_SIZE
+                return self._data[offset + KEY_SIZE + 1:offset + RECORD_SIZE].decode('ascii').strip(), length
+
+        return None
+
+    def __len__(self) -> int:
+        keys = self._load()
+        return 0 if keys is None else len(keys)
+
+    def _load(self) -> Optional[_RecordKeys]:
+        if self._keys is not None:
+            return self._keys
+
+        with self._lock:
+            if self._keys is None:
+                with open(self.path, 'rb') as f:
+                    size = f.seek(0, 2)
+                    if size == 0:
+                        return None
+                    if size % RECORD_SIZE:
+                        raise ValueError(f"{self.path} is not a {RECORD_SIZE}-byte record file ({size} bytes)")
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._keys = _RecordKeys(self._data, size // RECORD_SIZE)
+
+        return self._keys
+
+
+_database: Optional[OUIDatabase] = None
+
+
+def get_oui_database() -> OUIDatabase:
+    global _database
+    if _database is None:
+        _database = OUIDatabase()
+    return _database
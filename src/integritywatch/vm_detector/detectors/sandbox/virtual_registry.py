@@ -6,7 +6,8 @@ class VirtualRegistryDetector(BaseDetector):
     def __init__(self):
         super().__init__(name="Virtual Registry Detection",
                          supported_platforms=['windows'],
-                         requires_admin=False
+                         requires_admin=False,
+                         cost=0.005
         )
 
     def detect(self) -> TechniqueResult:
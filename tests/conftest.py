@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# integritywatch.config writes a default config/settings.json into the working directory
+# on first import; load it once from a scratch directory to keep that out of the checkout.
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="integritywatch-tests-"))
+try:
+    import integritywatch.config  # noqa: F401
+finally:
+    os.chdir(_cwd)
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from integritywatch.utils import dns_resolver
+from integritywatch.utils.dns_resolver import ReverseDNSResolver
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class StubLookup:
+    # Local stand-in for the system resolver: fixed answers, every call counted.
+
+    def __init__(self, answers: dict[str, str]):
+        self.answers = answers
+        self.calls: list[str] = []
+
+    def __call__(self, ip: str) -> str:
+        self.calls.append(ip)
+        return self.answers.get(ip, "")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(dns_resolver, 'time', fake)
+    return fake
+
+
+def test_answer_is_cached_until_ttl(clock):
+    lookup = StubLookup({'203.0.113.7': 'relay.example.net'})
+    resolver = ReverseDNSResolver(lookup, ttl=300.0, negative_ttl=60.0)
+
+    assert resolver.resolve(['203.0.113.7']) == {'203.0.113.7': 'relay.example.net'}
+
+    clock.now += 299.0
+    assert resolver.get('203.0.113.7') == 'relay.example.net'
+    assert resolver.resolve(['203.0.113.7']) == {'203.0.113.7': 'relay.example.net'}
+    assert lookup.calls == ['203.0.113.7']
+
+    clock.now += 2.0
+    assert resolver.get('203.0.113.7') is None
+    assert resolver.resolve(['203.0.113.7']) == {'203.0.113.7': 'relay.example.net'}
+    assert lookup.calls == ['203.0.113.7', '203.0.113.7']
+
+
+def test_failure_is_cached_for_negative_ttl(clock):
+    lookup = StubLookup({})
+    resolver = ReverseDNSResolver(lookup, ttl=300.0, negative_ttl=60.0)
+
+    assert resolver.resolve(['198.51.100.1']) == {'198.51.100.1': ""}
+
+    clock.now += 59.0
+    resolver.submit('198.51.100.1')
+    assert resolver.get('198.51.100.1') == ""
+    assert lookup.calls == ['198.51.100.1']
+
+    clock.now += 2.0
+    assert resolver.get('198.51.100.1') is None
+    assert resolver.resolve(['198.51.100.1']) == {'198.51.100.1': ""}
+    assert len(lookup.calls) == 2
+
+
+def test_lookup_exception_is_a_negative_answer(clock):
+    def lookup(ip: str) -> str:
+        raise OSError("no PTR record")
+
+    resolver = ReverseDNSResolver(lookup, negative_ttl=60.0)
+    assert resolver.resolve(['198.51.100.2']) == {'198.51.100.2': ""}
+
+
+def test_late_answer_replaces_deadline_failure():
+    release = threading.Event()
+    delivered = threading.Event()
+    results = []
+
+    def lookup(ip: str) -> str:
+        release.wait(5.0)
+        return 'rendezvous.example.org'
+
+    def on_result(ip: str, hostname: str):
+        results.append((ip, hostname))
+        delivered.set()
+
+    resolver = ReverseDNSResolver(lookup, timeout=0.05, negative_ttl=60.0, on_result=on_result)
+
+    # The deadline passes first, so the caller sees a failure instead of waiting.
+    assert resolver.resolve(['192.0.2.10']) == {'192.0.2.10': ""}
+    assert resolver.get('192.0.2.10') == ""
+
+    release.set()
+    assert delivered.wait(5.0)
+    assert results == [('192.0.2.10', 'rendezvous.example.org')]
+    assert resolver.get('192.0.2.10') == 'rendezvous.example.org'
+
+
+def test_cache_never_grows_past_max_entries(clock):
+    lookup = StubLookup({f'203.0.113.{i}': f'host{i}.example.net' for i in range(10)})
+    resolver = ReverseDNSResolver(lookup, ttl=300.0, negative_ttl=60.0, max_entries=4)
+
+    resolver.resolve([f'203.0.113.{i}' for i in range(10)])
+
+    assert len(resolver._cache) == 4
+    assert resolver.get('203.0.113.9') == 'host9.example.net'
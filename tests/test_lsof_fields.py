@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from integritywatch.utils.platform.macos import parse_lsof_fields
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def load_connections() -> list[dict]:
+    with open(FIXTURES / 'lsof_tcp.txt') as f:
+        return list(parse_lsof_fields(f))
+
+
+def test_every_socket_is_attributed_to_its_process():
+    connections = load_connections()
+
+    assert [(c['pid'], c['local_port']) for c in connections] == [
+        (512, 631), (512, 631), (1443, 52814), (1443, 52815), (1443, 7070)
+    ]
+
+
+def test_established_ipv4_fields():
+    conn = load_connections()[2]
+
+    assert conn == {
+        'local_addr': '192.168.1.20',
+        'local_port': 52814,
+        'remote_addr': '37.252.231.64',
+        'remote_port': 5938,
+        'state': 'ESTABLISHED',
+        'protocol': 'tcp',
+        'inode': None,
+        'pid': 1443
+    }
+
+
+def test_bracketed_ipv6_endpoints():
+    loopback, established = load_connections()[1], load_connections()[3]
+
+    assert (loopback['local_addr'], loopback['local_port']) == ('::1', 631)
+    assert (established['local_addr'], established['local_port']) == ('2001:db8::20', 52815)
+    assert (established['remote_addr'], established['remote_port']) == ('2606:4700::6810:84e5', 443)
+
+
+def test_listening_socket_has_no_remote_end():
+    conn = load_connections()[4]
+
+    assert (conn['local_addr'], conn['local_port']) == ('*', 7070)
+    assert (conn['remote_addr'], conn['remote_port']) == ('', 0)
+
+
+def test_state_comes_from_the_st_field_only():
+    assert [c['state'] for c in load_connections()] == [
+        'LISTEN', 'LISTEN', 'ESTABLISHED', 'CLOSE_WAIT', 'LISTEN'
+    ]
+
+
+def test_missing_state_and_malformed_names():
+    lines = ['p9', 'f3', 'PTCP', 'n10.0.0.1:22->10.0.0.2:50000', 'f4', 'PTCP', 'nnot-an-endpoint']
+
+    assert [(c['state'], c['remote_port']) for c in parse_lsof_fields(lines)] == [('UNKNOWN', 50000)]
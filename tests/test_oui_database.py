@@ -0,0 +1,57 @@
+import pytest
+
+from integritywatch.vm_detector.detectors.hardware.network.oui_database import (
+    DEFAULT_OUI_PATH, KEY_SIZE, RECORD_SIZE, OUIDatabase, format_prefix, parse_mac
+)
+
+
+def write_registry(path, records: list[tuple[int, int, str]]):
+    lines = sorted(f"{value:012X}/{length:02d} {vendor}".ljust(RECORD_SIZE - 1) + "\n" for value, length, vendor in records)
+    path.write_bytes("".join(lines).encode('ascii'))
+
+
+def test_bundled_registry_is_fixed_width_and_sorted():
+    data = DEFAULT_OUI_PATH.read_bytes()
+
+    assert b'\r' not in data
+    assert len(data) % RECORD_SIZE == 0
+    records = [data[i:i + RECORD_SIZE] for i in range(0, len(data), RECORD_SIZE)]
+    assert all(record.endswith(b'\n') for record in records)
+    keys = [record[:KEY_SIZE] for record in records]
+    assert keys == sorted(keys)
+
+
+def test_bundled_ma_m_block_wins_over_its_oui():
+    database = OUIDatabase()
+
+    assert database.lookup(parse_mac("00:50:56:8a:12:34")) == ("VMware vCenter", 28)
+    assert database.lookup(parse_mac("00:50:56:3f:12:34")) == ("VMware", 24)
+
+
+def test_longest_block_wins(tmp_path):
+    path = tmp_path / 'oui.txt'
+    write_registry(path, [
+        (0x70B3D5000000, 24, "IEEE Registration Authority"),
+        (0x70B3D5E00000, 28, "Medium Block Vendor"),
+        (0x70B3D5E1F000, 36, "Small Block Vendor"),
+    ])
+    database = OUIDatabase(path)
+
+    assert database.lookup(0x70B3D5E1F123) == ("Small Block Vendor", 36)
+    assert database.lookup(0x70B3D5E20000) == ("Medium Block Vendor", 28)
+    assert database.lookup(0x70B3D5010203) == ("IEEE Registration Authority", 24)
+    assert database.lookup(0x0050560A0B0C) is None
+
+
+def test_crlf_checkout_is_rejected(tmp_path):
+    path = tmp_path / 'oui.txt'
+    write_registry(path, [(0x001C42000000, 24, "Parallels")])
+    path.write_bytes(path.read_bytes().replace(b'\n', b'\r\n'))
+
+    with pytest.raises(ValueError):
+        len(OUIDatabase(path))
+
+
+def test_format_prefix():
+    assert format_prefix(0x70B3D5E1F123, 36) == "70:B3:D5:E1:F"
+    assert format_prefix(0x005056812345, 24) == "00:50:56"
@@ -0,0 +1,60 @@
+import errno
+import socket
+
+import pytest
+
+from integritywatch.utils.platform import linux
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(linux, '_sock_diag_available', None)
+    monkeypatch.setattr(linux, '_sock_diag_unsupported', set())
+
+
+def fake_read_socket_tables(*args, tables):
+    return [{'table': path} for path, _, _ in tables]
+
+
+def test_unsupported_pair_falls_back_to_its_proc_table_only(monkeypatch):
+    dumps = []
+
+    def dump(family, protocol, *args):
+        dumps.append((protocol, family))
+        if protocol == socket.IPPROTO_UDP:
+            raise OSError(errno.ENOENT, "udp_diag not loaded")
+        return [{'dump': (protocol, family)}]
+
+    monkeypatch.setattr(linux, '_sock_diag_dump', dump)
+    monkeypatch.setattr(linux, 'read_socket_tables', fake_read_socket_tables)
+
+    first = linux.query_sock_diag()
+    assert {'dump': (socket.IPPROTO_TCP, socket.AF_INET)} in first
+    assert [row['table'] for row in first if 'table' in row] == ['/proc/net/udp', '/proc/net/udp6']
+
+    dumps.clear()
+    assert linux.query_sock_diag() == first
+    assert all(protocol == socket.IPPROTO_TCP for protocol, _ in dumps)
+
+
+def test_transient_error_is_retried_next_query(monkeypatch):
+    def dump(family, protocol, *args):
+        if family == socket.AF_INET6:
+            raise OSError(errno.ENOBUFS, "burst")
+        return []
+
+    monkeypatch.setattr(linux, '_sock_diag_dump', dump)
+    monkeypatch.setattr(linux, 'read_socket_tables', fake_read_socket_tables)
+
+    assert [row['table'] for row in linux.query_sock_diag()] == ['/proc/net/tcp6', '/proc/net/udp6']
+    assert linux._sock_diag_unsupported == set()
+
+
+def test_fatal_error_disables_netlink(monkeypatch):
+    def dump(*args):
+        raise OSError(errno.EACCES, "blocked")
+
+    monkeypatch.setattr(linux, '_sock_diag_dump', dump)
+
+    assert linux.query_sock_diag() is None
+    assert linux._sock_diag_available is False
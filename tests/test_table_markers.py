@@ -0,0 +1,59 @@
+import os
+import time
+
+from integritywatch.vm_detector.detectors.hardware.firmware.smbios_tables import (
+    AMD_SHORT, MAX_MARKER_LENGTH, TABLE_MARKERS, VM_SIGNATURES, find_table_markers, find_table_markers_chunked
+)
+
+
+def markers(table_data) -> list[tuple[bytes, int]]:
+    return [(TABLE_MARKERS[group], offset) for group, offset in find_table_markers(table_data)]
+
+
+def baseline_scan(table_data: bytes) -> bool:
+    # The per-signature loop the single-pass search replaced.
+    search_data = table_data.lower()
+    found = [search_data.find(signature.lower()) != -1 for signature in VM_SIGNATURES]
+    return any(found) or search_data.find(b'pxen') != -1 or AMD_SHORT in table_data
+
+
+def test_brands_match_case_insensitively_in_offset_order():
+    assert markers(b"..qemu....BoChS..") == [(b'QEMU', 2), (b'BOCHS', 10)]
+
+
+def test_xen_inside_pxen_is_still_reported():
+    assert markers(b"_PXEN_") == [(b'pxen', 1), (b'Xen', 2)]
+
+
+def test_longer_marker_wins_at_the_same_offset():
+    assert markers(b"VMware, Inc.") == [(b'VMware, Inc.', 0)]
+    assert markers(b"Advanced Micro Devices, Inc.") == [(b'Advanced Micro Devices, Inc.', 0)]
+    assert markers(b"Advanced Micro Devices") == [(b'Advanced Micro Devices', 0)]
+
+
+def test_exact_markers_are_case_sensitive():
+    assert markers(b"advanced micro devices") == []
+
+
+def test_chunked_scan_matches_whole_table_scan():
+    data = os.urandom(5000) + b"Advanced Micro Devices, Inc." + os.urandom(3000) + b"VirtualBox"
+    window = 1024
+    overlap = MAX_MARKER_LENGTH - 1
+    chunks = [(offset, memoryview(data)[offset:offset + window + overlap]) for offset in range(0, len(data), window)]
+
+    assert find_table_markers_chunked(chunks) == find_table_markers(data)
+
+
+def test_not_slower_than_per_signature_find():
+    data = os.urandom(256 * 1024)
+
+    def best_of(scan) -> float:
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            scan(data)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    # Generous bound so a busy machine doesn't flake; the old lookahead regex was ~45x slower.
+    assert best_of(find_table_markers) < 3 * best_of(baseline_scan)
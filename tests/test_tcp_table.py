@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from integritywatch.utils.platform.windows import TCP_ROW_SIZE, parse_tcp_table, parse_tcp6_table
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def read_fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+def test_ipv4_rows():
+    rows = list(parse_tcp_table(read_fixture('tcp_table_v4.bin')))
+
+    assert rows[1] == {
+        'local_addr': '192.168.1.20',
+        'local_port': 52814,
+        'remote_addr': '37.252.231.64',
+        'remote_port': 5938,
+        'state': 'ESTABLISHED',
+        'protocol': 'tcp',
+        'inode': None,
+        'pid': 4312
+    }
+
+
+def test_ipv4_ports_are_network_byte_order():
+    # 135 is stored as 00 87, 49872 as C2 D0; reading them little-endian gives 34560 / 53442.
+    rows = list(parse_tcp_table(read_fixture('tcp_table_v4.bin')))
+
+    assert [(r['local_port'], r['remote_port']) for r in rows] == [(135, 0), (52814, 5938), (49872, 443), (1, 2)]
+
+
+def test_ipv4_state_decoding():
+    rows = list(parse_tcp_table(read_fixture('tcp_table_v4.bin')))
+
+    assert [r['state'] for r in rows] == ['LISTEN', 'ESTABLISHED', 'TIME_WAIT', 'UNKNOWN']
+
+
+def test_ipv4_truncated_buffer_stops_at_last_whole_row():
+    data = read_fixture('tcp_table_v4.bin')
+
+    assert len(list(parse_tcp_table(data[:4 + 2 * TCP_ROW_SIZE + 10]))) == 2
+
+
+def test_ipv6_rows():
+    rows = list(parse_tcp6_table(read_fixture('tcp6_table.bin')))
+
+    assert rows[1] == {
+        'local_addr': 'fe80::1c2b:3aff:fe4d:5e6f',
+        'local_port': 7070,
+        'remote_addr': 'fe80::aa:bbff:fecc:ddee',
+        'remote_port': 52816,
+        'state': 'ESTABLISHED',
+        'protocol': 'tcp',
+        'inode': None,
+        'pid': 2240
+    }
+
+
+def test_ipv6_ports_skip_the_scope_id():
+    rows = list(parse_tcp6_table(read_fixture('tcp6_table.bin')))
+
+    assert [(r['local_port'], r['remote_port']) for r in rows] == [(135, 0), (7070, 52816), (52815, 443)]
+
+
+def test_ipv6_state_and_pid():
+    rows = list(parse_tcp6_table(read_fixture('tcp6_table.bin')))
+
+    assert [(r['state'], r['pid']) for r in rows] == [('LISTEN', 1068), ('ESTABLISHED', 2240), ('CLOSE_WAIT', 4312)]